@@ -326,10 +326,9 @@ class FlowValidator:
                                  self._add_error(nid, f"No capability binding for '{cap_id}' on {node.provider_ref}/{node.model_ref}")
 
     def _find_binding(self, provider: str, model: str, capability: str) -> bool:
-        for b in self.ctx.bindings:
-            if b.capability_id == capability and b.provider_id == provider:
-                if b.model_or_deployment_id == model:
-                    return True
+        for b in self.ctx.bindings_by_capability.get(capability, []):
+            if b.provider_id == provider and b.model_or_deployment_id == model:
+                return True
         return False
 
     def _validate_connectivity(self, flow: Any, nodes: Dict[str, Any]) -> None:
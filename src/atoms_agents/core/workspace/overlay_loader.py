@@ -1,82 +1,193 @@
-from typing import Optional, Dict, Any
-from atoms_agents.registry.loader import RegistryLoader, RegistryContext
+import copy
+import os
+import threading
+import time
+from collections import ChainMap
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Dict, List, Tuple
+
+import yaml
+
+from atoms_agents.registry.loader import CARD_DIRECTORIES, RegistryLoader, RegistryContext
+from atoms_agents.registry.snapshot import CARD_EXTENSIONS, Manifest, scan_manifest
 from atoms_agents.core.workspace.store import WorkspaceStore
 from atoms_agents.registry.parsers import parse_node, parse_flow
 from atoms_agents.registry.schemas import NodeCard, FlowCard
 
+# (path, mtime_ns, size) of every file a layer was built from
+Signature = Tuple[Tuple[str, int, int], ...]
+
+
+@dataclass
+class OverlayLayer:
+    signature: Signature
+    nodes: Dict[str, NodeCard] = field(default_factory=dict)
+    flows: Dict[str, FlowCard] = field(default_factory=dict)
+
+
+@dataclass
+class _BaseEntry:
+    manifest: Manifest
+    context: RegistryContext
+    checked_at: float
+
+
+# Shared across loader instances (they are often created per request)
+_BASES: Dict[str, _BaseEntry] = {}
+_LAYERS: Dict[str, OverlayLayer] = {}
+_LOCK = threading.Lock()
+
+
+def _signature(paths: List[Path]) -> Signature:
+    sig = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        sig.append((str(path), st.st_mtime_ns, st.st_size))
+    return tuple(sorted(sig))
+
+
+def clear_overlay_cache() -> None:
+    with _LOCK:
+        _BASES.clear()
+        _LAYERS.clear()
+
+
 class OverlayRegistryLoader:
     """
     Wraps the standard RegistryLoader to apply workspace overrides.
-    Priority: Workspace Overlay > Registry.
+    Priority: Workspace Overlay > Tenant Overlay > Registry.
+
+    The base context is loaded once and shared; tenant and workspace overlays are
+    small cached layers rebuilt only when one of their files changes. Each
+    load_context call returns a shallow copy of the base whose `nodes`/`flows`
+    are copy-on-write ChainMaps over the layers, so writes stay local to it.
+    Treat the other card dicts as read-only: they are shared with every tenant.
     """
-    def __init__(self, registry_root: str, workspace_store: WorkspaceStore):
+    def __init__(self, registry_root: str, workspace_store: WorkspaceStore, base_recheck_seconds: float = 1.0):
         self.base_loader = RegistryLoader(registry_root)
         self.store = workspace_store
+        # How long a validated base is trusted before its manifest is stat'ed again
+        self.base_recheck_seconds = base_recheck_seconds
 
     def load_context(self, tenant_id: Optional[str] = None) -> RegistryContext:
         """
         Load the full registry context, apply tenant overlays, then workspace overrides.
         """
-        # 1. Load base registry
-        ctx = self.base_loader.load_context()
+        # 1. Shared base registry
+        base = self._base_context()
 
-        # 2. Apply Tenant Overlays (if specified)
+        # 2. Overlay layers, highest priority first (tenant only if specified)
+        layers = [self._workspace_layer()]
         if tenant_id:
-            import os
-            import yaml
-
-            # Assuming standard structure: registry/cards/tenant_overlays/<tenant_id>/
-            tenant_overlay_dir = os.path.join(self.base_loader.root_path, "tenant_overlays", tenant_id)
-
-            if os.path.exists(tenant_overlay_dir):
-                for root, _, files in os.walk(tenant_overlay_dir):
-                    for file in files:
-                        if file.endswith((".yaml", ".yml")):
-                            filepath = os.path.join(root, file)
-                            try:
-                                with open(filepath, 'r') as f:
-                                    data = yaml.safe_load(f)
-
-                                # Detect type and apply
-                                if "card_type" in data:
-                                    if data["card_type"] == "node":
-                                        card = NodeCard(**data)
-                                        ctx.nodes[card.node_id] = card
-                                    elif data["card_type"] == "flow":
-                                        card = FlowCard(**data)
-                                        ctx.flows[card.flow_id] = card
-                            except Exception as e:
-                                print(f"Warning: Failed to load tenant overlay {filepath}: {e}")
-
-        # 3. Get list of workspace overrides
+            layers.append(self._tenant_layer(tenant_id))
+
+        # 3. Compose: private write layer > workspace > tenant > base
+        ctx = copy.copy(base)
+        ctx.nodes = ChainMap({}, *(layer.nodes for layer in layers), base.nodes)
+        ctx.flows = ChainMap({}, *(layer.flows for layer in layers), base.flows)
+        return ctx
+
+    def _base_context(self) -> RegistryContext:
+        key = os.path.abspath(self.base_loader.root_path)
+        now = time.monotonic()
+        entry = _BASES.get(key)
+        if entry is not None and now - entry.checked_at < self.base_recheck_seconds:
+            return entry.context
+
+        manifest = scan_manifest(self.base_loader.root_path, CARD_DIRECTORIES)
+        if entry is not None and entry.manifest == manifest:
+            entry.checked_at = now
+            return entry.context
+
+        entry = _BaseEntry(manifest, self.base_loader.load_context(), now)
+        with _LOCK:
+            _BASES[key] = entry
+        return entry.context
+
+    def _cached_layer(self, key: str, signature: Signature) -> Optional[OverlayLayer]:
+        layer = _LAYERS.get(key)
+        if layer is not None and layer.signature == signature:
+            return layer
+        return None
+
+    def _store_layer(self, key: str, layer: OverlayLayer) -> OverlayLayer:
+        with _LOCK:
+            _LAYERS[key] = layer
+        return layer
+
+    def _tenant_layer(self, tenant_id: str) -> OverlayLayer:
+        # Assuming standard structure: registry/cards/tenant_overlays/<tenant_id>/
+        tenant_overlay_dir = os.path.join(self.base_loader.root_path, "tenant_overlays", tenant_id)
+        paths: List[Path] = []
+        if os.path.exists(tenant_overlay_dir):
+            for root, _, files in os.walk(tenant_overlay_dir):
+                for file in files:
+                    if file.endswith(CARD_EXTENSIONS):
+                        paths.append(Path(root) / file)
+
+        key = f"tenant:{os.path.abspath(tenant_overlay_dir)}"
+        signature = _signature(paths)
+        layer = self._cached_layer(key, signature)
+        if layer is not None:
+            return layer
+
+        layer = OverlayLayer(signature)
+        for filepath in sorted(paths):
+            try:
+                with open(filepath, 'r') as f:
+                    data = yaml.safe_load(f)
+
+                # Detect type and apply
+                if "card_type" in data:
+                    if data["card_type"] == "node":
+                        card = NodeCard(**data)
+                        layer.nodes[card.node_id] = card
+                    elif data["card_type"] == "flow":
+                        card = FlowCard(**data)
+                        layer.flows[card.flow_id] = card
+            except Exception as e:
+                print(f"Warning: Failed to load tenant overlay {filepath}: {e}")
+        return self._store_layer(key, layer)
+
+    def _workspace_layer(self) -> OverlayLayer:
         overrides = self.store.list_overrides()
+        node_paths = {i: self.store.get_card_path("node", i) for i in overrides.get("nodes", [])}
+        flow_paths = {i: self.store.get_card_path("flow", i) for i in overrides.get("flows", [])}
 
-        # 4. Apply Node overrides
-        for node_id in overrides.get("nodes", []):
-            path = self.store.get_card_path("node", node_id)
+        key = f"workspace:{Path(self.store.root).resolve()}"
+        signature = _signature([p for p in [*node_paths.values(), *flow_paths.values()] if p])
+        layer = self._cached_layer(key, signature)
+        if layer is not None:
+            return layer
+
+        layer = OverlayLayer(signature)
+
+        # Node overrides
+        for node_id, path in node_paths.items():
             if path:
                 try:
-                    import yaml
                     with open(path, 'r') as f:
                         data = yaml.safe_load(f)
 
                     card = NodeCard(**data)
-                    ctx.nodes[card.node_id] = card
+                    layer.nodes[card.node_id] = card
                 except Exception as e:
                     print(f"Warning: Failed to load node override {node_id}: {e}")
 
-        # 5. Apply Flow overrides
-        for flow_id in overrides.get("flows", []):
-            path = self.store.get_card_path("flow", flow_id)
+        # Flow overrides
+        for flow_id, path in flow_paths.items():
             if path:
                 try:
-                    import yaml
                     with open(path, 'r') as f:
                         data = yaml.safe_load(f)
 
                     card = FlowCard(**data)
-                    ctx.flows[card.flow_id] = card
+                    layer.flows[card.flow_id] = card
                 except Exception as e:
                     print(f"Warning: Failed to load flow override {flow_id}: {e}")
 
-        return ctx
+        return self._store_layer(key, layer)
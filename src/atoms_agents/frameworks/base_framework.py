@@ -5,21 +5,7 @@ from typing import Any, Dict, List, Optional
 
 from atoms_agents.logging.event_v2_logger import EventV2Logger, log_framework_execution
 from atoms_agents.transport.canvas_transport_bridge import get_transport
-
-
-class _TransportAdapter:
-    """Adapter to match EventV2Logger transport interface."""
-
-    def __init__(self, transport: Any) -> None:
-        self._transport = transport
-
-    async def emit_sse(self, canvas_id: Optional[str], event_data: Dict[str, Any]) -> None:
-        if canvas_id:
-            await self._transport.emit_sse_event(canvas_id=canvas_id, event_data=event_data)
-
-    async def emit_ws(self, thread_id: Optional[str], event_data: Dict[str, Any]) -> None:
-        if thread_id:
-            await self._transport.emit_ws_message(thread_id=thread_id, message_data=event_data)
+from atoms_agents.transport.event_adapter import TransportAdapter
 
 
 _EVENT_LOGGER: Optional[EventV2Logger] = None
@@ -32,7 +18,7 @@ def get_event_logger() -> EventV2Logger:
         _EVENT_LOGGER = EventV2Logger(
             tenant_id=os.getenv("EVENT_TENANT_ID", ""),
             project_id=os.getenv("EVENT_PROJECT_ID", "proj_frameworks"),
-            transport_client=_TransportAdapter(get_transport()),
+            transport_client=TransportAdapter(get_transport()),
         )
     return _EVENT_LOGGER
 
@@ -0,0 +1,78 @@
+"""
+Serialization benchmark: EventV2 events/sec on the emit path, before and after single-pass serialization.
+
+"legacy" is what emit_event used to do per event: json.loads(model_dump_json())
+for SSE/WS, then routing.model_dump() again for persistence, with the transport
+encoding the dict once more. "single-pass" is EventV2Logger.serialize() with the
+cached routing dict and one encode reused by every sink.
+
+    python -m atoms_agents.logging.bench_events [--events 20000]
+"""
+import argparse
+import json
+import time
+import uuid
+from typing import Callable, Dict, List
+
+from atoms_agents.logging import event_codec
+from atoms_agents.logging.event_v2_logger import EventPriority, EventV2, EventV2Logger
+
+
+def _events(logger: EventV2Logger, count: int) -> List[EventV2]:
+    routings = [logger.create_routing_keys(actor_id=f"agent_{i}", canvas_id="canvas_bench") for i in range(8)]
+    return [
+        logger.create_event(
+            "model_inference",
+            routings[i % len(routings)],
+            {"provider_id": "groq", "model_id": "m1", "tokens_used": i, "cost": 0.001, "output_text": "ok " * 20},
+            priority=EventPriority.TRUTH,
+        )
+        for i in range(count)
+    ]
+
+
+def _legacy(logger: EventV2Logger, event: EventV2) -> None:
+    event_dict = json.loads(event.model_dump_json())
+    json.dumps(event_dict).encode("utf-8")  # SSE body
+    json.dumps(event_dict).encode("utf-8")  # WS frame
+    event.routing.model_dump()  # persistence
+
+
+def _single_pass(logger: EventV2Logger, event: EventV2) -> None:
+    serialized = logger.serialize(event)
+    serialized.encoded  # SSE body
+    serialized.encoded  # WS frame (cached)
+    dict(serialized.data["routing"])  # persistence
+
+
+def _rate(path: Callable[[EventV2Logger, EventV2], None], logger: EventV2Logger, events: List[EventV2]) -> float:
+    start = time.perf_counter()
+    for event in events:
+        path(logger, event)
+    return len(events) / (time.perf_counter() - start)
+
+
+def run(event_count: int = 20_000) -> Dict[str, float]:
+    """Returns events/sec for each serialization path."""
+    logger = EventV2Logger(tenant_id=str(uuid.uuid4()), project_id="bench", batched=False)
+    events = _events(logger, event_count)
+    return {
+        "events": event_count,
+        "legacy_eps": _rate(_legacy, logger, events),
+        "single_pass_eps": _rate(_single_pass, logger, events),
+        "orjson": event_codec.orjson is not None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=20_000)
+    result = run(parser.parse_args().events)
+    print(f"{result['events']} events (orjson: {'yes' if result['orjson'] else 'no'})")
+    print(f"  legacy       : {result['legacy_eps']:10.0f} events/s")
+    print(f"  single-pass  : {result['single_pass_eps']:10.0f} events/s")
+    print(f"  speedup      : {result['single_pass_eps'] / result['legacy_eps']:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
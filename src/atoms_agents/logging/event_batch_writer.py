@@ -0,0 +1,196 @@
+"""Background batching writer for Event Spine V2 persistence.
+
+Events are handed off to a bounded in-memory queue and written in batches by a
+dedicated thread, so emitting an event never waits on a database round-trip.
+A thread (rather than an asyncio task) is used because the shared loggers are
+called from many short-lived event loops.
+
+Backpressure policy (per EventPriority):
+- TRUTH / CRITICAL are never shed: when the queue is full the producer waits
+  (up to `block_timeout`) for room.
+- INFO / GESTURE are shed once the queue is `shed_ratio` full, keeping the
+  remaining headroom for authoritative events.
+
+Config (env):
+- NORTHSTAR_EVENT_QUEUE_SIZE: max queued events (default 10000)
+- NORTHSTAR_EVENT_BATCH_SIZE: max events per bulk write (default 200)
+- NORTHSTAR_EVENT_FLUSH_MS: max time an event waits for its batch to fill (default 250)
+"""
+
+import asyncio
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+_STOP = object()
+
+_NEVER_SHED = {"truth", "critical"}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+class EventBatchWriter:
+    """Queues items and calls `sink(batch)` from a background thread."""
+
+    def __init__(
+        self,
+        sink: Callable[[List[Any]], None],
+        max_queue: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        shed_ratio: float = 0.8,
+        block_timeout: float = 5.0,
+    ):
+        self.sink = sink
+        self.max_queue = max_queue or _env_int("NORTHSTAR_EVENT_QUEUE_SIZE", 10000)
+        self.batch_size = batch_size or _env_int("NORTHSTAR_EVENT_BATCH_SIZE", 200)
+        self.flush_interval = (
+            flush_interval if flush_interval is not None else _env_int("NORTHSTAR_EVENT_FLUSH_MS", 250) / 1000
+        )
+        self.shed_at = max(1, int(self.max_queue * shed_ratio))
+        self.block_timeout = block_timeout
+        self.logger = logging.getLogger("EventBatchWriter")
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=self.max_queue)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.enqueued = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.dropped: Counter = Counter()
+
+    # ---------------- producer side ----------------
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="event-batch-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def offer(self, item: Any, priority: str) -> bool:
+        """Non-blocking enqueue. Returns False if the item was shed or the queue is full."""
+        if self._closed:
+            self.dropped[priority] += 1
+            return False
+        self._ensure_started()
+        if priority not in _NEVER_SHED and self._queue.qsize() >= self.shed_at:
+            self.dropped[priority] += 1
+            return False
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            if priority not in _NEVER_SHED:
+                self.dropped[priority] += 1
+            return False
+        self.enqueued += 1
+        return True
+
+    async def submit(self, item: Any, priority: str) -> bool:
+        """Enqueue from async code; authoritative events wait (off-loop) for room instead of being shed."""
+        if self.offer(item, priority):
+            return True
+        if priority not in _NEVER_SHED or self._closed:
+            return False
+        try:
+            await asyncio.to_thread(self._queue.put, item, True, self.block_timeout)
+        except queue.Full:
+            self.dropped[priority] += 1
+            self.logger.error("Event queue full for %.1fs; dropped %s event", self.block_timeout, priority)
+            return False
+        self.enqueued += 1
+        return True
+
+    # ---------------- consumer side ----------------
+
+    def _run(self) -> None:
+        batch: List[Any] = []
+        deadline = 0.0
+        while True:
+            timeout = self.flush_interval if not batch else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._write(batch)
+                return
+            if isinstance(item, threading.Event):
+                # flush() marker: everything queued before it is in `batch` now
+                self._write(batch)
+                batch = []
+                item.set()
+                continue
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._write(batch)
+                batch = []
+
+    def _write(self, batch: List[Any]) -> None:
+        if not batch:
+            return
+        try:
+            self.sink(batch)
+            self.written += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            self.logger.error(f"Failed to persist batch of {len(batch)} events: {e}")
+        self.batches += 1
+
+    # ---------------- lifecycle ----------------
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until everything enqueued so far has been handed to the sink."""
+        if self._thread is None:
+            return True
+        marker = threading.Event()
+        self._queue.put(marker)
+        return marker.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Stops accepting events and drains the queue."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is None:
+            return
+        started = time.monotonic()
+        try:
+            # Bounded: a full queue behind a stuck sink must not hang interpreter exit
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            self.logger.error("Event queue still full on close; abandoning %d queued events", self._queue.qsize())
+            return
+        if timeout is not None:
+            timeout = max(0.0, timeout - (time.monotonic() - started))
+        self._thread.join(timeout)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "max_queue": self.max_queue,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "failed": self.failed,
+            "batches": self.batches,
+            "dropped": dict(self.dropped),
+        }
@@ -0,0 +1,27 @@
+"""JSON encoding for event envelopes.
+
+Uses orjson when it is installed and falls back to the standard library with
+the same compact output, so encoded bytes can be handed straight to SSE, WS
+and persistence without encoding each event again.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact JSON bytes for an already JSON-safe object (e.g. model_dump(mode="json"))."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,198 @@
+"""Sampling decisions for events persisted with PersistPolicy.SAMPLED.
+
+Each event is matched to a rate, most specific first: (tenant, event type),
+event type, tenant, then the default rate. On top of the rate:
+
+- errors are always kept;
+- a reservoir keeps the first `reservoir` events per event type each second,
+  so rare event types are never sampled away entirely;
+- events carrying a correlation_id compare a stable per-trace bucket (a hash
+  of the correlation_id) with their own rate, so separate processes agree on
+  the same traces, events of a trace with equal rates share one decision, and
+  a trace kept at a low rate is also kept for every higher-rate event type. A
+  trace admitted through the reservoir keeps all of its later events.
+
+Sampling is opt-in: with no config every event is kept. Lower the default
+rate or add rules to start dropping events.
+
+Config (env):
+- NORTHSTAR_EVENT_SAMPLE_RATE: default keep rate, 0..1 (default 1.0)
+- NORTHSTAR_EVENT_SAMPLE_RESERVOIR: always-kept events per type per second (default 1)
+- NORTHSTAR_EVENT_SAMPLE_RULES: JSON overrides, e.g.
+  {"types": {"model_inference": 1.0}, "tenants": {"<uuid>": 0.5},
+   "tenant_types": {"<uuid>:chat_message": 0.0}}
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_RATE = 1.0
+DEFAULT_RESERVOIR = 1
+_PROMOTED_TRACES_MAX = 50_000
+_announced = False  # sampling config is logged once per process
+
+
+def _trace_bucket(correlation_id: str) -> float:
+    return zlib.crc32(correlation_id.encode("utf-8")) / 0xFFFFFFFF
+
+
+class EventSampler:
+    def __init__(
+        self,
+        default_rate: float = DEFAULT_RATE,
+        type_rates: Optional[Dict[str, float]] = None,
+        tenant_rates: Optional[Dict[str, float]] = None,
+        tenant_type_rates: Optional[Dict[Tuple[str, str], float]] = None,
+        reservoir: int = DEFAULT_RESERVOIR,
+        keep_errors: bool = True,
+        rng: Optional[Any] = None,
+    ):
+        self.default_rate = default_rate
+        self.type_rates = type_rates or {}
+        self.tenant_rates = tenant_rates or {}
+        self.tenant_type_rates = tenant_type_rates or {}
+        self.reservoir = reservoir
+        self.keep_errors = keep_errors
+        if rng is None:
+            import random
+            rng = random.Random()
+        self._rng = rng
+        self._lock = threading.Lock()
+        self._reservoir_window: Dict[str, Tuple[int, int]] = {}  # event type -> (second, used)
+        # Traces admitted through the reservoir; their later events are all kept
+        self._promoted_traces: "OrderedDict[str, None]" = OrderedDict()
+        self.kept: Counter = Counter()
+        self.dropped: Counter = Counter()
+        self.kept_by_reason: Counter = Counter()
+
+    @classmethod
+    def from_env(cls) -> "EventSampler":
+        logger = logging.getLogger("EventSampler")
+        try:
+            rate = float(os.getenv("NORTHSTAR_EVENT_SAMPLE_RATE", DEFAULT_RATE))
+        except ValueError:
+            rate = DEFAULT_RATE
+        try:
+            reservoir = int(os.getenv("NORTHSTAR_EVENT_SAMPLE_RESERVOIR", DEFAULT_RESERVOIR))
+        except ValueError:
+            reservoir = DEFAULT_RESERVOIR
+
+        rules: Dict[str, Any] = {}
+        raw = os.getenv("NORTHSTAR_EVENT_SAMPLE_RULES")
+        if raw:
+            try:
+                rules = json.loads(raw)
+            except ValueError as e:
+                logger.error(f"Ignoring invalid NORTHSTAR_EVENT_SAMPLE_RULES: {e}")
+
+        tenant_types = {}
+        for key, value in (rules.get("tenant_types") or {}).items():
+            tenant_id, _, event_type = key.partition(":")
+            tenant_types[(tenant_id, event_type)] = float(value)
+
+        sampler = cls(
+            default_rate=rate,
+            type_rates={k: float(v) for k, v in (rules.get("types") or {}).items()},
+            tenant_rates={k: float(v) for k, v in (rules.get("tenants") or {}).items()},
+            tenant_type_rates=tenant_types,
+            reservoir=reservoir,
+        )
+        global _announced
+        if sampler.samples() and not _announced:
+            _announced = True
+            logger.info(
+                f"Sampling SAMPLED events: default rate {rate}, {len(rules.get('types') or {})} type, "
+                f"{len(rules.get('tenants') or {})} tenant and {len(tenant_types)} tenant/type rule(s)"
+            )
+        return sampler
+
+    def samples(self) -> bool:
+        """True if any configured rate can drop events."""
+        rates = [
+            self.default_rate,
+            *self.type_rates.values(),
+            *self.tenant_rates.values(),
+            *self.tenant_type_rates.values(),
+        ]
+        return any(rate < 1.0 for rate in rates)
+
+    def rate_for(self, event_type: str, tenant_id: Optional[str]) -> float:
+        if tenant_id is not None:
+            rate = self.tenant_type_rates.get((tenant_id, event_type))
+            if rate is not None:
+                return rate
+        rate = self.type_rates.get(event_type)
+        if rate is not None:
+            return rate
+        if tenant_id is not None:
+            rate = self.tenant_rates.get(tenant_id)
+            if rate is not None:
+                return rate
+        return self.default_rate
+
+    def should_keep(
+        self,
+        event_type: str,
+        tenant_id: Optional[str] = None,
+        correlation_id: Optional[str] = None,
+        is_error: bool = False,
+    ) -> bool:
+        with self._lock:
+            keep, reason = self._decide(event_type, tenant_id, correlation_id, is_error)
+            if keep:
+                self.kept[event_type] += 1
+                self.kept_by_reason[reason] += 1
+            else:
+                self.dropped[event_type] += 1
+            return keep
+
+    def _decide(
+        self, event_type: str, tenant_id: Optional[str], correlation_id: Optional[str], is_error: bool
+    ) -> Tuple[bool, str]:
+        if is_error and self.keep_errors:
+            return True, "error"
+
+        if correlation_id:
+            if correlation_id in self._promoted_traces:
+                self._promoted_traces.move_to_end(correlation_id)
+                return True, "trace"
+            if _trace_bucket(correlation_id) < self.rate_for(event_type, tenant_id):
+                return True, "rate"
+            if self._take_reservoir(event_type):
+                self._promoted_traces[correlation_id] = None
+                while len(self._promoted_traces) > _PROMOTED_TRACES_MAX:
+                    self._promoted_traces.popitem(last=False)
+                return True, "reservoir"
+            return False, "rate"
+
+        if self._take_reservoir(event_type):
+            return True, "reservoir"
+        return self._rng.random() < self.rate_for(event_type, tenant_id), "rate"
+
+    def _take_reservoir(self, event_type: str) -> bool:
+        if self.reservoir <= 0:
+            return False
+        second = int(time.monotonic())
+        window, used = self._reservoir_window.get(event_type, (second, 0))
+        if window != second:
+            window, used = second, 0
+        if used >= self.reservoir:
+            return False
+        self._reservoir_window[event_type] = (window, used + 1)
+        return True
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "kept": dict(self.kept),
+                "dropped": dict(self.dropped),
+                "kept_by_reason": dict(self.kept_by_reason),
+                "kept_total": sum(self.kept.values()),
+                "dropped_total": sum(self.dropped.values()),
+            }
@@ -12,7 +12,6 @@ Key Responsibilities:
 """
 
 import asyncio
-import json
 import logging
 import os
 import uuid
@@ -27,6 +26,10 @@ from atoms_core.event_spine.models import EventCreate
 from atoms_core.event_spine.repository import EventRepository
 from atoms_core.event_spine.service import EventService
 
+from atoms_agents.logging import event_codec
+from atoms_agents.logging.event_batch_writer import EventBatchWriter
+from atoms_agents.logging.event_sampler import EventSampler
+
 # ============================================
 # EVENT V2 CONTRACT TYPES
 # ============================================
@@ -151,6 +154,27 @@ class EventV2(BaseModel):
     schema_version: str = "1.0.0"
 
 
+class SerializedEvent:
+    """An envelope serialized once and shared by SSE, WS and persistence."""
+
+    __slots__ = ("data", "_encoded")
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data  # JSON-safe dict (model_dump(mode="json"))
+        self._encoded: Optional[bytes] = None
+
+    @property
+    def encoded(self) -> bytes:
+        """Compact JSON bytes, encoded on first use (orjson when installed)."""
+        if self._encoded is None:
+            self._encoded = event_codec.dumps(self.data)
+        return self._encoded
+
+
+_ROUTING_FIELDS = tuple(RoutingKeys.model_fields)
+_ROUTING_CACHE_MAX = 1024
+
+
 # ============================================
 # EVENT V2 LOGGER
 # ============================================
@@ -165,6 +189,9 @@ class EventV2Logger:
         project_id: str,
         supabase_client: Optional[Any] = None,
         transport_client: Optional[Any] = None,
+        batched: Optional[bool] = None,
+        batch_writer: Optional[EventBatchWriter] = None,
+        sampler: Optional[EventSampler] = None,
     ):
         """Initialize EventV2 logger.
         
@@ -173,6 +200,11 @@ class EventV2Logger:
             project_id: Project identifier
             supabase_client: Supabase client for persisting logs
             transport_client: CanvasTransport client for real-time emission
+            batched: Persist through a background batching writer instead of
+                one awaited insert per event (default: NORTHSTAR_EVENT_BATCHING != "0")
+            batch_writer: Writer to use when batched (one is created on first use otherwise)
+            sampler: Decides which PersistPolicy.SAMPLED events are persisted
+                (default: EventSampler.from_env())
         """
         self.tenant_id = tenant_id
         self.project_id = project_id
@@ -180,6 +212,40 @@ class EventV2Logger:
         self.transport_client = transport_client
         self.logger = logging.getLogger("EventV2Logger")
         self._event_spine_service: Optional[EventService] = None
+        if batched is None:
+            batched = os.getenv("NORTHSTAR_EVENT_BATCHING", "1") != "0"
+        self.batched = batched
+        self._batch_writer = batch_writer
+        self.sampler = sampler or EventSampler.from_env()
+        # Routing keys repeat across a run's events; dump each combination once
+        self._routing_dicts: Dict[tuple, Dict[str, Any]] = {}
+
+    @property
+    def batch_writer(self) -> EventBatchWriter:
+        if self._batch_writer is None:
+            self._batch_writer = EventBatchWriter(self._write_spine_batch)
+        return self._batch_writer
+
+    def _write_spine_batch(self, batch: List[EventCreate]) -> None:
+        """Sink for the batch writer (runs on its thread)."""
+        svc = self._get_event_spine_service()
+        bulk = getattr(svc, "append_events", None)
+        if callable(bulk):
+            bulk(batch)
+            return
+        for spine_event in batch:
+            svc.append_event(spine_event)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits until every queued event has been written (no-op when not batched)."""
+        if self._batch_writer is None:
+            return True
+        return self._batch_writer.flush(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Drains queued events; call on shutdown."""
+        if self._batch_writer is not None:
+            self._batch_writer.close(timeout)
 
     def _get_event_spine_service(self) -> EventService:
         if self._event_spine_service is not None:
@@ -247,6 +313,24 @@ class EventV2Logger:
             request_id=request_id,
         )
     
+    def _routing_dict(self, routing: RoutingKeys) -> Dict[str, Any]:
+        key = tuple(getattr(routing, name) for name in _ROUTING_FIELDS)
+        cached = self._routing_dicts.get(key)
+        if cached is None:
+            if len(self._routing_dicts) >= _ROUTING_CACHE_MAX:
+                self._routing_dicts.clear()
+            cached = self._routing_dicts[key] = routing.model_dump(mode="json")
+        return cached
+
+    def serialize(self, event: EventV2) -> SerializedEvent:
+        """Single-pass JSON-mode dump of an envelope, reusing the cached routing dict.
+
+        Treat the result as read-only: its `routing` dict is shared with other events.
+        """
+        data = event.model_dump(mode="json", exclude={"routing"})
+        data["routing"] = self._routing_dict(event.routing)
+        return SerializedEvent(data)
+
     async def emit_event(
         self,
         event: EventV2,
@@ -263,49 +347,91 @@ class EventV2Logger:
             persist_to_db: Persist to Supabase Event Spine V2 (`event_spine_v2_*`)
         """
         try:
-            event_dict = json.loads(event.model_dump_json())
+            serialized = self.serialize(event)
+            event_dict = serialized.data
+            # Transports that can send pre-encoded JSON get the bytes too
+            takes_encoded = getattr(self.transport_client, "accepts_encoded", False)
             
             # Emit to SSE (canvas state truth)
             if emit_to_sse and self.transport_client:
                 try:
-                    await self.transport_client.emit_sse(
-                        canvas_id=event.routing.canvas_id,
-                        event_data=event_dict,
-                    )
+                    if takes_encoded:
+                        await self.transport_client.emit_sse(
+                            canvas_id=event.routing.canvas_id,
+                            event_data=event_dict,
+                            encoded=serialized.encoded,
+                        )
+                    else:
+                        await self.transport_client.emit_sse(
+                            canvas_id=event.routing.canvas_id,
+                            event_data=event_dict,
+                        )
                 except Exception as e:
                     self.logger.error(f"Failed to emit SSE event: {e}")
             
             # Emit to WS (chat rail - fast like WhatsApp)
             if emit_to_ws and self.transport_client:
                 try:
-                    await self.transport_client.emit_ws(
-                        thread_id=event.routing.thread_id,
-                        event_data=event_dict,
-                    )
+                    if takes_encoded:
+                        await self.transport_client.emit_ws(
+                            thread_id=event.routing.thread_id,
+                            event_data=event_dict,
+                            encoded=serialized.encoded,
+                        )
+                    else:
+                        await self.transport_client.emit_ws(
+                            thread_id=event.routing.thread_id,
+                            event_data=event_dict,
+                        )
                 except Exception as e:
                     self.logger.error(f"Failed to emit WS event: {e}")
             
             # Persist to Supabase (Event Spine V2)
-            if persist_to_db and event.persist_policy != PersistPolicy.NEVER:
+            if persist_to_db and self._should_persist(event):
                 try:
-                    await self._persist_event(event)
+                    await self._persist_event(event, serialized)
                 except Exception as e:
                     self.logger.error(f"Failed to persist event to DB: {e}")
         
         except Exception as e:
             self.logger.error(f"Error emitting event: {e}")
     
-    async def _persist_event(self, event: EventV2) -> None:
+    def _should_persist(self, event: EventV2) -> bool:
+        if event.persist_policy == PersistPolicy.NEVER:
+            return False
+        if event.persist_policy == PersistPolicy.ALWAYS:
+            return True
+        return self.sampler.should_keep(
+            event.type,
+            tenant_id=event.routing.tenant_id,
+            correlation_id=event.correlation_id,
+            is_error=event.severity == EventSeverity.ERROR or event.priority == EventPriority.CRITICAL,
+        )
+
+    async def _persist_event(self, event: EventV2, serialized: Optional[SerializedEvent] = None) -> None:
         """Persist event to Supabase Event Spine V2 (`event_spine_v2_*`)."""
+        spine_event = self._to_spine_event(event, serialized)
+        if spine_event is None:
+            return
+
+        if self.batched:
+            await self.batch_writer.submit(spine_event, event.priority.value)
+            return
+
+        svc = self._get_event_spine_service()
+        await asyncio.to_thread(svc.append_event, spine_event)
+
+    def _to_spine_event(self, event: EventV2, serialized: Optional[SerializedEvent] = None) -> Optional[EventCreate]:
+        """Maps an EventV2 envelope onto an Event Spine row, or None if it can't be persisted."""
         tenant_id = event.routing.tenant_id
         if not tenant_id:
-            return
+            return None
         try:
             uuid.UUID(str(tenant_id))
         except Exception:
             # Common during local/dev when EVENT_TENANT_ID isn't wired yet.
             self.logger.debug("Skipping Event Spine persist: tenant_id is not a UUID (%s)", tenant_id)
-            return
+            return None
 
         run_id = event.run_id or event.correlation_id or event.request_id or event.event_id
         if not run_id:
@@ -341,7 +467,11 @@ class EventV2Logger:
                 }
             )
 
-        payload = dict(event.payload or {})
+        if serialized is None:
+            serialized = self.serialize(event)
+        data = serialized.data
+
+        payload = dict(data["payload"] or {})
         payload["_event_v2"] = {
             "event_id": event.event_id,
             "correlation_id": event.correlation_id,
@@ -351,10 +481,10 @@ class EventV2Logger:
             "persist_policy": event.persist_policy.value,
             "storage_class": event.storage_class.value,
             "actor_type": event.routing.actor_type.value,
-            "routing": event.routing.model_dump(),
+            "routing": dict(data["routing"]),
         }
 
-        spine_event = EventCreate(
+        return EventCreate(
             tenant_id=str(tenant_id),
             mode=os.getenv("EVENT_MODE", "system"),
             project_id=event.routing.project_id,
@@ -380,9 +510,6 @@ class EventV2Logger:
             artifacts=artifacts or None,
         )
 
-        svc = self._get_event_spine_service()
-        await asyncio.to_thread(svc.append_event, spine_event)
-
 
 # ============================================
 # PROVIDER EVENT WRAPPER
@@ -62,7 +62,7 @@ async def publish_event_to_transport(
         return
 
     transport = get_transport()
-    payload = event.model_dump()
+    payload = event.model_dump(mode="json")
 
     if canvas_id:
         try:
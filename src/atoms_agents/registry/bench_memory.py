@@ -0,0 +1,112 @@
+"""
+Memory benchmark: compact (slotted, frozen, interned) cards vs the previous plain dataclasses.
+
+Builds a synthetic registry of model and capability-binding cards in both
+representations and reports the bytes each one holds (tracemalloc), the way a
+worker process would after parsing YAML: every string arrives as a fresh object.
+
+    python -m atoms_agents.registry.bench_memory [--cards 50000]
+"""
+import argparse
+import dataclasses
+import gc
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from atoms_agents.registry.schemas import CapabilityBindingCard, ModelCard
+
+_PROVIDERS = ["groq", "gemini", "openrouter", "bedrock", "vertex", "azure_openai", "comet", "nvidia"]
+_CONFIDENCE = ["experimental", "verified", "deprecated"]
+_STREAMING = ["none", "token", "bidirectional"]
+_EFFORT = ["low", "medium", "high"]
+_CAPABILITIES = [f"cap.{name}" for name in ("tools", "vision", "json_mode", "search", "audio", "code_exec")]
+
+
+def _legacy(cls: type) -> type:
+    """Same fields as `cls`, as a plain (dict-backed, unfrozen, non-interning) dataclass."""
+    fields = [
+        (f.name, f.type, dataclasses.field(default=f.default, default_factory=f.default_factory))
+        for f in dataclasses.fields(cls)
+    ]
+    return dataclasses.make_dataclass(f"Legacy{cls.__name__}", fields)
+
+
+def _fresh(value: str) -> str:
+    # YAML hands back a new str per occurrence; mimic that so interning has something to do
+    return "".join(list(value))
+
+
+def _model_kwargs(i: int) -> Dict[str, Any]:
+    provider = _PROVIDERS[i % len(_PROVIDERS)]
+    return {
+        "model_id": f"model.{provider}.m{i}",
+        "provider_id": _fresh(provider),
+        "official_id": f"{provider}/model-{i}",
+        "family_id": _fresh(f"family_{i % 40}"),
+        "version": _fresh(str(i % 5)),
+        "reasoning_effort": _fresh(_EFFORT[i % 3]),
+        "context_window": 128000,
+        "platform_api_surface": _fresh(f"{provider}_chat"),
+        "invocation_primitive": _fresh("chat.completions"),
+        "streaming_support": _fresh(_STREAMING[i % 3]),
+        "credential_discovery": _fresh("env"),
+        "last_updated_or_version": _fresh("2025-01"),
+        "confidence": _fresh(_CONFIDENCE[i % 3]),
+    }
+
+
+def _binding_kwargs(i: int) -> Dict[str, Any]:
+    provider = _PROVIDERS[i % len(_PROVIDERS)]
+    return {
+        "binding_id": f"binding.{provider}.b{i}",
+        "provider_id": _fresh(provider),
+        "model_or_deployment_id": _fresh(f"model.{provider}.m{i % 500}"),
+        "capability_id": _fresh(_CAPABILITIES[i % len(_CAPABILITIES)]),
+        "toggle_mechanism": _fresh("request_param"),
+        "streaming_support": _fresh(_STREAMING[i % 3]),
+        "last_updated_or_version": _fresh("2025-01"),
+        "confidence": _fresh(_CONFIDENCE[i % 3]),
+    }
+
+
+def _measure(build: Callable[[], List[Any]]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    cards = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del cards
+    return current
+
+
+def run(card_count: int = 50_000) -> Dict[str, int]:
+    """Returns bytes held by `card_count` cards (half models, half bindings) per representation."""
+    half = card_count // 2
+    legacy_model, legacy_binding = _legacy(ModelCard), _legacy(CapabilityBindingCard)
+
+    def build_legacy() -> List[Any]:
+        return [legacy_model(**_model_kwargs(i)) for i in range(half)] + [
+            legacy_binding(**_binding_kwargs(i)) for i in range(card_count - half)
+        ]
+
+    def build_compact() -> List[Any]:
+        return [ModelCard(**_model_kwargs(i)) for i in range(half)] + [
+            CapabilityBindingCard(**_binding_kwargs(i)) for i in range(card_count - half)
+        ]
+
+    return {"cards": card_count, "legacy_bytes": _measure(build_legacy), "compact_bytes": _measure(build_compact)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cards", type=int, default=50_000)
+    result = run(parser.parse_args().cards)
+    legacy, compact = result["legacy_bytes"], result["compact_bytes"]
+    print(f"{result['cards']} cards")
+    print(f"  legacy dataclasses : {legacy / 1e6:8.1f} MB ({legacy / result['cards']:.0f} B/card)")
+    print(f"  slotted + interned : {compact / 1e6:8.1f} MB ({compact / result['cards']:.0f} B/card)")
+    print(f"  saved              : {(1 - compact / legacy) * 100:8.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
 import os
+import threading
+import time
 import yaml
-from typing import List, Any, Dict
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Any, Dict, Optional, Tuple
+from dataclasses import dataclass, field
 from atoms_agents.registry.schemas import (
     ModeCard,
     FrameworkAdapterCard,
@@ -36,6 +39,23 @@ from atoms_agents.registry.schemas.lenses import (
     InteractionStateCard
 )
 from atoms_agents.registry.schemas.graph import GraphDefinitionCard
+from atoms_agents.registry.parsers import (
+    parse_mode, parse_framework, parse_framework_card, parse_profile,
+    parse_provider, parse_model, parse_model_family, parse_capability,
+    parse_capability_binding, parse_persona,
+    parse_task, parse_artifact_spec,
+    parse_flow,
+    parse_manifest, parse_firearms_license, parse_reasoning_profile, parse_agent
+)
+from atoms_agents.registry.snapshot import (
+    FileEntry,
+    Manifest,
+    RegistrySnapshot,
+    SnapshotStore,
+    code_fingerprint,
+    scan_manifest,
+    snapshots_enabled,
+)
 
 @dataclass
 class RegistryContext:
@@ -75,77 +95,346 @@ class RegistryContext:
     lens_interactions: Dict[str, Any]
     graph_definitions: Dict[str, Any]
 
+    # Secondary indexes over the card dicts above, built in __post_init__.
+    # A hot reload builds a new context, so they never go stale on their own;
+    # call rebuild_indexes() after mutating models/bindings in place.
+    models_by_official_id: Dict[Tuple[str, str], ModelCard] = field(default_factory=dict)
+    models_by_provider: Dict[str, List[ModelCard]] = field(default_factory=dict)
+    models_by_family: Dict[str, List[ModelCard]] = field(default_factory=dict)
+    bindings_by_capability: Dict[str, List[CapabilityBindingCard]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.rebuild_indexes()
+
+    def rebuild_indexes(self) -> None:
+        self._index_models()
+        self._index_bindings()
+
+    def _index_models(self) -> None:
+        by_official: Dict[Tuple[str, str], ModelCard] = {}
+        by_provider: Dict[str, List[ModelCard]] = {}
+        by_family: Dict[str, List[ModelCard]] = {}
+        for model in self.models.values():
+            # First card wins, matching the linear scans these replace
+            by_official.setdefault((model.provider_id, model.official_id), model)
+            by_provider.setdefault(model.provider_id, []).append(model)
+            by_family.setdefault(model.family_id, []).append(model)
+        self.models_by_official_id = by_official
+        self.models_by_provider = by_provider
+        self.models_by_family = by_family
+
+    def _index_bindings(self) -> None:
+        by_capability: Dict[str, List[CapabilityBindingCard]] = {}
+        for binding in self.bindings.values():
+            by_capability.setdefault(binding.capability_id, []).append(binding)
+        self.bindings_by_capability = by_capability
+
+
+# RegistryContext card dict -> (source directory, id attribute, card class).
+# Without a class, any card carrying the id attribute is accepted.
+_CONTEXT_FIELDS: Dict[str, Tuple[Optional[str], str, Optional[type]]] = {
+    "frameworks": ("frameworks", "framework_id", FrameworkCard),
+    "modes": ("framework_modes", "id", ModeCard),
+    "profiles": ("profiles", "profile_id", RunProfileCard),
+    "providers": ("providers", "provider_id", ProviderConfigCard),
+    "families": ("families", "family_id", ModelFamilyCard),
+    "models": ("models", "model_id", ModelCard),
+    "capabilities": ("capabilities", "capability_id", CapabilityCard),
+    "bindings": ("capability_bindings", "binding_id", CapabilityBindingCard),
+    "personas": ("personas", "persona_id", PersonaCard),
+    "tasks": ("tasks", "task_id", TaskCard),
+    "artifact_specs": ("artifact_specs", "artifact_spec_id", ArtifactSpecCard),
+    "nodes": (None, "node_id", NodeCard),
+    "flows": ("flows", "flow_id", FlowCard),
+    "overlays": ("overlays", "overlay_id", None),
+    "tenants": ("tenants", "tenant_id", TenantCard),
+    "policy_packs": ("policy_packs", "policy_pack_id", PolicyPackCard),
+    "budgets": ("budgets", "budget_id", BudgetCard),
+    "nexus_profiles": ("nexus_profiles", "nexus_profile_id", NexusProfileCard),
+    # New Cards
+    "manifests": ("manifests", "manifest_id", ManifestCard),
+    "firearms_licenses": ("firearms_licenses", "license_id", FirearmsLicenseCard),
+    "reasoning_profiles": ("reasoning_profiles", "reasoning_id", ReasoningProfileCard),
+    "agents": ("agents", "agent_id", AgentCard),
+    # GraphLens
+    "neutral_nodes": ("neutral_nodes", "node_id", None),
+    "lens_contexts": ("lenses", "context_id", None),
+    "lens_tokens": ("lenses", "token_map_id", None),
+    "lens_safety": ("lenses", "safety_id", None),
+    "lens_logs": ("lenses", "policy_id", None),
+    "lens_interactions": ("lenses", "state_id", None),
+    "graph_definitions": ("graphs", "graph_id", None),
+}
+
+_INDEX_BUILDERS: Dict[str, str] = {
+    "models_by_official_id": "_index_models",
+    "models_by_provider": "_index_models",
+    "models_by_family": "_index_models",
+    "bindings_by_capability": "_index_bindings",
+}
+
+
+# Source directory -> {context field: (id attribute, card class)}; the five lens
+# dicts all come from "lenses" and are built together in one pass.
+_FIELDS_BY_DIRECTORY: Dict[str, Dict[str, Tuple[str, Optional[type]]]] = {}
+for _name, (_directory, _id_attr, _card_cls) in _CONTEXT_FIELDS.items():
+    if _directory is not None:
+        _FIELDS_BY_DIRECTORY.setdefault(_directory, {})[_name] = (_id_attr, _card_cls)
+
+
+def _card_dicts(cards: List[Any], directory: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    """Every context dict sourced from `directory`, filled in a single pass over its cards."""
+    specs = _FIELDS_BY_DIRECTORY.get(directory, {}) if directory else {}
+    dicts: Dict[str, Dict[str, Any]] = {name: {} for name in specs}
+    for card in cards:
+        for name, (id_attr, card_cls) in specs.items():
+            if isinstance(card, card_cls) if card_cls is not None else hasattr(card, id_attr):
+                dicts[name][getattr(card, id_attr)] = card
+    return dicts
+
+
+class LazyRegistryContext(RegistryContext):
+    """
+    RegistryContext whose card dicts are loaded on first attribute access, one
+    directory at a time (through the snapshot like an eager load). Processes that
+    only touch models/providers never parse modes, lenses or graphs.
+    """
+
+    def __init__(self, loader: "RegistryLoader"):
+        self.loader = loader
+        self._materialize_lock = threading.RLock()
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not set yet
+        if name.startswith("_") or (name not in _CONTEXT_FIELDS and name not in _INDEX_BUILDERS):
+            raise AttributeError(name)
+        with self._materialize_lock:
+            if name not in self.__dict__:
+                if name in _INDEX_BUILDERS:
+                    getattr(self, _INDEX_BUILDERS[name])()
+                else:
+                    directory = _CONTEXT_FIELDS[name][0]
+                    if directory is None:
+                        setattr(self, name, {})
+                    else:
+                        # Siblings from the same directory are filled too, so it is loaded once
+                        cards = self.loader._load_cards([directory])[directory]
+                        for field_name, cards_by_id in _card_dicts(cards, directory).items():
+                            if field_name not in self.__dict__:
+                                setattr(self, field_name, cards_by_id)
+            return self.__dict__[name]
+
+
+# Card directories in load order, relative to the registry root.
+CARD_DIRECTORIES: List[str] = [
+    "frameworks",
+    "framework_modes",
+    "profiles",
+    "providers",
+    "families",
+    "models",
+    "capabilities",
+    "capability_bindings",
+    "personas",
+    "tasks",
+    "artifact_specs",
+    "flows",
+    "overlays",
+    "tenants",
+    "policy_packs",
+    "budgets",
+    "nexus_profiles",
+    # New directories
+    "manifests",
+    "firearms_licenses",
+    "reasoning_profiles",
+    "agents",
+    # GraphLens Directories
+    "neutral_nodes",
+    "lenses",
+    "graphs",
+]
+
+# Below this many files a process pool costs more to start than it saves.
+PARALLEL_MIN_FILES = 128
+
+# libyaml-backed loader when PyYAML was built with it; same semantics as safe_load_all
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _default_workers() -> int:
+    try:
+        return max(1, int(os.getenv("NORTHSTAR_REGISTRY_WORKERS", "1")))
+    except ValueError:
+        return 1
+
+
+def _parse_file_job(filepath: str) -> Tuple[Optional[List[Any]], Optional[str], float]:
+    """Process-pool entry point: (cards, error, seconds) for one card file."""
+    started = time.perf_counter()
+    try:
+        return RegistryLoader._load_file(filepath), None, time.perf_counter() - started
+    except Exception as e:
+        return None, str(e), time.perf_counter() - started
+
+
 class RegistryLoader:
-    def __init__(self, root_path: str):
+    def __init__(
+        self,
+        root_path: str,
+        use_snapshot: Optional[bool] = None,
+        snapshot_dir: Optional[str] = None,
+        workers: Optional[int] = None,
+    ):
         self.root_path = root_path
+        self.use_snapshot = snapshots_enabled() if use_snapshot is None else use_snapshot
+        self.snapshot_dir = snapshot_dir
+        # Processes used to parse card files (NORTHSTAR_REGISTRY_WORKERS, default 1 = in-process)
+        self.workers = workers or _default_workers()
+        # Populated by load_context: files seen / re-parsed / dropped and whether the snapshot was reused as-is
+        self.last_load_stats: Dict[str, Any] = {}
+        # Populated by load_context (and accumulated by lazy section loads): scan/total ms
+        # plus per-directory files, parsed and parse_ms
+        self.last_load_timings: Dict[str, Any] = {}
+        # Manifest scanned by the last full load, i.e. the file state that load reflects
+        self.last_manifest: Optional[Manifest] = None
+
+    def load_context(self, lazy: bool = False) -> RegistryContext:
+        """
+        Builds the full context. With lazy=True, returns a LazyRegistryContext that
+        parses each card directory only when its dict is first accessed.
+        """
+        if lazy:
+            return LazyRegistryContext(self)
+        started = time.perf_counter()
+        cards_by_dir = self._load_cards()
+        ctx = self._build_context(cards_by_dir)
+        self.last_load_timings["total_ms"] = (time.perf_counter() - started) * 1000
+        return ctx
+
+    def timing_report(self) -> str:
+        """Human readable breakdown of the last load_context call (or of the lazy sections loaded so far), one line per card directory."""
+        t = self.last_load_timings
+        if not t:
+            return "Registry not loaded yet."
+        lines = [
+            f"Registry load: {t['total_ms']:.1f}ms total, {t['scan_ms']:.1f}ms scan, "
+            f"{t['parse_ms']:.1f}ms parse ({t['workers']} worker(s), yaml={_YAML_LOADER.__name__})"
+        ]
+        for directory, d in t["directories"].items():
+            if d["files"]:
+                lines.append(f"  {directory:<22} {d['files']:>4} files {d['parsed']:>4} parsed {d['parse_ms']:>8.1f}ms")
+        return "\n".join(lines)
+
+    def _load_cards(self, directories: Optional[List[str]] = None) -> Dict[str, List[Any]]:
+        """
+        Collects cards per directory (all of CARD_DIRECTORIES unless `directories` is given). With snapshots enabled, files whose (mtime, size)
+        is unchanged reuse their cached cards; everything else is parsed (in a process
+        pool when there is enough of it). Cards are merged in walk order either way,
+        so the resulting context does not depend on how parsing was scheduled.
+        """
+        scan_started = time.perf_counter()
+        store = None
+        previous = None
+        fingerprint = ""
+        if self.use_snapshot:
+            store = SnapshotStore(self.root_path, self.snapshot_dir)
+            fingerprint = code_fingerprint()
+            previous = store.load(fingerprint)
+        previous_files = previous.files if previous else {}
+
+        partial = directories is not None
+        directories = directories or CARD_DIRECTORIES
+        manifest = scan_manifest(self.root_path, directories)
+        scan_ms = (time.perf_counter() - scan_started) * 1000
+        if not partial:
+            self.last_manifest = manifest
 
-    def load_context(self) -> RegistryContext:
-        # Load directories independently
-        cards_frameworks = self.load_cards_from_dir("frameworks")
-        cards_modes = self.load_cards_from_dir("framework_modes")
-        cards_profiles = self.load_cards_from_dir("profiles")
-        cards_providers = self.load_cards_from_dir("providers")
-        cards_families = self.load_cards_from_dir("families")
-        cards_models = self.load_cards_from_dir("models")
-        cards_capabilities = self.load_cards_from_dir("capabilities")
-        cards_bindings = self.load_cards_from_dir("capability_bindings")
-        cards_personas = self.load_cards_from_dir("personas")
-        cards_tasks = self.load_cards_from_dir("tasks")
-        cards_artifact_specs = self.load_cards_from_dir("artifact_specs")
-        cards_flows = self.load_cards_from_dir("flows")
-        cards_overlays = self.load_cards_from_dir("overlays")
-        cards_tenants = self.load_cards_from_dir("tenants")
-        cards_policies = self.load_cards_from_dir("policy_packs")
-        cards_budgets = self.load_cards_from_dir("budgets")
-        cards_nexus_profiles = self.load_cards_from_dir("nexus_profiles")
-
-        # New directories
-        cards_manifests = self.load_cards_from_dir("manifests")
-        cards_firearms = self.load_cards_from_dir("firearms_licenses")
-        cards_reasoning = self.load_cards_from_dir("reasoning_profiles")
-        cards_agents = self.load_cards_from_dir("agents")
-
-        # GraphLens Directories
-        cards_neutral = self.load_cards_from_dir("neutral_nodes")
-        cards_lenses = self.load_cards_from_dir("lenses")
-        cards_graphs = self.load_cards_from_dir("graphs")
-
-        return RegistryContext(
-            loader=self,
-            frameworks={c.framework_id: c for c in cards_frameworks if isinstance(c, FrameworkCard)},
-            modes={c.id: c for c in cards_modes if isinstance(c, ModeCard)},
-            profiles={c.profile_id: c for c in cards_profiles if isinstance(c, RunProfileCard)},
-            providers={c.provider_id: c for c in cards_providers if isinstance(c, ProviderConfigCard)},
-            families={c.family_id: c for c in cards_families if isinstance(c, ModelFamilyCard)},
-            models={c.model_id: c for c in cards_models if isinstance(c, ModelCard)},
-            capabilities={c.capability_id: c for c in cards_capabilities if isinstance(c, CapabilityCard)},
-            bindings={c.binding_id: c for c in cards_bindings if isinstance(c, CapabilityBindingCard)},
-            personas={c.persona_id: c for c in cards_personas if isinstance(c, PersonaCard)},
-            tasks={c.task_id: c for c in cards_tasks if isinstance(c, TaskCard)},
-            artifact_specs={c.artifact_spec_id: c for c in cards_artifact_specs if isinstance(c, ArtifactSpecCard)},
-            nodes={},
-            flows={c.flow_id: c for c in cards_flows if isinstance(c, FlowCard)},
-            overlays={c.overlay_id: c for c in cards_overlays if hasattr(c, 'overlay_id')},
-            tenants={c.tenant_id: c for c in cards_tenants if isinstance(c, TenantCard)},
-            policy_packs={c.policy_pack_id: c for c in cards_policies if isinstance(c, PolicyPackCard)},
-            budgets={c.budget_id: c for c in cards_budgets if isinstance(c, BudgetCard)},
-            nexus_profiles={c.nexus_profile_id: c for c in cards_nexus_profiles if isinstance(c, NexusProfileCard)},
-
-            # New Cards
-            manifests={c.manifest_id: c for c in cards_manifests if isinstance(c, ManifestCard)},
-            firearms_licenses={c.license_id: c for c in cards_firearms if isinstance(c, FirearmsLicenseCard)},
-            reasoning_profiles={c.reasoning_id: c for c in cards_reasoning if isinstance(c, ReasoningProfileCard)},
-            agents={c.agent_id: c for c in cards_agents if isinstance(c, AgentCard)},
-
-            # GraphLens
-            neutral_nodes={c.node_id: c for c in cards_neutral if hasattr(c, 'node_id')},
-            lens_contexts={c.context_id: c for c in cards_lenses if hasattr(c, 'context_id')},
-            lens_tokens={c.token_map_id: c for c in cards_lenses if hasattr(c, 'token_map_id')},
-            lens_safety={c.safety_id: c for c in cards_lenses if hasattr(c, 'safety_id')},
-            lens_logs={c.policy_id: c for c in cards_lenses if hasattr(c, 'policy_id')},
-            lens_interactions={c.state_id: c for c in cards_lenses if hasattr(c, 'state_id')},
-            graph_definitions={c.graph_id: c for c in cards_graphs if hasattr(c, 'graph_id')}
+        stale = [
+            rel for rel, (_, mtime_ns, size) in manifest.items()
+            if rel not in previous_files
+            or previous_files[rel].mtime_ns != mtime_ns
+            or previous_files[rel].size != size
+        ]
+        parse_started = time.perf_counter()
+        parsed = dict(zip(stale, self._parse_files([os.path.join(self.root_path, rel) for rel in stale])))
+        parse_ms = (time.perf_counter() - parse_started) * 1000
+
+        # Entries of directories outside this load are carried over untouched
+        snapshot = RegistrySnapshot(
+            code_fingerprint=fingerprint,
+            files={rel: e for rel, e in previous_files.items() if e.directory not in directories},
+        )
+        cards_by_dir: Dict[str, List[Any]] = {d: [] for d in directories}
+        dir_timings = {d: {"files": 0, "parsed": 0, "parse_ms": 0.0} for d in directories}
+
+        for rel, (directory, mtime_ns, size) in manifest.items():
+            dir_timings[directory]["files"] += 1
+            if rel in parsed:
+                cards, error, seconds = parsed[rel]
+                dir_timings[directory]["parsed"] += 1
+                dir_timings[directory]["parse_ms"] += seconds * 1000
+                if error is not None:
+                    # Not cached, so a broken file is retried (and reported) on the next load
+                    print(f"Error loading {os.path.join(self.root_path, rel)}: {error}")
+                    continue
+                entry = FileEntry(directory, mtime_ns, size, cards)
+            else:
+                entry = previous_files[rel]
+            snapshot.files[rel] = entry
+            cards_by_dir[directory].extend(entry.cards)
+
+        removed = sum(
+            1 for rel, e in previous_files.items() if e.directory in directories and rel not in manifest
         )
+        if store is not None and (previous is None or stale or removed):
+            store.save(snapshot)
+
+        self.last_load_stats = {
+            "files": len(manifest),
+            "reparsed": len(stale),
+            "removed": removed,
+            "snapshot_hit": previous is not None and not stale and not removed,
+        }
+        timings = {
+            "total_ms": (time.perf_counter() - scan_started) * 1000,
+            "scan_ms": scan_ms,
+            "parse_ms": parse_ms,
+            "workers": self._pool_workers(len(stale)),
+            "directories": dir_timings,
+        }
+        previous_timings = self.last_load_timings
+        if partial and previous_timings:
+            # Lazy section loads add up instead of replacing the report
+            for key in ("total_ms", "scan_ms", "parse_ms"):
+                timings[key] += previous_timings.get(key, 0.0)
+            timings["workers"] = max(timings["workers"], previous_timings.get("workers", 1))
+            timings["directories"] = {**previous_timings.get("directories", {}), **dir_timings}
+        self.last_load_timings = timings
+        return cards_by_dir
+
+    def _pool_workers(self, file_count: int) -> int:
+        if self.workers <= 1 or file_count < PARALLEL_MIN_FILES:
+            return 1
+        return min(self.workers, file_count)
+
+    def _parse_files(self, filepaths: List[str]) -> List[Tuple[Optional[List[Any]], Optional[str], float]]:
+        """Parses files in order; results line up with `filepaths`."""
+        workers = self._pool_workers(len(filepaths))
+        if workers > 1:
+            try:
+                chunksize = max(1, len(filepaths) // (workers * 4))
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    return list(pool.map(_parse_file_job, filepaths, chunksize=chunksize))
+            except Exception as e:
+                print(f"[RegistryLoader] Process pool unavailable, parsing in-process: {e}")
+        return [_parse_file_job(fp) for fp in filepaths]
+
+    def _build_context(self, cards_by_dir: Dict[str, List[Any]]) -> RegistryContext:
+        fields: Dict[str, Dict[str, Any]] = {name: {} for name in _CONTEXT_FIELDS}
+        for directory in _FIELDS_BY_DIRECTORY:
+            fields.update(_card_dicts(cards_by_dir[directory], directory))
+        return RegistryContext(loader=self, **fields)
 
     def load_cards_from_dir(self, directory: str) -> List[Any]:
         cards: List[Any] = []
@@ -165,20 +454,12 @@ class RegistryLoader:
         return cards
 
 
-    def _load_file(self, filepath: str) -> List[Any]:
+    @staticmethod
+    def _load_file(filepath: str) -> List[Any]:
         loaded: List[Any] = []
 
         with open(filepath, "r", encoding="utf-8") as f:
-            docs = list(yaml.safe_load_all(f))
-
-        from .parsers import (
-            parse_mode, parse_framework, parse_framework_card, parse_profile,
-            parse_provider, parse_model, parse_model_family, parse_capability,
-            parse_capability_binding, parse_persona,
-            parse_task, parse_artifact_spec,
-            parse_flow,
-            parse_manifest, parse_firearms_license, parse_reasoning_profile, parse_agent
-        )
+            docs = list(yaml.load_all(f, Loader=_YAML_LOADER))
 
         for doc in docs:
             if not doc or not isinstance(doc, dict):
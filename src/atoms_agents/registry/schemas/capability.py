@@ -1,12 +1,24 @@
 from dataclasses import dataclass, field
 from typing import Any, Dict
 
+from atoms_agents.registry.schemas.interning import intern_fields
 
-@dataclass
+_INTERNED_FIELDS = (
+    "embedded_or_separate",
+)
+
+
+@dataclass(frozen=True, slots=True, eq=True, unsafe_hash=False)
 class CapabilityCard:
+    # Frozen would generate a __hash__ that raises TypeError on the dict fields
+    __hash__ = None  # type: ignore[assignment]
+
     capability_id: str
     capability_name: str
     description: str = ""
     embedded_or_separate: str = "EMBEDDED"
     parameters: Dict[str, Any] = field(default_factory=dict)
     card_type: str = "capability"
+
+    def __post_init__(self) -> None:
+        intern_fields(self, _INTERNED_FIELDS)
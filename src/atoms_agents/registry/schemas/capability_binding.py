@@ -1,7 +1,19 @@
 from dataclasses import dataclass
 
+from atoms_agents.registry.schemas.interning import intern_fields
 
-@dataclass
+_INTERNED_FIELDS = (
+    "provider_id",
+    "model_or_deployment_id",
+    "capability_id",
+    "toggle_mechanism",
+    "streaming_support",
+    "last_updated_or_version",
+    "confidence",
+)
+
+
+@dataclass(frozen=True, slots=True)
 class CapabilityBindingCard:
     binding_id: str
     provider_id: str
@@ -17,3 +29,5 @@ class CapabilityBindingCard:
     notes: str = ""
     card_type: str = "capability_binding"
 
+    def __post_init__(self) -> None:
+        intern_fields(self, _INTERNED_FIELDS)
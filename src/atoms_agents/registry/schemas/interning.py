@@ -0,0 +1,15 @@
+"""Helpers for compact (slotted, frozen) card dataclasses."""
+import sys
+from typing import Any, Iterable
+
+
+def intern_fields(card: Any, names: Iterable[str]) -> None:
+    """
+    Replaces the given str fields with their interned copy so the few distinct values
+    of enum-like fields (provider_id, confidence, streaming_support, ...) are stored
+    once per process instead of once per parsed card. Works on frozen dataclasses.
+    """
+    for name in names:
+        value = getattr(card, name)
+        if type(value) is str:
+            object.__setattr__(card, name, sys.intern(value))
@@ -1,7 +1,24 @@
 from dataclasses import dataclass
 
+from atoms_agents.registry.schemas.interning import intern_fields
 
-@dataclass
+_INTERNED_FIELDS = (
+    "provider_id",
+    "family_id",
+    "version",
+    "variant",
+    "reasoning_effort",
+    "platform_api_surface",
+    "invocation_primitive",
+    "streaming_support",
+    "credential_discovery",
+    "region_or_project_discovery",
+    "last_updated_or_version",
+    "confidence",
+)
+
+
+@dataclass(frozen=True, slots=True)
 class ModelCard:
     model_id: str
     provider_id: str
@@ -28,6 +45,9 @@ class ModelCard:
     notes: str = ""
     card_type: str = "model"
 
+    def __post_init__(self) -> None:
+        intern_fields(self, _INTERNED_FIELDS)
+
     # Backward compatibility properties
     @property
     def model_or_deployment_id(self) -> str:
@@ -36,4 +56,3 @@ class ModelCard:
     @property
     def official_id_or_deployment(self) -> str:
         return self.official_id
-
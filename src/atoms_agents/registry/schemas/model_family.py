@@ -2,8 +2,11 @@ from dataclasses import dataclass, field
 from typing import List
 
 
-@dataclass
+@dataclass(frozen=True, slots=True, eq=True, unsafe_hash=False)
 class ModelFamilyCard:
+    # Frozen would generate a __hash__ that raises TypeError on the list fields
+    __hash__ = None  # type: ignore[assignment]
+
     family_id: str
     name: str
     description: str = ""
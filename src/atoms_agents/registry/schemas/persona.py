@@ -2,8 +2,11 @@ from dataclasses import dataclass, field
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(frozen=True, slots=True, eq=True, unsafe_hash=False)
 class PersonaCard:
+    # Frozen would generate a __hash__ that raises TypeError on the list fields
+    __hash__ = None  # type: ignore[assignment]
+
     persona_id: str
     name: str
     description: str
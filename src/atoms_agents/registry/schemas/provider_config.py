@@ -1,9 +1,18 @@
 from dataclasses import dataclass, field
 from typing import List, Optional
 
+from atoms_agents.registry.schemas.interning import intern_fields
 
-@dataclass
+_INTERNED_FIELDS = (
+    "provider_type",
+)
+
+
+@dataclass(frozen=True, slots=True, eq=True, unsafe_hash=False)
 class ProviderConfigCard:
+    # Frozen would generate a __hash__ that raises TypeError on the list fields
+    __hash__ = None  # type: ignore[assignment]
+
     provider_id: str  # e.g. "azure_openai", "openrouter"
     name: str  # e.g. "Azure OpenAI"
 
@@ -19,3 +28,5 @@ class ProviderConfigCard:
     notes: str = ""
     card_type: str = "provider"
 
+    def __post_init__(self) -> None:
+        intern_fields(self, _INTERNED_FIELDS)
@@ -0,0 +1,158 @@
+"""
+Compiled registry snapshots.
+
+A snapshot stores the parsed cards of every card file together with the
+(mtime_ns, size) each file had when it was parsed. Loading the registry then
+only needs a stat() walk: unchanged files reuse their cached cards and only
+new or modified files go through YAML parsing again.
+
+Snapshots live in memory (per registry root) and are persisted as a pickle
+under .northstar/state/registry_snapshots/ so a fresh process starts warm too.
+
+Config (env):
+- NORTHSTAR_REGISTRY_SNAPSHOT: set to "0" to always parse from YAML
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+SNAPSHOT_FORMAT = 1
+
+CARD_EXTENSIONS = (".yaml", ".yml")
+
+# (directory, mtime_ns, size) keyed by path relative to the registry root
+Manifest = Dict[str, Tuple[str, int, int]]
+
+_MEMORY: Dict[str, "RegistrySnapshot"] = {}
+_LOCK = threading.Lock()
+
+
+@dataclass
+class FileEntry:
+    directory: str
+    mtime_ns: int
+    size: int
+    cards: List[Any]
+
+
+@dataclass
+class RegistrySnapshot:
+    code_fingerprint: str
+    files: Dict[str, FileEntry] = field(default_factory=dict)
+    format: int = SNAPSHOT_FORMAT
+
+
+def snapshots_enabled() -> bool:
+    return os.getenv("NORTHSTAR_REGISTRY_SNAPSHOT", "1") != "0"
+
+
+def code_fingerprint() -> str:
+    """
+    Identifies the parser/schema code a snapshot was built with. Pickled cards are
+    instances of the schema dataclasses, so any edit there invalidates the snapshot.
+    """
+    registry_dir = Path(__file__).resolve().parent
+    sources = [registry_dir / "loader.py", registry_dir / "parsers.py"]
+    sources.extend(sorted((registry_dir / "schemas").glob("*.py")))
+    h = hashlib.sha256(str(SNAPSHOT_FORMAT).encode())
+    for src in sources:
+        try:
+            st = src.stat()
+        except OSError:
+            continue
+        h.update(f"{src.name}:{st.st_mtime_ns}:{st.st_size};".encode())
+    return h.hexdigest()[:16]
+
+
+def scan_manifest(root_path: str, directories: List[str]) -> Manifest:
+    """Stats every card file under `directories`, in the same walk order the loader parses them."""
+    manifest: Manifest = {}
+    for directory in directories:
+        full_path = os.path.join(root_path, directory)
+        if not os.path.exists(full_path):
+            continue
+        for root, _, files in os.walk(full_path):
+            for file in files:
+                if not file.endswith(CARD_EXTENSIONS):
+                    continue
+                filepath = os.path.join(root, file)
+                try:
+                    st = os.stat(filepath)
+                except OSError:
+                    continue
+                rel = os.path.relpath(filepath, root_path)
+                manifest[rel] = (directory, st.st_mtime_ns, st.st_size)
+    return manifest
+
+
+def default_snapshot_dir() -> Path:
+    from atoms_agents.core.paths import get_state_dir
+    return get_state_dir() / "registry_snapshots"
+
+
+class SnapshotStore:
+    """Reads and writes the snapshot for one registry root (memory first, then disk)."""
+
+    def __init__(self, root_path: str, snapshot_dir: Optional[str] = None):
+        self.root_key = os.path.abspath(root_path)
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        root_hash = hashlib.sha256(self.root_key.encode()).hexdigest()[:16]
+        self.filename = f"registry_{root_hash}.pickle"
+
+    @property
+    def path(self) -> Path:
+        return (self.snapshot_dir or default_snapshot_dir()) / self.filename
+
+    def load(self, fingerprint: str) -> Optional[RegistrySnapshot]:
+        snapshot = _MEMORY.get(self.root_key)
+        if snapshot is not None and snapshot.code_fingerprint == fingerprint:
+            return snapshot
+
+        try:
+            with open(self.path, "rb") as f:
+                snapshot = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[RegistrySnapshot] Ignoring unreadable snapshot {self.path}: {e}")
+            return None
+
+        if (
+            not isinstance(snapshot, RegistrySnapshot)
+            or snapshot.format != SNAPSHOT_FORMAT
+            or snapshot.code_fingerprint != fingerprint
+        ):
+            return None
+
+        with _LOCK:
+            _MEMORY[self.root_key] = snapshot
+        return snapshot
+
+    def save(self, snapshot: RegistrySnapshot) -> None:
+        with _LOCK:
+            _MEMORY[self.root_key] = snapshot
+
+        # Atomic replace so concurrent readers never see a half-written pickle
+        try:
+            target = self.path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".registry_", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, target)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except Exception as e:
+            print(f"[RegistrySnapshot] Could not persist snapshot: {e}")
+
+
+def clear_memory_snapshots() -> None:
+    with _LOCK:
+        _MEMORY.clear()
@@ -0,0 +1,122 @@
+"""
+Background hot-reload for long-running processes that hold a RegistryContext.
+
+The watcher notices card file changes (via `watchfiles` when installed, otherwise
+by polling the snapshot manifest), rebuilds the context on its own thread and
+hands the finished context to `on_reload`. Rebuilds go through the snapshot, so
+only the changed files are parsed again; callers swap their reference in one
+assignment and never observe a half-built registry.
+
+Config (env):
+- NORTHSTAR_REGISTRY_WATCH: set to "0" to disable watching
+- NORTHSTAR_REGISTRY_WATCH_INTERVAL: polling interval in seconds (default 1.0)
+"""
+import importlib.util
+import os
+import threading
+from typing import Callable, Optional
+
+from atoms_agents.registry.loader import CARD_DIRECTORIES, RegistryContext, RegistryLoader
+from atoms_agents.registry.snapshot import CARD_EXTENSIONS, Manifest, scan_manifest
+
+DEFAULT_POLL_INTERVAL_SECONDS = 1.0
+
+
+def watching_enabled() -> bool:
+    return os.getenv("NORTHSTAR_REGISTRY_WATCH", "1") != "0"
+
+
+def _poll_interval() -> float:
+    try:
+        return max(0.05, float(os.getenv("NORTHSTAR_REGISTRY_WATCH_INTERVAL", DEFAULT_POLL_INTERVAL_SECONDS)))
+    except ValueError:
+        return DEFAULT_POLL_INTERVAL_SECONDS
+
+
+class RegistryWatcher:
+    def __init__(
+        self,
+        loader: RegistryLoader,
+        on_reload: Callable[[RegistryContext], None],
+        interval: Optional[float] = None,
+        use_watchfiles: Optional[bool] = None,
+    ):
+        self.loader = loader
+        self.on_reload = on_reload
+        self.interval = interval or _poll_interval()
+        if use_watchfiles is None:
+            use_watchfiles = importlib.util.find_spec("watchfiles") is not None
+        self.backend = "watchfiles" if use_watchfiles else "polling"
+        self.reloads = 0
+        self.failures = 0
+        # Compare against what the last load actually read, so edits made between
+        # that load and this watcher starting are still picked up
+        self._manifest: Manifest = loader.last_manifest if loader.last_manifest is not None else self._scan()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _scan(self) -> Manifest:
+        return scan_manifest(self.loader.root_path, CARD_DIRECTORIES)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        target = self._watch_events if self.backend == "watchfiles" else self._poll
+        self._thread = threading.Thread(target=target, name="registry-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def check_once(self) -> bool:
+        """Reloads if any card file was added, removed or modified since the last check."""
+        manifest = self._scan()
+        if manifest == self._manifest:
+            return False
+        return self._reload(manifest)
+
+    def _reload(self, manifest: Manifest) -> bool:
+        try:
+            ctx = self.loader.load_context()
+        except Exception as e:
+            # Keep serving the previous context; the next change retries
+            self.failures += 1
+            print(f"[RegistryWatcher] Reload failed, keeping previous registry: {e}")
+            return False
+        self._manifest = self.loader.last_manifest if self.loader.last_manifest is not None else manifest
+        self.reloads += 1
+        stats = self.loader.last_load_stats
+        print(
+            f"[RegistryWatcher] Registry reloaded ({stats.get('reparsed', 0)} changed, "
+            f"{stats.get('removed', 0)} removed)"
+        )
+        self.on_reload(ctx)
+        return True
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check_once()
+
+    def _watch_events(self) -> None:
+        import watchfiles
+
+        def card_filter(change: "watchfiles.Change", path: str) -> bool:
+            return path.endswith(CARD_EXTENSIONS)
+
+        try:
+            for _ in watchfiles.watch(
+                self.loader.root_path,
+                watch_filter=card_filter,
+                stop_event=self._stop,
+                rust_timeout=int(self.interval * 1000),
+                yield_on_timeout=False,
+            ):
+                # The event set only says "something changed"; the manifest decides what
+                self.check_once()
+        except Exception as e:
+            print(f"[RegistryWatcher] watchfiles failed ({e}); falling back to polling")
+            self.backend = "polling"
+            self._poll()
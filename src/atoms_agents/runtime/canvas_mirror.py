@@ -1,19 +1,63 @@
 import asyncio
-import json
 import logging
-import re
-from typing import Any, Dict, List, Optional
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
 
 import httpx
 
-from atoms_agents.runtime.visual_sidecar import sanitize_canvas_event
-
+from atoms_agents.runtime.canvas_stream_hub import CanvasStreamHub, HubSubscription, get_canvas_hub
 from atoms_agents.runtime.context import AgentsRequestContext
 
 logger = logging.getLogger(__name__)
 
 
-_INLINE_DATA_URI_RE = re.compile(r"data:[^;]+;base64,", re.IGNORECASE)
+def _event_type(event: Dict[str, Any]) -> Optional[str]:
+    data = event.get("data")
+    return event.get("event") or (data.get("type") if isinstance(data, dict) else None)
+
+
+class IndexedRingBuffer:
+    """Fixed-capacity FIFO of events with per-type indexes; append and eviction are O(1)."""
+
+    def __init__(self, capacity: int, type_of: Callable[[Dict[str, Any]], Optional[str]] = _event_type):
+        self.capacity = max(1, capacity)
+        self._type_of = type_of
+        self._events: Deque[Tuple[Optional[str], Dict[str, Any]]] = deque()
+        self._by_type: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._view: Optional[Tuple[Dict[str, Any], ...]] = None
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def append(self, event: Dict[str, Any]) -> Optional[str]:
+        """Stores `event` (evicting the oldest at capacity) and returns its type."""
+        if len(self._events) >= self.capacity:
+            old_type, _ = self._events.popleft()
+            if old_type is not None:
+                # The oldest event overall is also the oldest of its type
+                index = self._by_type[old_type]
+                index.popleft()
+                if not index:
+                    del self._by_type[old_type]
+        event_type = self._type_of(event)
+        self._events.append((event_type, event))
+        if event_type is not None:
+            self._by_type.setdefault(event_type, deque()).append(event)
+        self._view = None
+        return event_type
+
+    def view(self) -> Tuple[Dict[str, Any], ...]:
+        """Immutable snapshot, rebuilt only after the buffer changed."""
+        if self._view is None:
+            self._view = tuple(event for _, event in self._events)
+        return self._view
+
+    def of_type(self, event_type: str) -> Tuple[Dict[str, Any], ...]:
+        return tuple(self._by_type.get(event_type, ()))
+
+    def latest(self, event_type: str) -> Optional[Dict[str, Any]]:
+        index = self._by_type.get(event_type)
+        return index[-1] if index else None
 
 
 class CanvasMirror:
@@ -23,6 +67,11 @@ class CanvasMirror:
     Subscribes to `/sse/canvas/{id}` and stores the raw StreamEvent payloads
     without interpretation. Prompt injection is only possible if a downstream
     GraphLens explicitly reads the mirrored buffer.
+
+    The subscription resumes from the last event id after disconnects until
+    `stop()` (or `max_reconnects` reconnects, if set). Mirrors of the same
+    canvas share one upstream stream through the CanvasStreamHub, which
+    sanitizes each event once.
     """
 
     def __init__(
@@ -33,6 +82,8 @@ class CanvasMirror:
         *,
         capacity: int = 500,
         transport: Optional[httpx.AsyncBaseTransport] = None,
+        max_reconnects: Optional[int] = None,
+        hub: Optional[CanvasStreamHub] = None,
     ):
         if not ctx.project_id:
             raise ValueError("project_id is required for CanvasMirror")
@@ -41,7 +92,11 @@ class CanvasMirror:
         self.canvas_id = canvas_id
         self.capacity = capacity
         self._transport = transport
-        self._events: List[Dict[str, Any]] = []
+        self.max_reconnects = max_reconnects
+        self.hub = hub or get_canvas_hub()
+        self._subscription: Optional[HubSubscription] = None
+        self._events = IndexedRingBuffer(capacity)
+        self._tools: List[Dict[str, Any]] = []
         self._task: Optional[asyncio.Task] = None
         self._stop_event = asyncio.Event()
         self._last_event_id: Optional[str] = None
@@ -53,28 +108,29 @@ class CanvasMirror:
 
     @property
     def errors(self) -> List[str]:
-        return list(self._errors)
+        stream_errors = self._subscription.errors if self._subscription else []
+        return [*stream_errors, *self._errors]
+
+    @property
+    def dropped(self) -> int:
+        """Events lost because this mirror fell behind the shared stream."""
+        return self._subscription.dropped if self._subscription else 0
+
+    def snapshot(self) -> Sequence[Dict[str, Any]]:
+        """Return an immutable view of mirrored events (reused until the next event)."""
+        return self._events.view()
 
-    def snapshot(self) -> List[Dict[str, Any]]:
-        """Return a shallow copy of mirrored events."""
-        return list(self._events)
+    def events_of_type(self, event_type: str) -> Sequence[Dict[str, Any]]:
+        """Mirrored events of one type (StreamEvent `event` or `data.type`), oldest first."""
+        return self._events.of_type(event_type)
 
     def get_tools(self) -> List[Dict[str, Any]]:
         """
-        Extract tool manifests from CANVAS_READY events.
-        Browses the mirror for the latest 'tool_manifest' payload.
+        Tool manifest from the latest CANVAS_READY event.
+        Maintained as events arrive, so this is O(1); the list is shared, copy before mutating.
+        The manifest stays available after its event is evicted from the buffer.
         """
-        tools = []
-        # Reverse search for the latest manifest
-        for event in reversed(self._events):
-            # Check for standard StreamEvent structure
-            data = event.get("data", {})
-            msg_type = event.get("event") or data.get("type")
-
-            if msg_type == "CANVAS_READY" and "tool_manifest" in data:
-                tools.extend(data["tool_manifest"])
-
-        return tools
+        return self._tools
 
     async def start(self) -> None:
         """Start streaming in the current event loop."""
@@ -91,56 +147,49 @@ class CanvasMirror:
     async def stop(self) -> None:
         """Signal stop and wait for the stream task to finish."""
         self._stop_event.set()
-        if self._task:
-            await self._task
+        task = self._task
+        if task:
+            # The stream may be idle (or backing off), so don't wait for another event
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
             self._task = None
 
     async def _consume(self) -> None:
-        url = f"{self.base_url}/sse/canvas/{self.canvas_id}"
-        headers = self.ctx.to_headers()
-        headers.setdefault("Accept", "text/event-stream")
-        if self._last_event_id:
-            headers["Last-Event-ID"] = self._last_event_id
-
+        sub = self._subscription = self.hub.subscribe(
+            self.base_url,
+            self.ctx,
+            self.canvas_id,
+            capacity=self.capacity,
+            transport=self._transport,
+            max_reconnects=self.max_reconnects,
+            last_event_id=self._last_event_id,
+        )
         try:
-            async with httpx.AsyncClient(timeout=None, transport=self._transport) as client:
-                async with client.stream("GET", url, headers=headers) as resp:
-                    resp.raise_for_status()
-                    async for line in resp.aiter_lines():
-                        if self._stop_event.is_set():
-                            break
-                        if not line or not line.startswith("data: "):
-                            continue
-                        payload = json.loads(line[6:])
-                        self._append(payload)
-                        if self._stop_event.is_set():
-                            break
+            while not self._stop_event.is_set():
+                item = await sub.get()
+                if item is None:
+                    break
+                sse_id, payload = item
+                self._append(payload)
+                if sse_id:
+                    self._last_event_id = sse_id
         except Exception as exc:  # pragma: no cover - captured for debugging
             logger.warning("CanvasMirror stream error: %s", exc)
             self._errors.append(str(exc))
         finally:
+            sub.close()
             self._task = None
 
     def _append(self, payload: Dict[str, Any]) -> None:
-        """Store the payload, preserving only the most recent capacity entries."""
-        payload = sanitize_canvas_event(payload)
-        if self._contains_inline_data(payload):
-            logger.warning(
-                "CanvasMirror blocked event containing inline assets after sanitization"
-            )
-            return
+        """Store an already sanitized payload, preserving only the most recent capacity entries."""
         event_id = payload.get("event_id") or payload.get("id")
         if event_id:
             self._last_event_id = event_id
-        if len(self._events) >= self.capacity:
-            self._events.pop(0)
-        self._events.append(payload)
-
-    def _contains_inline_data(self, value: Any) -> bool:
-        if isinstance(value, str):
-            return bool(_INLINE_DATA_URI_RE.search(value))
-        if isinstance(value, dict):
-            return any(self._contains_inline_data(v) for v in value.values())
-        if isinstance(value, list):
-            return any(self._contains_inline_data(item) for item in value)
-        return False
+        event_type = self._events.append(payload)
+        if event_type == "CANVAS_READY":
+            data = payload.get("data")
+            if isinstance(data, dict) and "tool_manifest" in data:
+                self._tools = list(data["tool_manifest"])
@@ -0,0 +1,255 @@
+"""Process-wide canvas stream hub.
+
+Every CanvasMirror watching the same canvas with the same request headers
+(base URL, every request-context header, and event loop) shares one upstream
+`/sse/canvas/{id}` subscription, so no subscriber ever reads a stream opened
+with someone else's headers. Each event is
+parsed and sanitized once, then fanned out to per-subscriber ring buffers:
+a subscriber that falls behind loses its oldest undelivered events (counted
+in `dropped`) instead of slowing the stream or other subscribers.
+
+The upstream keeps a short history so a subscriber that joins late starts
+from the same recent events a fresh stream would have replayed; a subscriber
+resuming from a `last_event_id` in that history only gets what came after it.
+The upstream closes when its last subscriber leaves.
+
+Delivered payloads are shared between subscribers and must be treated as
+read-only.
+"""
+
+import asyncio
+import json
+import logging
+import re
+from collections import deque
+from contextlib import aclosing
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from atoms_agents.runtime.context import AgentsRequestContext
+from atoms_agents.runtime.visual_sidecar import sanitize_canvas_event
+from atoms_agents.transport.sse import ResumableSSE, SSEStatusError
+
+logger = logging.getLogger(__name__)
+
+
+_INLINE_DATA_URI_RE = re.compile(r"data:[^;]+;base64,", re.IGNORECASE)
+
+# (sse id, sanitized payload)
+HubEvent = Tuple[Optional[str], Dict[str, Any]]
+
+
+def contains_inline_data(value: Any) -> bool:
+    if isinstance(value, str):
+        return bool(_INLINE_DATA_URI_RE.search(value))
+    if isinstance(value, dict):
+        return any(contains_inline_data(v) for v in value.values())
+    if isinstance(value, list):
+        return any(contains_inline_data(item) for item in value)
+    return False
+
+
+def prepare_canvas_event(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Sanitizes a canvas event; None if inline assets survive sanitization."""
+    payload = sanitize_canvas_event(payload)
+    if contains_inline_data(payload):
+        logger.warning("CanvasMirror blocked event containing inline assets after sanitization")
+        return None
+    return payload
+
+
+class HubSubscription:
+    """One subscriber's bounded view of a shared canvas stream."""
+
+    def __init__(self, upstream: "_Upstream", capacity: int):
+        self._upstream = upstream
+        self.buffer: Deque[HubEvent] = deque(maxlen=max(1, capacity))
+        self.dropped = 0
+        self.delivered = 0
+        self.closed = False
+        self._ready = asyncio.Event()
+
+    @property
+    def errors(self) -> List[str]:
+        stream = self._upstream.stream
+        return list(stream.errors) if stream else []
+
+    def _push(self, item: HubEvent) -> None:
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped += 1
+        self.buffer.append(item)
+        self._ready.set()
+
+    def _finish(self) -> None:
+        self.closed = True
+        self._ready.set()
+
+    async def get(self) -> Optional[HubEvent]:
+        """Next event, or None once the upstream has ended and the buffer is drained."""
+        while not self.buffer:
+            if self.closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        self.delivered += 1
+        return self.buffer.popleft()
+
+    def close(self) -> None:
+        if not self.closed:
+            self._upstream.hub._unsubscribe(self._upstream, self)
+            self._finish()
+
+
+class _Upstream:
+    def __init__(
+        self,
+        hub: "CanvasStreamHub",
+        key: Tuple[Any, ...],
+        url: str,
+        headers: Dict[str, str],
+        transport: Optional[httpx.AsyncBaseTransport],
+        max_reconnects: Optional[int],
+        last_event_id: Optional[str],
+    ):
+        self.hub = hub
+        self.key = key
+        self.url = url
+        self.headers = headers
+        self.transport = transport
+        self.subscribers: Set[HubSubscription] = set()
+        self.history: Deque[HubEvent] = deque(maxlen=hub.history)
+        self.received = 0
+        self.blocked = 0
+        self.stream = ResumableSSE(self._open_stream, last_event_id=last_event_id, max_reconnects=max_reconnects)
+        self.task: Optional[asyncio.Task] = None
+
+    async def _open_stream(self, sse_headers: Dict[str, str]):
+        headers = {**self.headers, **sse_headers}
+        async with httpx.AsyncClient(timeout=None, transport=self.transport) as client:
+            async with client.stream("GET", self.url, headers=headers) as resp:
+                if resp.status_code != 200:
+                    raise SSEStatusError(resp.status_code)
+                async for chunk in resp.aiter_bytes():
+                    yield chunk
+
+    async def run(self) -> None:
+        try:
+            async with aclosing(self.stream.events()) as events:
+                async for event in events:
+                    try:
+                        payload = json.loads(event.data)
+                    except json.JSONDecodeError:
+                        logger.warning("CanvasMirror skipped non-JSON event: %s", event.data[:200])
+                        continue
+                    self.received += 1
+                    payload = prepare_canvas_event(payload)
+                    if payload is None:
+                        self.blocked += 1
+                        continue
+                    if not event.id and isinstance(payload, dict):
+                        # Servers without `id:` lines resume from the payload's event id
+                        payload_id = payload.get("event_id") or payload.get("id")
+                        if payload_id:
+                            self.stream.last_event_id = payload_id
+                    item = (event.id, payload)
+                    self.history.append(item)
+                    for sub in list(self.subscribers):
+                        sub._push(item)
+        except Exception as exc:  # pragma: no cover - captured for debugging
+            logger.warning("CanvasMirror stream error: %s", exc)
+            self.stream.errors.append(str(exc))
+        finally:
+            self.hub._discard(self)
+            for sub in list(self.subscribers):
+                sub._finish()
+
+
+def _event_id(item: HubEvent) -> Optional[str]:
+    sse_id, payload = item
+    return sse_id or payload.get("event_id") or payload.get("id")
+
+
+def _history_after(history: Deque[HubEvent], last_event_id: Optional[str]) -> List[HubEvent]:
+    """History a subscriber hasn't seen: all of it, or only what follows `last_event_id`."""
+    items = list(history)
+    if last_event_id:
+        for index in range(len(items) - 1, -1, -1):
+            if _event_id(items[index]) == last_event_id:
+                return items[index + 1:]
+    return items
+
+
+class CanvasStreamHub:
+    def __init__(self, history: int = 500):
+        self.history = history
+        self._upstreams: Dict[Tuple[Any, ...], _Upstream] = {}
+
+    def subscribe(
+        self,
+        base_url: str,
+        ctx: AgentsRequestContext,
+        canvas_id: str,
+        *,
+        capacity: int = 500,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        max_reconnects: Optional[int] = None,
+        last_event_id: Optional[str] = None,
+    ) -> HubSubscription:
+        """Subscribes to a canvas, opening the upstream stream if this is its first subscriber.
+
+        Must be called from a running event loop. Connection options
+        (transport, max_reconnects, last_event_id) come from the first subscriber.
+        Subscribers only share an upstream when all of their request headers match.
+        """
+        base_url = base_url.rstrip("/")
+        loop = asyncio.get_running_loop()
+        headers = ctx.to_headers()
+        key = (id(loop), base_url, canvas_id, tuple(sorted(headers.items())), id(transport))
+        upstream = self._upstreams.get(key)
+        if upstream is None:
+            url = f"{base_url}/sse/canvas/{canvas_id}"
+            upstream = _Upstream(self, key, url, headers, transport, max_reconnects, last_event_id)
+            self._upstreams[key] = upstream
+            upstream.task = loop.create_task(upstream.run())
+
+        sub = HubSubscription(upstream, capacity)
+        for item in _history_after(upstream.history, last_event_id):
+            sub._push(item)
+        upstream.subscribers.add(sub)
+        return sub
+
+    def _unsubscribe(self, upstream: _Upstream, sub: HubSubscription) -> None:
+        upstream.subscribers.discard(sub)
+        if not upstream.subscribers:
+            self._discard(upstream)
+            if upstream.task is not None and not upstream.task.done():
+                upstream.task.cancel()
+
+    def _discard(self, upstream: _Upstream) -> None:
+        if self._upstreams.get(upstream.key) is upstream:
+            del self._upstreams[upstream.key]
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "url": upstream.url,
+                "subscribers": len(upstream.subscribers),
+                "received": upstream.received,
+                "blocked": upstream.blocked,
+                "reconnects": upstream.stream.reconnects,
+                "dropped": sum(sub.dropped for sub in upstream.subscribers),
+            }
+            for upstream in self._upstreams.values()
+        ]
+
+
+_hub: Optional[CanvasStreamHub] = None
+
+
+def get_canvas_hub() -> CanvasStreamHub:
+    """Get or create the process-wide hub."""
+    global _hub
+    if _hub is None:
+        _hub = CanvasStreamHub()
+    return _hub
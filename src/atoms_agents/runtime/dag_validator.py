@@ -8,6 +8,18 @@ except ImportError:
 class DAGValidator:
     @staticmethod
     def validate_dag(nodes: List[str], edges: List[Any], entry_node: str, exit_nodes: List[str]) -> List[str]:
+        predecessors = DAGValidator.build_predecessors(nodes, edges, entry_node, exit_nodes)
+
+        # 3. Cycle Detection & Topo Sort
+        # graphlib.TopologicalSorter handles this efficiently
+        try:
+            ts = TopologicalSorter(predecessors)
+            return list(ts.static_order())
+        except Exception as e:
+            raise ValueError(f"DAG Validation Failed (Cycle detected?): {e}")
+
+    @staticmethod
+    def build_predecessors(nodes: List[str], edges: List[Any], entry_node: str, exit_nodes: List[str]) -> Dict[str, Set[str]]:
         node_set = set(nodes)
 
         # 1. Validate Nodes Exist
@@ -31,19 +43,12 @@ class DAGValidator:
                 raise ValueError(f"Edge target '{v}' not found in nodes list.")
             adj[u].add(v)
 
-        # 3. Cycle Detection & Topo Sort
-        # graphlib.TopologicalSorter handles this efficiently
-        # It expects a dict of node -> predecessors
+        # TopologicalSorter expects a dict of node -> predecessors
         predecessors: Dict[str, Set[str]] = {n: set() for n in nodes}
         for u in adj:
             for v in adj[u]:
                 predecessors[v].add(u)
-
-        try:
-            ts = TopologicalSorter(predecessors)
-            return list(ts.static_order())
-        except Exception as e:
-            raise ValueError(f"DAG Validation Failed (Cycle detected?): {e}")
+        return predecessors
 
     @staticmethod
     def validate_flow_integrity(flow_card: Any, registry_nodes: Dict[str, Any]) -> None:
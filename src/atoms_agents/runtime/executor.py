@@ -1,21 +1,22 @@
 import datetime
 import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
 
 from dataclasses import dataclass, asdict, field
-from typing import Dict, Any, List, Optional
+from typing import Deque, Dict, Any, List, Optional
 from atoms_agents.runtime.dag_validator import DAGValidator
+from atoms_agents.runtime.flow_plan import EdgeMap, FlowPlan, compile_flow_plan  # noqa: F401 (EdgeMap re-exported)
 from atoms_agents.registry.schemas import FlowCard, NodeCard
 from atoms_agents.runtime.node_executor import NodeExecutor
+from atoms_agents.runtime.node_result import NodeRunResult
+from atoms_agents.core.cancellation import CancellationToken, OperationCancelledError
 
 from atoms_agents.runtime.context import AgentsRequestContext, ContextMode
 from atoms_agents.runtime.memory_gateway import HttpMemoryGateway
 from atoms_agents.engines_boundary.client import EnginesBoundaryClient
 
-@dataclass
-class EdgeMap:
-    inbound_edges: List[str] # edge_ids
-    outbound_edges: List[str] # edge_ids
-
 @dataclass
 class FlowRunResult:
     flow_id: str
@@ -27,10 +28,12 @@ class FlowRunResult:
     error: Optional[str] = None
 
 class FlowExecutor:
-    def __init__(self, registry_context: Any):
+    def __init__(self, registry_context: Any, max_concurrency: int = 1):
         self.ctx = registry_context
         self.nodes_map: Dict[str, NodeCard] = {}
         self.node_executor = NodeExecutor(registry_context)
+        # Default cap on concurrently running nodes; 1 keeps strict sequential order.
+        self.max_concurrency = max_concurrency
 
     def load_registry(self) -> None:
         # Deprecated manual loading, now we pass context
@@ -40,7 +43,8 @@ class FlowExecutor:
         self, 
         flow: FlowCard, 
         profile_id: str = "dev_local",
-        request_context: Optional[AgentsRequestContext] = None
+        request_context: Optional[AgentsRequestContext] = None,
+        max_concurrency: Optional[int] = None,
     ) -> FlowRunResult:
         # Load registry if needed
         if not self.nodes_map:
@@ -55,9 +59,9 @@ class FlowExecutor:
         try:
             # 1. Validate Structure & Integrity
             DAGValidator.validate_flow_integrity(flow, self.nodes_map)
-            execution_order = DAGValidator.validate_dag(
-                flow.nodes, flow.edges, flow.entry_node, flow.exit_nodes
-            )
+            # Compiled once per flow content hash, then served from cache
+            plan = compile_flow_plan(flow)
+            execution_order = plan.order
 
             print(f"[FlowExecutor] Execution Order: {execution_order}")
 
@@ -67,40 +71,18 @@ class FlowExecutor:
                  print(f"[FlowExecutor] Warning: Profile {profile_id} not found in registry context.")
                  raise ValueError(f"Profile {profile_id} not found")
 
-            for node_id in execution_order:
-                node = self.nodes_map[node_id]
-                print(f"[FlowExecutor] Executing Node: {node_id}")
-
-                # Calculate specific edges for this node
-                inbound = [e.edge_id for e in flow.edges if e.target == node_id]
-                outbound = [e.edge_id for e in flow.edges if e.source == node_id]
-
-                # Execute with strict edge boundaries and context
-                node_res_obj = self.node_executor.execute_node(
-                    node,
-                    profile,
-                    request_context=request_context,
-                    inbound_edge_ids=inbound,
-                    outbound_edge_ids=outbound
-                )
-
-                # Convert to dict for report
-                node_res_dict = {
-                    "node_id": node_res_obj.node_id,
-                    "status": node_res_obj.status,
-                    "reason": node_res_obj.reason,
-                    "started_ts": node_res_obj.started_ts,
-                    "ended_ts": node_res_obj.ended_ts,
-                    "artifacts": node_res_obj.artifacts_written,
-                    "writes": node_res_obj.blackboard_writes
-                }
-
-                result.node_results.append(node_res_dict)
-
-                if node_res_obj.status == "FAIL":
-                     result.status = "failed"
-                     print(f"[FlowExecutor] Node {node_id} Failed: {node_res_obj.reason}")
-                     break
+            concurrency = self._resolve_concurrency(flow, max_concurrency)
+            if concurrency > 1:
+                self._execute_waves(flow, plan, profile, request_context, concurrency, result)
+            else:
+                for node_id in execution_order:
+                    node_res_obj = self._run_node(plan, node_id, profile, request_context)
+                    result.node_results.append(self._node_result_dict(node_res_obj))
+
+                    if node_res_obj.status == "FAIL":
+                         result.status = "failed"
+                         print(f"[FlowExecutor] Node {node_id} Failed: {node_res_obj.reason}")
+                         break
 
             if result.status == "running":
                 result.status = "success"
@@ -119,6 +101,138 @@ class FlowExecutor:
 
         return result
 
+    def _resolve_concurrency(self, flow: FlowCard, override: Optional[int]) -> int:
+        """Explicit argument wins, then the flow's own `defaults.max_concurrency`, then the executor default."""
+        if override is not None:
+            return max(1, int(override))
+        defaults = getattr(flow, "defaults", None) or {}
+        flow_cap = defaults.get("max_concurrency") if isinstance(defaults, dict) else None
+        if flow_cap is not None:
+            return max(1, int(flow_cap))
+        return max(1, int(self.max_concurrency))
+
+    def _run_node(
+        self,
+        plan: FlowPlan,
+        node_id: str,
+        profile: Any,
+        request_context: Optional[AgentsRequestContext],
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> NodeRunResult:
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+
+        node = self.nodes_map[node_id]
+        print(f"[FlowExecutor] Executing Node: {node_id}")
+
+        edge_map = plan.edges_for(node_id)
+
+        # Execute with strict edge boundaries and context
+        return self.node_executor.execute_node(
+            node,
+            profile,
+            request_context=request_context,
+            inbound_edge_ids=list(edge_map.inbound_edges),
+            outbound_edge_ids=list(edge_map.outbound_edges),
+            cancel_token=cancel_token,
+        )
+
+    def _execute_waves(
+        self,
+        flow: FlowCard,
+        plan: FlowPlan,
+        profile: Any,
+        request_context: Optional[AgentsRequestContext],
+        concurrency: int,
+        result: FlowRunResult,
+    ) -> None:
+        """
+        Dispatches every ready node concurrently (bounded by `concurrency`).
+        On the first FAIL (or exception) the shared cancel token is set: queued
+        nodes never start and are reported as SKIP, and in-flight siblings stop
+        at their next checkpoint. The flow waits for them so nothing writes after
+        it returns, and records whatever they actually finished with.
+        """
+        sorter = plan.new_sorter()
+        cancel_token = CancellationToken()
+        ready: Deque[str] = deque()
+        in_flight: Dict[Future, str] = {}
+        failed_node: Optional[str] = None
+
+        # Ready nodes queue here, not in the pool, so none can start after a failure
+        pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"flow-{flow.flow_id}")
+        try:
+            while sorter.is_active() and failed_node is None:
+                ready.extend(sorter.get_ready())
+                while ready and len(in_flight) < concurrency:
+                    node_id = ready.popleft()
+                    fut = pool.submit(self._run_node, plan, node_id, profile, request_context, cancel_token)
+                    in_flight[fut] = node_id
+
+                if not in_flight:
+                    break
+
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    node_id = in_flight.pop(fut)
+                    node_res = self._collect(fut, node_id, failed_node)
+                    result.node_results.append(node_res)
+
+                    if node_res["status"] == "FAIL":
+                        if failed_node is None:
+                            failed_node = node_id
+                            result.status = "failed"
+                            cancel_token.cancel()
+                            print(f"[FlowExecutor] Node {node_id} Failed: {node_res['reason']}")
+                    else:
+                        sorter.done(node_id)
+
+            if failed_node is not None:
+                # Running siblings are awaited for their real outcome; queued ones never start
+                for fut, node_id in in_flight.items():
+                    wait([fut])
+                    result.node_results.append(self._collect(fut, node_id, failed_node))
+                now = time.time()
+                for node_id in ready:
+                    reason = f"Cancelled: sibling node {failed_node} failed"
+                    result.node_results.append(self._synthetic_result(node_id, "SKIP", reason, now))
+        finally:
+            pool.shutdown(wait=True)
+
+    def _collect(self, fut: Future, node_id: str, failed_node: Optional[str]) -> Dict[str, Any]:
+        """Report entry for a finished node future; exceptions become FAIL."""
+        now = time.time()
+        try:
+            return self._node_result_dict(fut.result())
+        except OperationCancelledError:
+            reason = f"Cancelled: sibling node {failed_node} failed"
+            return self._synthetic_result(node_id, "SKIP", reason, now)
+        except Exception as e:
+            return self._synthetic_result(node_id, "FAIL", f"Node raised: {e}", now)
+
+    def _synthetic_result(self, node_id: str, status: str, reason: str, ts: float) -> Dict[str, Any]:
+        return {
+            "node_id": node_id,
+            "status": status,
+            "reason": reason,
+            "started_ts": ts,
+            "ended_ts": ts,
+            "artifacts": [],
+            "writes": {}
+        }
+
+    def _node_result_dict(self, node_res_obj: NodeRunResult) -> Dict[str, Any]:
+        # Convert to dict for report
+        return {
+            "node_id": node_res_obj.node_id,
+            "status": node_res_obj.status,
+            "reason": node_res_obj.reason,
+            "started_ts": node_res_obj.started_ts,
+            "ended_ts": node_res_obj.ended_ts,
+            "artifacts": node_res_obj.artifacts_written,
+            "writes": node_res_obj.blackboard_writes
+        }
+
     def _write_report(self, result: FlowRunResult) -> None:
         from atoms_agents.core.paths import get_artifacts_dir
         artifacts_dir = get_artifacts_dir()
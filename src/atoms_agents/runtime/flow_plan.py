@@ -0,0 +1,132 @@
+"""Compiled, cached execution plans for FlowCards.
+
+Plans are shared by every run of the same topology, so they are immutable:
+the order and edge ids are tuples and the adjacency maps are read-only views.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, List, Mapping, Set, Tuple
+
+from graphlib import TopologicalSorter
+
+from atoms_agents.runtime.dag_validator import DAGValidator
+
+_PLAN_CACHE_MAX = 256
+_PLAN_CACHE: "OrderedDict[str, FlowPlan]" = OrderedDict()
+_PLAN_CACHE_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class EdgeMap:
+    inbound_edges: Tuple[str, ...] # edge_ids
+    outbound_edges: Tuple[str, ...] # edge_ids
+
+
+_NO_EDGES = EdgeMap((), ())
+
+
+@dataclass(frozen=True)
+class FlowPlan:
+    """Topology of a flow resolved once: topo order, adjacency and per-node edge ids."""
+    flow_id: str
+    content_hash: str
+    order: Tuple[str, ...]
+    predecessors: Mapping[str, FrozenSet[str]]
+    successors: Mapping[str, FrozenSet[str]]
+    edge_maps: Mapping[str, EdgeMap] = field(default_factory=lambda: MappingProxyType({}))
+
+    def edges_for(self, node_id: str) -> EdgeMap:
+        return self.edge_maps.get(node_id) or _NO_EDGES
+
+    def new_sorter(self) -> TopologicalSorter:
+        """Fresh prepared sorter for get_ready()/done() scheduling (sorters are single-use)."""
+        ts = TopologicalSorter(self.predecessors)
+        ts.prepare()
+        return ts
+
+
+def _edge_fields(edge: Any) -> Tuple[str, str, str]:
+    if isinstance(edge, dict):
+        return edge.get("edge_id", ""), edge["from"], edge["to"]
+    return edge.edge_id, edge.source, edge.target
+
+
+def flow_content_hash(flow: Any) -> str:
+    """Hash of everything that shapes the plan; identical topologies share a plan."""
+    payload = {
+        "flow_id": flow.flow_id,
+        "nodes": list(flow.nodes),
+        "edges": [_edge_fields(e) for e in flow.edges],
+        "entry_node": flow.entry_node,
+        "exit_nodes": list(flow.exit_nodes),
+    }
+    raw = json.dumps(payload, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def compile_flow_plan(flow: Any) -> FlowPlan:
+    """
+    Returns the FlowPlan for `flow`, compiling it on first sight of its content hash.
+    Raises ValueError for invalid DAGs (same errors as DAGValidator.validate_dag).
+    """
+    content_hash = flow_content_hash(flow)
+    with _PLAN_CACHE_LOCK:
+        plan = _PLAN_CACHE.get(content_hash)
+        if plan is not None:
+            _PLAN_CACHE.move_to_end(content_hash)
+            return plan
+
+    plan = _build_plan(flow, content_hash)
+
+    with _PLAN_CACHE_LOCK:
+        _PLAN_CACHE[content_hash] = plan
+        _PLAN_CACHE.move_to_end(content_hash)
+        while len(_PLAN_CACHE) > _PLAN_CACHE_MAX:
+            _PLAN_CACHE.popitem(last=False)
+    return plan
+
+
+def clear_flow_plan_cache() -> None:
+    with _PLAN_CACHE_LOCK:
+        _PLAN_CACHE.clear()
+
+
+def _build_plan(flow: Any, content_hash: str) -> FlowPlan:
+    predecessors = DAGValidator.build_predecessors(
+        flow.nodes, flow.edges, flow.entry_node, flow.exit_nodes
+    )
+    try:
+        order = tuple(TopologicalSorter(predecessors).static_order())
+    except Exception as e:
+        raise ValueError(f"DAG Validation Failed (Cycle detected?): {e}")
+
+    successors: Dict[str, Set[str]] = {n: set() for n in predecessors}
+    inbound: Dict[str, List[str]] = {n: [] for n in predecessors}
+    outbound: Dict[str, List[str]] = {n: [] for n in predecessors}
+    for edge in flow.edges:
+        edge_id, source, target = _edge_fields(edge)
+        successors[source].add(target)
+        outbound[source].append(edge_id)
+        inbound[target].append(edge_id)
+
+    return FlowPlan(
+        flow_id=flow.flow_id,
+        content_hash=content_hash,
+        order=order,
+        predecessors=_frozen(predecessors),
+        successors=_frozen(successors),
+        edge_maps=MappingProxyType({
+            n: EdgeMap(tuple(inbound[n]), tuple(outbound[n])) for n in predecessors
+        }),
+    )
+
+
+def _frozen(adjacency: Dict[str, Set[str]]) -> Mapping[str, FrozenSet[str]]:
+    return MappingProxyType({n: frozenset(peers) for n, peers in adjacency.items()})
@@ -1,5 +1,7 @@
+import asyncio
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, TypedDict
+from typing import List, Dict, Any, Optional, TypedDict, Iterator, AsyncIterator
 from dataclasses import dataclass
 from enum import Enum
 
@@ -19,6 +21,21 @@ class GenerationResult(TypedDict):
     cost_usd: float
 
 
+class StreamChunk(TypedDict, total=False):
+    """
+    One item of a streaming generation.
+    Intermediate chunks carry `delta`; the last one has `done=True` plus usage/finish_reason.
+    Failures are reported as a final chunk with `status="FAIL"` and `reason`, like generate().
+    """
+    delta: str
+    done: bool
+    usage: TokenUsage
+    finish_reason: Optional[str]
+    model_id: str
+    status: str
+    reason: str
+
+
 class ReadinessStatus(Enum):
     READY = "READY"
     MISSING_DEPS = "MISSING_DEPS"
@@ -57,6 +74,113 @@ class LLMGateway(ABC):
     ) -> GenerationResult:  # Standardized result
         pass
 
+    async def agenerate(
+        self,
+        messages: List[Dict[str, str]],
+        model_card: Any,  # ModelCard
+        provider_config: Any,  # ProviderConfigCard
+        stream: bool = False,
+        capability_toggles: Optional[List[CapabilityToggleRequest]] = None,
+        limits: Optional[Any] = None,  # RunLimits
+        request_context: Optional[Any] = None,  # AgentsRequestContext
+    ) -> GenerationResult:
+        """Async generate. Default runs `generate` on a worker thread; providers with native async clients override this."""
+        return await asyncio.to_thread(
+            self.generate,
+            messages,
+            model_card,
+            provider_config,
+            stream=stream,
+            capability_toggles=capability_toggles,
+            limits=limits,
+            request_context=request_context,
+        )
+
+    def stream_generate(
+        self,
+        messages: List[Dict[str, str]],
+        model_card: Any,  # ModelCard
+        provider_config: Any,  # ProviderConfigCard
+        capability_toggles: Optional[List[CapabilityToggleRequest]] = None,
+        limits: Optional[Any] = None,  # RunLimits
+        request_context: Optional[Any] = None,  # AgentsRequestContext
+    ) -> Iterator[StreamChunk]:
+        """
+        Yields content deltas as they arrive, then a final `done` chunk with usage.
+        Default falls back to one blocking generate() call; streaming providers override this.
+        """
+        result = self.generate(
+            messages,
+            model_card,
+            provider_config,
+            stream=False,
+            capability_toggles=capability_toggles,
+            limits=limits,
+            request_context=request_context,
+        )
+        if result.get("status") == "FAIL":
+            yield {"done": True, "status": "FAIL", "reason": result.get("reason", "Gateway failed")}
+            return
+        if result.get("content"):
+            yield {"delta": result["content"]}
+        yield {
+            "done": True,
+            "usage": result.get("usage", {}),
+            "finish_reason": result.get("finish_reason"),
+            "model_id": result.get("model_id", ""),
+        }
+
+    async def astream_generate(
+        self,
+        messages: List[Dict[str, str]],
+        model_card: Any,  # ModelCard
+        provider_config: Any,  # ProviderConfigCard
+        capability_toggles: Optional[List[CapabilityToggleRequest]] = None,
+        limits: Optional[Any] = None,  # RunLimits
+        request_context: Optional[Any] = None,  # AgentsRequestContext
+    ) -> AsyncIterator[StreamChunk]:
+        """Async view of stream_generate: the blocking iterator runs on a worker thread and chunks are relayed as they arrive."""
+        loop = asyncio.get_running_loop()
+        queue: "asyncio.Queue[Any]" = asyncio.Queue()
+        finished = object()
+        stop = threading.Event()
+
+        def put(item: Any) -> None:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # Loop already closed; nobody is listening any more
+                stop.set()
+
+        def pump() -> None:
+            try:
+                for chunk in self.stream_generate(
+                    messages,
+                    model_card,
+                    provider_config,
+                    capability_toggles=capability_toggles,
+                    limits=limits,
+                    request_context=request_context,
+                ):
+                    if stop.is_set():
+                        break
+                    put(chunk)
+            except Exception as e:
+                put({"done": True, "status": "FAIL", "reason": str(e)})
+            finally:
+                put(finished)
+
+        loop.run_in_executor(None, pump)
+        try:
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    break
+                yield item
+        finally:
+            # Consumer went away (e.g. websocket closed): stop relaying upstream chunks
+            stop.set()
+
     def list_models(self) -> List[str]:
         """Return a list of available model IDs. Default is empty (static config only)."""
         return []
@@ -1,33 +1,86 @@
-from typing import Any
+import hashlib
+import importlib
+import os
+import threading
+from typing import Dict, Iterable, Optional, Tuple
 from atoms_agents.runtime.gateway import LLMGateway
 
+# provider_id -> (module, class). Imported lazily on first resolve.
+_GATEWAY_CLASSES: Dict[str, Tuple[str, str]] = {
+    "bedrock": ("atoms_agents.runtime.providers.bedrock", "BedrockGateway"),
+    "vertex": ("atoms_agents.runtime.providers.vertex", "VertexGateway"),
+    "azure_openai": ("atoms_agents.runtime.providers.azure_openai", "AzureOpenAIGateway"),
+    "groq": ("atoms_agents.runtime.providers.groq", "GroqGateway"),
+    "jules": ("atoms_agents.runtime.providers.jules", "JulesGateway"),
+    "gemini": ("atoms_agents.runtime.providers.gemini", "GeminiGateway"),
+    "openrouter": ("atoms_agents.runtime.providers.openrouter", "OpenRouterGateway"),
+    "nvidia": ("atoms_agents.runtime.providers.nvidia", "NvidiaGateway"),
+    "comet": ("atoms_agents.runtime.providers.comet", "CometGateway"),
+}
+
+# Env vars that identify the credentials a gateway instance was built with.
+# A change in any of them yields a new fingerprint and therefore a fresh instance.
+_CREDENTIAL_ENV: Dict[str, Tuple[str, ...]] = {
+    "bedrock": ("AWS_PROFILE", "AWS_ACCESS_KEY_ID", "AWS_REGION", "AWS_DEFAULT_REGION"),
+    "vertex": ("GOOGLE_APPLICATION_CREDENTIALS", "GOOGLE_CLOUD_PROJECT"),
+    "azure_openai": ("AZURE_OPENAI_ENDPOINT", "OPENAI_API_VERSION"),
+    "groq": ("GROQ_API_KEY",),
+    "jules": ("JULES_API_KEY",),
+    "gemini": ("GEMINI_API_KEY",),
+    "openrouter": ("OPENROUTER_API_KEY",),
+    "comet": ("COMET_API_KEY",),
+}
+
+_INSTANCES: Dict[Tuple[str, str], LLMGateway] = {}
+_LOCK = threading.Lock()
+
+
+def _credential_fingerprint(provider_id: str) -> str:
+    raw = "|".join(f"{name}={os.environ.get(name, '')}" for name in _CREDENTIAL_ENV.get(provider_id, ()))
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
 def resolve_gateway(provider_id: str) -> LLMGateway:
-    if provider_id == "bedrock":
-        from atoms_agents.runtime.providers.bedrock import BedrockGateway
-        return BedrockGateway()
-    elif provider_id == "vertex":
-        from atoms_agents.runtime.providers.vertex import VertexGateway
-        return VertexGateway()
-    elif provider_id == "azure_openai":
-        from atoms_agents.runtime.providers.azure_openai import AzureOpenAIGateway
-        return AzureOpenAIGateway()
-    elif provider_id == "groq":
-        from atoms_agents.runtime.providers.groq import GroqGateway
-        return GroqGateway()
-    elif provider_id == "jules":
-        from atoms_agents.runtime.providers.jules import JulesGateway
-        return JulesGateway()
-    elif provider_id == "gemini":
-        from atoms_agents.runtime.providers.gemini import GeminiGateway
-        return GeminiGateway()
-    elif provider_id == "openrouter":
-        from atoms_agents.runtime.providers.openrouter import OpenRouterGateway
-        return OpenRouterGateway()
-    elif provider_id == "nvidia":
-        from atoms_agents.runtime.providers.nvidia import NvidiaGateway
-        return NvidiaGateway()
-    elif provider_id == "comet":
-        from atoms_agents.runtime.providers.comet import CometGateway
-        return CometGateway()
-    else:
+    """
+    Returns the long-lived gateway for `provider_id`.
+    Instances are created lazily and cached per (provider, credential fingerprint),
+    so the steady-state cost is a dict lookup.
+    """
+    if provider_id not in _GATEWAY_CLASSES:
         raise ValueError(f"Unknown provider: {provider_id}")
+
+    key = (provider_id, _credential_fingerprint(provider_id))
+    gateway = _INSTANCES.get(key)
+    if gateway is not None:
+        return gateway
+
+    with _LOCK:
+        gateway = _INSTANCES.get(key)
+        if gateway is None:
+            # Credentials rotated: drop instances built with the old ones
+            for stale in [k for k in _INSTANCES if k[0] == provider_id]:
+                del _INSTANCES[stale]
+            module_name, class_name = _GATEWAY_CLASSES[provider_id]
+            gateway_cls = getattr(importlib.import_module(module_name), class_name)
+            gateway = gateway_cls()
+            _INSTANCES[key] = gateway
+        return gateway
+
+
+def warm_gateways(provider_ids: Optional[Iterable[str]] = None) -> None:
+    """Eagerly instantiates gateways (e.g. at server startup). Unknown or broken providers are skipped."""
+    for provider_id in provider_ids or list(_GATEWAY_CLASSES):
+        try:
+            resolve_gateway(provider_id)
+        except Exception as e:
+            print(f"[GatewayResolution] Warm-up skipped for {provider_id}: {e}")
+
+
+def invalidate_gateway(provider_id: Optional[str] = None) -> None:
+    """Drops cached gateway instances for one provider, or all of them when no id is given."""
+    with _LOCK:
+        if provider_id is None:
+            _INSTANCES.clear()
+            return
+        for key in [k for k in _INSTANCES if k[0] == provider_id]:
+            del _INSTANCES[key]
@@ -2,9 +2,12 @@ import uuid
 from dataclasses import dataclass
 from typing import Optional, Any
 from atoms_agents.runtime.gateway import LLMGateway
+from atoms_agents.runtime.gateway_resolution import resolve_gateway
 from atoms_agents.runtime.limits import RunLimits
 from atoms_agents.registry.schemas import ModelCard
 
+CERTIFIABLE_PROVIDERS = ("bedrock", "vertex", "azure_openai")
+
 @dataclass
 class CertificationResult:
     success: bool
@@ -23,18 +26,9 @@ class Certifier:
         import time
 
         # 1. Resolve Gateway
-        gateway: LLMGateway
-        if provider_id == "bedrock":
-            from atoms_agents.runtime.providers.bedrock import BedrockGateway
-            gateway = BedrockGateway()
-        elif provider_id == "vertex":
-            from atoms_agents.runtime.providers.vertex import VertexGateway
-            gateway = VertexGateway()
-        elif provider_id == "azure_openai":
-            from atoms_agents.runtime.providers.azure_openai import AzureOpenAIGateway
-            gateway = AzureOpenAIGateway()
-        else:
+        if provider_id not in CERTIFIABLE_PROVIDERS:
             return CertificationResult(False, provider_id, model_id, "", "", f"Unknown provider: {provider_id}")
+        gateway: LLMGateway = resolve_gateway(provider_id)
 
         # 2. Check Readiness
         readiness = gateway.check_readiness()
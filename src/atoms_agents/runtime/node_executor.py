@@ -1,3 +1,6 @@
+import asyncio
+import inspect
+import threading
 import time
 from typing import Dict, Any, Optional, List
 from atoms_agents.registry.schemas import NodeCard, RunProfileCard
@@ -13,10 +16,44 @@ from atoms_agents.runtime.gateway_resolution import resolve_gateway
 from atoms_agents.runtime.canvas_mirror import CanvasMirror
 from atoms_agents.runtime.memory_gateway import MemoryGateway, HttpMemoryGateway
 from atoms_agents.engines_boundary.client import EnginesBoundaryClient
+from atoms_agents.core.cancellation import CancellationToken
 
 VALID_VISIBILITIES = {"public", "internal", "system"}
 
 
+_SYNC_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_SYNC_LOOP_LOCK = threading.Lock()
+
+
+def _sync_loop() -> asyncio.AbstractEventLoop:
+    global _SYNC_LOOP
+    with _SYNC_LOOP_LOCK:
+        if _SYNC_LOOP is None or _SYNC_LOOP.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="node-executor-loop", daemon=True).start()
+            _SYNC_LOOP = loop
+        return _SYNC_LOOP
+
+
+def _run_sync(coro: Any) -> Any:
+    """
+    Runs a coroutine to completion from sync code.
+    Every call shares one long-lived loop on a daemon thread, so the pooled async
+    HTTP clients (one per loop) keep their connections from node to node, and
+    callers that already run a loop (FastAPI handlers, notebooks) still work.
+    """
+    loop = _sync_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        # Waiting on our own loop would deadlock
+        coro.close()
+        raise RuntimeError("execute_node() cannot be called from the node executor loop; await execute_node_async()")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
 class NodeExecutor:
     def __init__(
         self,
@@ -40,7 +77,46 @@ class NodeExecutor:
         model_override: Optional[str] = None,
         inbound_edge_ids: Optional[List[str]] = None,
         outbound_edge_ids: Optional[List[str]] = None,
+        cancel_token: Optional[CancellationToken] = None,
     ) -> NodeRunResult:
+        """
+        Synchronous wrapper around execute_node_async; blocks the calling thread until
+        the node finishes. Async callers should await execute_node_async instead.
+        """
+        return _run_sync(
+            self.execute_node_async(
+                node,
+                profile,
+                blackboard=blackboard,
+                request_context=request_context,
+                provider_override=provider_override,
+                model_override=model_override,
+                inbound_edge_ids=inbound_edge_ids,
+                outbound_edge_ids=outbound_edge_ids,
+                cancel_token=cancel_token,
+            )
+        )
+
+    async def execute_node_async(
+        self,
+        node: Any, # Can be NodeCard (Legacy) or NeutralNodeCard (New)
+        profile: RunProfileCard,
+        blackboard: Optional[Dict[str, Any]] = None,
+        request_context: Optional[AgentsRequestContext] = None,
+        provider_override: Optional[str] = None,
+        model_override: Optional[str] = None,
+        inbound_edge_ids: Optional[List[str]] = None,
+        outbound_edge_ids: Optional[List[str]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> NodeRunResult:
+        """
+        Event-loop friendly node execution.
+        Blocking I/O (memory gateway, readiness, nexus, artifact writes, audit) runs on
+        worker threads and the model call goes through LLMGateway.agenerate, so many
+        nodes can be multiplexed on a single loop.
+        A set `cancel_token` is honoured before the model call and before any
+        artifact or blackboard write; the node then returns SKIP.
+        """
         start_ts = time.time()
         events: List[Dict[str, Any]] = []
         run_id = str(uuid.uuid4())
@@ -83,7 +159,7 @@ class NodeExecutor:
             client = EnginesBoundaryClient() # Default localhost
             memory_gateway = HttpMemoryGateway(client, request_context)
 
-        self.audit_emitter.emit(
+        await self._emit_audit(
             AuditEvent(
                 event_type=EventType.NODE_START,
                 run_id=run_id,
@@ -114,9 +190,11 @@ class NodeExecutor:
 
                 # Run the first component as the primary actor
                 primary_comp = node.components[0]
+                if self._cancelled(cancel_token):
+                    return self._skip(node, run_id, "Cancelled", start_ts, ctx_args, events)
                 # Blackboard is replaced by request_context state or separate fetch (TODO)
                 # For now just passing empty dict for component runner signature
-                result = runner.run_component(primary_comp, {}, request_context)
+                result = await asyncio.to_thread(runner.run_component, primary_comp, {}, request_context)
 
                 # Write Blackboard Outputs (if defined in component config or node)
                 # For now, simplistic passing
@@ -164,7 +242,9 @@ class NodeExecutor:
                 # 2a. Fetch Inbound Memory (The "Read" Step)
                 inbound_blackboards = {}
                 if memory_gateway:
-                    inbound_blackboards = memory_gateway.get_inbound_blackboards(inbound_edge_ids)
+                    inbound_blackboards = await asyncio.to_thread(
+                        memory_gateway.get_inbound_blackboards, inbound_edge_ids
+                    )
 
                 # --- SPINE-SYNC: CANVAS TOOL INGESTION ---
                 if self.canvas_mirror:
@@ -191,7 +271,7 @@ class NodeExecutor:
                 except ValueError as e:
                     return self._fail(node, run_id, str(e), start_ts, events, ctx_args)
 
-                readiness = gateway.check_readiness()
+                readiness = await asyncio.to_thread(gateway.check_readiness)
                 self._log_event(
                     events,
                     "readiness_check",
@@ -202,7 +282,7 @@ class NodeExecutor:
                     return self._skip(node, run_id, f"Provider not ready: {readiness.reason}", start_ts, ctx_args, events)
 
                 # 4. Context & Invocation
-                nexus_context = self._fetch_nexus_context(task, events)
+                nexus_context = await asyncio.to_thread(self._fetch_nexus_context, task, events)
 
                 from atoms_agents.runtime.prompting.composer import compose_messages
                 messages = compose_messages(
@@ -245,7 +325,9 @@ class NodeExecutor:
                 else:
                     raise ValueError(f"Unknown pii_strategy: {pii_strategy}. Failing closed for safety.")
 
-                response = self._invoke_gateway(
+                if self._cancelled(cancel_token):
+                    return self._skip(node, run_id, "Cancelled", start_ts, ctx_args, events)
+                response = await self._ainvoke_gateway(
                     node, gateway, messages_clean, model_id, provider_id, events, request_context
                 )
 
@@ -259,22 +341,29 @@ class NodeExecutor:
                 self._log_chain_of_thought(events, response, provider_id, model_id)
 
                 # 5. Outputs
-                artifacts_written, writes = self._write_outputs(node, content)
+                if self._cancelled(cancel_token):
+                    return self._skip(node, run_id, "Cancelled", start_ts, ctx_args, events)
+                artifacts_written, writes = await asyncio.to_thread(self._write_outputs, node, content)
 
                 # Write to Memory Gateway (The "Write" Step)
                 if memory_gateway and outbound_edge_ids:
-                    for edge_id in outbound_edge_ids:
-                        # We write the same output to all outbound edges (broadcast)
-                        # Or we could filter based on connection handles if we parsed that far
-                        memory_gateway.write_blackboard(
+                    # We write the same output to all outbound edges (broadcast)
+                    # Or we could filter based on connection handles if we parsed that far
+                    await asyncio.gather(*[
+                        asyncio.to_thread(
+                            memory_gateway.write_blackboard,
                             edge_id,
-                            writes,
+                            key,
+                            value,
                             agent_id=request_context.actor_id or request_context.user_id,
                             source_node_id=node.node_id,
                         )
+                        for edge_id in outbound_edge_ids
+                        for key, value in writes.items()
+                    ])
 
                 # End
-                self.audit_emitter.emit(
+                await self._emit_audit(
                     AuditEvent(
                         event_type=EventType.NODE_END,
                         run_id=run_id,
@@ -291,7 +380,7 @@ class NodeExecutor:
                 )
 
         except Exception as e:
-            self.audit_emitter.emit(
+            await self._emit_audit(
                 AuditEvent(
                     event_type=EventType.ERROR, run_id=run_id, node_id=node.node_id,
                     payload={"error": str(e)}, **ctx_args, # type: ignore
@@ -302,6 +391,9 @@ class NodeExecutor:
                 started_ts=start_ts, ended_ts=time.time(), error=str(e), events=events
             )
 
+    def _cancelled(self, cancel_token: Optional[CancellationToken]) -> bool:
+        return cancel_token is not None and cancel_token.is_cancelled()
+
     def _allow_pass(self, node: Any, run_id: str, reason: str, start_ts: float, events: List[Dict[str, Any]], ctx_args: Dict[str, Any]) -> NodeRunResult:
          return NodeRunResult(node.node_id, "PASS", reason, start_ts, time.time(), events=events)
 
@@ -318,7 +410,10 @@ class NodeExecutor:
             self._log_event(events, "nexus_retrieval", count=len(nexus_context))
         return nexus_context
 
-    def _invoke_gateway(
+    async def _emit_audit(self, event: AuditEvent) -> None:
+        await asyncio.to_thread(self.audit_emitter.emit, event)
+
+    async def _ainvoke_gateway(
         self,
         node: NodeCard,
         gateway: Any,
@@ -340,14 +435,27 @@ class NodeExecutor:
         from atoms_agents.runtime.limits import RunLimits
         limits = RunLimits(max_calls=1, max_output_tokens=4096, timeout_seconds=60.0)
 
-        resp = gateway.generate(
-            messages,
-            model_card,
-            None,
-            capability_toggles=toggles,
-            limits=limits,
-            request_context=request_context,
-        )
+        agenerate = getattr(gateway, "agenerate", None)
+        if agenerate is not None and inspect.iscoroutinefunction(agenerate):
+            resp = await agenerate(
+                messages,
+                model_card,
+                None,
+                capability_toggles=toggles,
+                limits=limits,
+                request_context=request_context,
+            )
+        else:
+            # Sync-only gateway (or test double): keep it off the event loop
+            resp = await asyncio.to_thread(
+                gateway.generate,
+                messages,
+                model_card,
+                None,
+                capability_toggles=toggles,
+                limits=limits,
+                request_context=request_context,
+            )
 
         # Commerce Hook
         try:
@@ -1,5 +1,7 @@
-from typing import List, Dict, Any, Optional
-from atoms_agents.runtime.gateway import LLMGateway, CapabilityToggleRequest
+import threading
+from contextvars import ContextVar
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+from atoms_agents.runtime.gateway import LLMGateway, CapabilityToggleRequest, StreamChunk
 
 try:
     import boto3  # noqa: F401
@@ -8,16 +10,39 @@ try:
 except ImportError:
     BOTO3_AVAILABLE = False
 
+# Per-call request headers; read by the single hook registered on the shared client
+_REQUEST_HEADERS: ContextVar[Optional[Dict[str, str]]] = ContextVar("bedrock_request_headers", default=None)
+
+
+def _inject_request_headers(request: Any, **kwargs: Any) -> None:
+    headers = _REQUEST_HEADERS.get()
+    if headers:
+        for k, v in headers.items():
+            request.headers.add_header(k, v)
+
 
 class BedrockGateway(LLMGateway):
+    def __init__(self) -> None:
+        self._client: Any = None
+        self._client_lock = threading.Lock()
+
     def _get_client(self, provider_config: Any) -> Any:
+        # boto3 clients are thread-safe; build one per gateway instance and reuse it
+        if self._client is not None:
+            return self._client
         try:
             import boto3
         except ImportError:
             raise ImportError("boto3 is required for BedrockGateway")
 
-        # Standard boto3 session lookup
-        return boto3.Session().client("bedrock-runtime")
+        with self._client_lock:
+            if self._client is None:
+                # Standard boto3 session lookup
+                client = boto3.Session().client("bedrock-runtime")
+                # 'before-call.bedrock-runtime' captures all calls (Converse/ConverseStream included).
+                client.meta.events.register("before-call.bedrock-runtime", _inject_request_headers)
+                self._client = client
+        return self._client
 
     def generate(
         self,
@@ -35,19 +60,39 @@ class BedrockGateway(LLMGateway):
 
         client = self._get_client(provider_config)
 
-        # Header Injection via Event Hook
-        if request_context:
-            headers = request_context.to_headers()
+        # Header Injection via Event Hook (scoped to this call, not to the shared client)
+        token = _REQUEST_HEADERS.set(request_context.to_headers() if request_context else None)
+        try:
+            return self._converse(client, messages, model_card, stream)
+        finally:
+            _REQUEST_HEADERS.reset(token)
 
-            def inject_header(request, **kwargs):
-                for k, v in headers.items():
-                    request.headers.add_header(k, v)
+    def stream_generate(
+        self,
+        messages: List[Dict[str, str]],
+        model_card: Any,
+        provider_config: Any,
+        capability_toggles: Optional[List[CapabilityToggleRequest]] = None,
+        limits: Optional[Any] = None,
+        request_context: Optional[Any] = None,
+    ) -> Iterator[StreamChunk]:
+        if not BOTO3_AVAILABLE:
+            yield {"done": True, "status": "FAIL", "reason": "boto3 not installed"}
+            return
 
-            # Register for 'before-call' specifically for Converse/ConverseStream if possible, or generally on client.
-            # 'before-call.bedrock-runtime' captures all calls.
-            client.meta.events.register("before-call.bedrock-runtime", inject_header)
-        model_id = model_card.official_id_or_deployment
+        client = self._get_client(provider_config)
+        token = _REQUEST_HEADERS.set(request_context.to_headers() if request_context else None)
+        try:
+            bedrock_messages, system_prompts = self._to_converse_messages(messages)
+            yield from self._iter_converse_stream(
+                client, model_card.official_id_or_deployment, bedrock_messages, system_prompts
+            )
+        except Exception as e:
+            yield {"done": True, "status": "FAIL", "reason": f"Bedrock Error: {str(e)}"}
+        finally:
+            _REQUEST_HEADERS.reset(token)
 
+    def _to_converse_messages(self, messages: List[Dict[str, str]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
         # Convert standard messages to Bedrock Converse format
         # Standard: [{"role": "user", "content": "text"}]
         # Bedrock Converse: [{"role": "user", "content": [{"text": "text"}]}]
@@ -61,30 +106,56 @@ class BedrockGateway(LLMGateway):
                 bedrock_messages.append(
                     {"role": m["role"], "content": [{"text": m["content"]}]}
                 )
+        return bedrock_messages, system_prompts
+
+    def _iter_converse_stream(
+        self,
+        client: Any,
+        model_id: str,
+        bedrock_messages: List[Dict[str, Any]],
+        system_prompts: List[Dict[str, str]],
+    ) -> Iterator[StreamChunk]:
+        response = client.converse_stream(
+            modelId=model_id,
+            messages=bedrock_messages,
+            system=system_prompts,
+            inferenceConfig={"maxTokens": 1024},
+        )
+        usage = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+        finish_reason = "stop"
+
+        for event in response.get("stream", []):
+            if "contentBlockDelta" in event:
+                text = event["contentBlockDelta"]["delta"].get("text")
+                if text:
+                    yield {"delta": text}
+            if "messageStop" in event:
+                finish_reason = event["messageStop"].get("stopReason", finish_reason)
+            if "metadata" in event and "usage" in event["metadata"]:
+                u = event["metadata"]["usage"]
+                usage["input_tokens"] = u.get("inputTokens", 0)
+                usage["output_tokens"] = u.get("outputTokens", 0)
+                usage["total_tokens"] = u.get("totalTokens", 0)
+
+        yield {"done": True, "usage": usage, "finish_reason": finish_reason, "model_id": model_id}
+
+    def _converse(self, client: Any, messages: List[Dict[str, str]], model_card: Any, stream: bool) -> Dict[str, Any]:
+        model_id = model_card.official_id_or_deployment
+        bedrock_messages, system_prompts = self._to_converse_messages(messages)
 
         if stream:
-            response = client.converse_stream(
-                modelId=model_id,
-                messages=bedrock_messages,
-                system=system_prompts,
-                inferenceConfig={"maxTokens": 1024},
-            )
             full_text = ""
-            usage = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
-
-            for event in response.get("stream", []):
-                if "contentBlockDelta" in event:
-                    full_text += event["contentBlockDelta"]["delta"]["text"]
-                if "metadata" in event and "usage" in event["metadata"]:
-                    u = event["metadata"]["usage"]
-                    usage["input_tokens"] = u.get("inputTokens", 0)
-                    usage["output_tokens"] = u.get("outputTokens", 0)
-                    usage["total_tokens"] = u.get("totalTokens", 0)
+            final: Dict[str, Any] = {}
+            for chunk in self._iter_converse_stream(client, model_id, bedrock_messages, system_prompts):
+                if chunk.get("done"):
+                    final = chunk
+                else:
+                    full_text += chunk["delta"]
 
             return {
                 "role": "assistant",
                 "content": full_text,
-                "usage": usage,
+                "usage": final.get("usage", {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}),
                 "finish_reason": "stop",
                 "model_id": model_id
             }
@@ -1,7 +1,8 @@
 from typing import List, Dict, Any, Optional
-import requests
+import httpx
 from atoms_agents.runtime.gateway import LLMGateway, CapabilityToggleRequest, ReadinessResult, ReadinessStatus
 from atoms_agents.runtime.auth_loader import require_key
+from atoms_agents.runtime.providers.http_pool import get_async_http_client, get_http_client
 
 class CometGateway(LLMGateway):
     """
@@ -15,6 +16,16 @@ class CometGateway(LLMGateway):
     # Placeholder Base URL - adjusting to a likely endpoint or user configurable
     BASE_URL = "https://api.comet.com/v1" # Hypothetical
 
+    @property
+    def _http(self) -> httpx.Client:
+        # Shared keep-alive pool for every CometGateway instance
+        return get_http_client("comet")
+
+    @property
+    def _ahttp(self) -> httpx.AsyncClient:
+        # Pooled per event loop, for agenerate
+        return get_async_http_client("comet")
+
     def _get_headers(self) -> Dict[str, str]:
         api_key = require_key("COMET_API_KEY")
         return {
@@ -45,17 +56,44 @@ class CometGateway(LLMGateway):
         }
 
         try:
-            resp = requests.post(url, headers=headers, json=payload, timeout=60)
+            resp = self._http.post(url, headers=headers, json=payload, timeout=60)
             resp.raise_for_status()
-            data = resp.json()
-            return {
-                "role": "assistant",
-                "content": data["choices"][0]["message"]["content"],
-                "usage": data.get("usage", {})
-            }
+            return self._to_result(resp.json())
         except Exception as e:
              return {"status": "FAIL", "reason": f"Comet Error: {str(e)}", "error": str(e)}
 
+    async def agenerate(
+        self,
+        messages: List[Dict[str, str]],
+        model_card: Any,
+        provider_config: Any,
+        stream: bool = False,
+        capability_toggles: Optional[List[CapabilityToggleRequest]] = None,
+        limits: Optional[Any] = None,
+        request_context: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+
+        url = f"{self.BASE_URL}/chat/completions"
+        headers = self._get_headers()
+        payload = {
+            "model": model_card.official_id_or_deployment,
+            "messages": messages,
+        }
+
+        try:
+            resp = await self._ahttp.post(url, headers=headers, json=payload, timeout=60)
+            resp.raise_for_status()
+            return self._to_result(resp.json())
+        except Exception as e:
+             return {"status": "FAIL", "reason": f"Comet Error: {str(e)}", "error": str(e)}
+
+    def _to_result(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "role": "assistant",
+            "content": data["choices"][0]["message"]["content"],
+            "usage": data.get("usage", {})
+        }
+
     def check_readiness(self) -> ReadinessResult:
         try:
             # Check key
@@ -1,10 +1,12 @@
-from typing import List, Dict, Any, Optional
-import requests
+from typing import List, Dict, Any, Optional, Iterator
+import asyncio
+import httpx
 import json
 import mimetypes
 import os
-from atoms_agents.runtime.gateway import LLMGateway, CapabilityToggleRequest, ReadinessResult, ReadinessStatus
+from atoms_agents.runtime.gateway import LLMGateway, CapabilityToggleRequest, ReadinessResult, ReadinessStatus, StreamChunk
 from atoms_agents.runtime.auth_loader import require_key
+from atoms_agents.runtime.providers.http_pool import get_async_http_client, get_http_client
 
 class GeminiGateway(LLMGateway):
     """
@@ -14,6 +16,16 @@ class GeminiGateway(LLMGateway):
     BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
     # Supported capability keys: "thinking_level" (LOW/HIGH), "json_schema" (bool), "mime_type" (str)
 
+    @property
+    def _http(self) -> httpx.Client:
+        # Shared keep-alive pool for every GeminiGateway instance
+        return get_http_client("gemini")
+
+    @property
+    def _ahttp(self) -> httpx.AsyncClient:
+        # Pooled per event loop, for agenerate
+        return get_async_http_client("gemini")
+
     def _get_key(self) -> str:
         return require_key("GEMINI_API_KEY")
 
@@ -50,7 +62,7 @@ class GeminiGateway(LLMGateway):
         # The REST API documentation says we can do it in one go for small files.
         # Let's try the simplest: metadata is optional.
 
-        resp = requests.post(upload_url_base, headers=headers, params=params, data=data)
+        resp = self._http.post(upload_url_base, headers=headers, params=params, content=data, timeout=None)
         resp.raise_for_status()
 
         # Response should contain `file` object with `uri`
@@ -63,22 +75,13 @@ class GeminiGateway(LLMGateway):
         # For video, it might take a moment.
         return uri
 
-    def generate(
+    def _build_payload(
         self,
         messages: List[Dict[str, str]],
-        model_card: Any,
-        provider_config: Any,
-        stream: bool = False,
-        capability_toggles: Optional[List[CapabilityToggleRequest]] = None,
-        limits: Optional[Any] = None,
-        request_context: Optional[Any] = None,
+        capability_toggles: Optional[List[CapabilityToggleRequest]],
+        limits: Optional[Any],
     ) -> Dict[str, Any]:
-
-        key = self._get_key()
-        model_id = model_card.official_id_or_deployment # e.g. "gemini-1.5-pro-latest"
-
-        url = f"{self.BASE_URL}/models/{model_id}:generateContent?key={key}"
-
+        """Builds the generateContent body; raises RuntimeError if a referenced video cannot be uploaded."""
         # Convert messages to Gemini Content
         contents = []
 
@@ -111,7 +114,7 @@ class GeminiGateway(LLMGateway):
                         parts.append({"file_data": {"mime_type": mime_type or "video/mp4", "file_uri": uri}})
                         # Add a text prompt if needed? Usually prompt follows
                     except Exception as e:
-                        return {"status": "FAIL", "reason": f"Video Upload Failed: {e}"}
+                        raise RuntimeError(f"Video Upload Failed: {e}")
                 else:
                     parts.append({"text": text})
             else:
@@ -135,74 +138,184 @@ class GeminiGateway(LLMGateway):
         if limits and limits.max_output_tokens:
             gen_config["maxOutputTokens"] = limits.max_output_tokens
 
-        payload = {
+        return {
             "contents": contents,
             "generationConfig": gen_config
         }
 
-        try:
-            resp = requests.post(url, json=payload, headers={"Content-Type": "application/json"})
-            resp.raise_for_status()
-            data = resp.json()
-
-            # Extract text
-            if "candidates" in data and len(data["candidates"]) > 0:
-                cand = data["candidates"][0]
-                content_parts = cand.get("content", {}).get("parts", [])
-                text = "".join([p.get("text", "") for p in content_parts])
-
-                # Extract usage
-                usage_meta = data.get("usageMetadata", {})
-
-                # Normalize to TokenUsage (input_tokens, output_tokens)
-                input_tokens = usage_meta.get("promptTokenCount", 0)
-                output_tokens = usage_meta.get("candidatesTokenCount", 0)
-                total_tokens = usage_meta.get("totalTokenCount", 0)
-
-                usage = {
-                    "input_tokens": input_tokens,
-                    "output_tokens": output_tokens,
-                    "total_tokens": total_tokens
-                }
-
-                # Calculate Cost
-                cost_usd = 0.0
-                try:
-                    # Lazy import to avoid circularity if any, or just import
-                    from engines.budget.token_accounting import TokenAccountingService
-                    acc = TokenAccountingService()
-                    # Gemini is usually "google/gemini-..." or just "gemini-..."
-                    # The model_id passed here is official_id e.g. "gemini-1.5-pro-latest"
-                    # We should pass "google" as provider if we know it, or rely on internal logic.
-                    # The gateway is GeminiGateway, so provider is likely "google" or "vertex" or "gemini"
-                    # Price book has "google/gemini-..." keys.
-                    cost_usd = acc.calculate_cost("google", model_id, usage)
-                except ImportError:
-                    print("Warning: TokenAccountingService not found.")
-                except Exception as e:
-                    print(f"Cost calc error: {e}")
-
-                return {
-                    "role": "assistant",
-                    "content": text,
-                    "usage": usage,
-                    "model_id": model_id,
-                    "cost_usd": cost_usd
-                }
-            else:
-                 return {"status": "FAIL", "reason": "No candidates returned"}
+    def stream_generate(
+        self,
+        messages: List[Dict[str, str]],
+        model_card: Any,
+        provider_config: Any,
+        capability_toggles: Optional[List[CapabilityToggleRequest]] = None,
+        limits: Optional[Any] = None,
+        request_context: Optional[Any] = None,
+    ) -> Iterator[StreamChunk]:
+        model_id = model_card.official_id_or_deployment
+        usage = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+        finish_reason = None
 
+        try:
+            key = self._get_key()
+            payload = self._build_payload(messages, capability_toggles, limits)
+            url = f"{self.BASE_URL}/models/{model_id}:streamGenerateContent"
+            params = {"alt": "sse", "key": key}
+
+            with self._http.stream("POST", url, params=params, json=payload, headers={"Content-Type": "application/json"}) as resp:
+                resp.raise_for_status()
+                for line in resp.iter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = json.loads(line[5:].strip() or "{}")
+
+                    for cand in data.get("candidates", [])[:1]:
+                        content_parts = cand.get("content", {}).get("parts", [])
+                        text = "".join([p.get("text", "") for p in content_parts])
+                        if text:
+                            yield {"delta": text}
+                        if cand.get("finishReason"):
+                            finish_reason = cand["finishReason"]
+
+                    # usageMetadata is cumulative; the last frame carries the totals
+                    usage_meta = data.get("usageMetadata")
+                    if usage_meta:
+                        usage = {
+                            "input_tokens": usage_meta.get("promptTokenCount", 0),
+                            "output_tokens": usage_meta.get("candidatesTokenCount", 0),
+                            "total_tokens": usage_meta.get("totalTokenCount", 0)
+                        }
         except Exception as e:
             msg = str(e)
             if "key=" in msg:
                  msg = msg.split("key=")[0] + "key=***"
-            return {"status": "FAIL", "reason": f"Gemini Error: {msg}", "error": msg}
+            yield {"done": True, "status": "FAIL", "reason": f"Gemini Error: {msg}"}
+            return
+
+        yield {"done": True, "usage": usage, "finish_reason": finish_reason, "model_id": model_id}
+
+    def generate(
+        self,
+        messages: List[Dict[str, str]],
+        model_card: Any,
+        provider_config: Any,
+        stream: bool = False,
+        capability_toggles: Optional[List[CapabilityToggleRequest]] = None,
+        limits: Optional[Any] = None,
+        request_context: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+
+        key = self._get_key()
+        model_id = model_card.official_id_or_deployment # e.g. "gemini-1.5-pro-latest"
+
+        url = f"{self.BASE_URL}/models/{model_id}:generateContent?key={key}"
+
+        try:
+            payload = self._build_payload(messages, capability_toggles, limits)
+        except RuntimeError as e:
+            return {"status": "FAIL", "reason": str(e)}
+
+        try:
+            resp = self._http.post(url, json=payload, headers={"Content-Type": "application/json"})
+            resp.raise_for_status()
+            return self._to_result(resp.json(), model_id)
+        except Exception as e:
+            return self._error_result(e)
+
+    async def agenerate(
+        self,
+        messages: List[Dict[str, str]],
+        model_card: Any,
+        provider_config: Any,
+        stream: bool = False,
+        capability_toggles: Optional[List[CapabilityToggleRequest]] = None,
+        limits: Optional[Any] = None,
+        request_context: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+
+        key = self._get_key()
+        model_id = model_card.official_id_or_deployment
+
+        url = f"{self.BASE_URL}/models/{model_id}:generateContent?key={key}"
+
+        try:
+            if self._has_local_video(messages):
+                # File API uploads are blocking; keep them off the loop
+                payload = await asyncio.to_thread(self._build_payload, messages, capability_toggles, limits)
+            else:
+                payload = self._build_payload(messages, capability_toggles, limits)
+        except RuntimeError as e:
+            return {"status": "FAIL", "reason": str(e)}
+
+        try:
+            resp = await self._ahttp.post(url, json=payload, headers={"Content-Type": "application/json"})
+            resp.raise_for_status()
+            return self._to_result(resp.json(), model_id)
+        except Exception as e:
+            return self._error_result(e)
+
+    @staticmethod
+    def _has_local_video(messages: List[Dict[str, str]]) -> bool:
+        return any(m["content"].strip().startswith("file://") for m in messages)
+
+    def _to_result(self, data: Dict[str, Any], model_id: str) -> Dict[str, Any]:
+        if "candidates" in data and len(data["candidates"]) > 0:
+            cand = data["candidates"][0]
+            content_parts = cand.get("content", {}).get("parts", [])
+            text = "".join([p.get("text", "") for p in content_parts])
+
+            # Extract usage
+            usage_meta = data.get("usageMetadata", {})
+
+            # Normalize to TokenUsage (input_tokens, output_tokens)
+            input_tokens = usage_meta.get("promptTokenCount", 0)
+            output_tokens = usage_meta.get("candidatesTokenCount", 0)
+            total_tokens = usage_meta.get("totalTokenCount", 0)
+
+            usage = {
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": total_tokens
+            }
+
+            # Calculate Cost
+            cost_usd = 0.0
+            try:
+                # Lazy import to avoid circularity if any, or just import
+                from engines.budget.token_accounting import TokenAccountingService
+                acc = TokenAccountingService()
+                # Gemini is usually "google/gemini-..." or just "gemini-..."
+                # The model_id passed here is official_id e.g. "gemini-1.5-pro-latest"
+                # We should pass "google" as provider if we know it, or rely on internal logic.
+                # The gateway is GeminiGateway, so provider is likely "google" or "vertex" or "gemini"
+                # Price book has "google/gemini-..." keys.
+                cost_usd = acc.calculate_cost("google", model_id, usage)
+            except ImportError:
+                print("Warning: TokenAccountingService not found.")
+            except Exception as e:
+                print(f"Cost calc error: {e}")
+
+            return {
+                "role": "assistant",
+                "content": text,
+                "usage": usage,
+                "model_id": model_id,
+                "cost_usd": cost_usd
+            }
+        else:
+             return {"status": "FAIL", "reason": "No candidates returned"}
+
+    def _error_result(self, e: Exception) -> Dict[str, Any]:
+        msg = str(e)
+        if "key=" in msg:
+             msg = msg.split("key=")[0] + "key=***"
+        return {"status": "FAIL", "reason": f"Gemini Error: {msg}", "error": msg}
 
     def check_readiness(self) -> ReadinessResult:
         try:
             key = self._get_key()
             # List models
-            resp = requests.get(f"{self.BASE_URL}/models?key={key}")
+            resp = self._http.get(f"{self.BASE_URL}/models?key={key}")
             if resp.status_code == 200:
                 return ReadinessResult(ReadinessStatus.READY, "Gemini Connected", True)
             return ReadinessResult(ReadinessStatus.RateLimited, f"Status: {resp.status_code}", False)
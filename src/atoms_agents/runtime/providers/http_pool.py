@@ -0,0 +1,101 @@
+"""
+Shared, per-provider pooled HTTP clients for the runtime gateways.
+
+Each provider gets one long-lived httpx.Client so back-to-back generations reuse
+keep-alive connections instead of paying a TCP+TLS handshake per request.
+Async gateways get the same pooling from one httpx.AsyncClient per provider and
+event loop (async clients cannot be shared across loops).
+HTTP/2 is negotiated when the optional `h2` package is installed.
+
+Config (env):
+- NORTHSTAR_HTTP_POOL_SIZE: max connections per provider pool (default 10)
+- NORTHSTAR_HTTP2: set to "0" to force HTTP/1.1
+"""
+import asyncio
+import importlib.util
+import os
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT_SECONDS = 60.0
+
+_CLIENTS: Dict[str, httpx.Client] = {}
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+_LOCK = threading.Lock()
+
+
+def _pool_size() -> int:
+    try:
+        return max(1, int(os.getenv("NORTHSTAR_HTTP_POOL_SIZE", DEFAULT_POOL_SIZE)))
+    except ValueError:
+        return DEFAULT_POOL_SIZE
+
+
+def _http2_enabled() -> bool:
+    if os.getenv("NORTHSTAR_HTTP2", "1") == "0":
+        return False
+    return importlib.util.find_spec("h2") is not None
+
+
+def get_http_client(provider_id: str, pool_size: Optional[int] = None) -> httpx.Client:
+    """Returns the shared pooled client for `provider_id`, creating it on first use."""
+    client = _CLIENTS.get(provider_id)
+    if client is not None and not client.is_closed:
+        return client
+
+    with _LOCK:
+        client = _CLIENTS.get(provider_id)
+        if client is None or client.is_closed:
+            client = httpx.Client(**_client_options(pool_size))
+            _CLIENTS[provider_id] = client
+        return client
+
+
+def get_async_http_client(provider_id: str, pool_size: Optional[int] = None) -> httpx.AsyncClient:
+    """Returns the pooled async client for `provider_id` on the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _LOCK:
+        clients = _ASYNC_CLIENTS.setdefault(loop, {})
+        client = clients.get(provider_id)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(**_client_options(pool_size))
+            clients[provider_id] = client
+        return client
+
+
+def _client_options(pool_size: Optional[int]) -> Dict[str, Any]:
+    size = pool_size or _pool_size()
+    return {
+        "http2": _http2_enabled(),
+        "timeout": DEFAULT_TIMEOUT_SECONDS,
+        "limits": httpx.Limits(max_connections=size, max_keepalive_connections=size),
+    }
+
+
+def close_http_client(provider_id: str) -> None:
+    with _LOCK:
+        client = _CLIENTS.pop(provider_id, None)
+    if client is not None:
+        client.close()
+
+
+def close_all_http_clients() -> None:
+    with _LOCK:
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+    for client in clients:
+        client.close()
+
+
+async def aclose_async_http_clients() -> None:
+    """Closes the async clients bound to the running event loop."""
+    with _LOCK:
+        clients = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
@@ -0,0 +1,62 @@
+"""Streaming helpers shared by OpenAI-compatible chat completion gateways (Groq, OpenRouter)."""
+import json
+from typing import Any, Dict, Iterator
+
+import httpx
+
+from atoms_agents.runtime.gateway import StreamChunk, TokenUsage
+
+
+def normalize_usage(raw_usage: Dict[str, Any]) -> TokenUsage:
+    return {
+        "input_tokens": raw_usage.get("prompt_tokens", 0),
+        "output_tokens": raw_usage.get("completion_tokens", 0),
+        "total_tokens": raw_usage.get("total_tokens", 0),
+    }
+
+
+def stream_chat_completions(
+    http: httpx.Client,
+    url: str,
+    headers: Dict[str, str],
+    payload: Dict[str, Any],
+    model_id: str,
+    error_label: str,
+) -> Iterator[StreamChunk]:
+    """
+    POSTs `payload` with stream=True and yields text deltas from the `data:` frames,
+    finishing with a `done` chunk carrying usage (from the final frame when the server sends it).
+    """
+    body = dict(payload, stream=True)
+    usage: TokenUsage = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+    finish_reason = None
+
+    try:
+        with http.stream("POST", url, headers=headers, json=body, timeout=60) as resp:
+            resp.raise_for_status()
+            for line in resp.iter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                if not data:
+                    continue
+                event = json.loads(data)
+
+                # Groq reports usage under x_groq, OpenAI/OpenRouter at the top level
+                raw_usage = event.get("usage") or (event.get("x_groq") or {}).get("usage")
+                if raw_usage:
+                    usage = normalize_usage(raw_usage)
+
+                for choice in event.get("choices") or []:
+                    delta = (choice.get("delta") or {}).get("content")
+                    if delta:
+                        yield {"delta": delta}
+                    if choice.get("finish_reason"):
+                        finish_reason = choice["finish_reason"]
+    except Exception as e:
+        yield {"done": True, "status": "FAIL", "reason": f"{error_label} Error: {str(e)}"}
+        return
+
+    yield {"done": True, "usage": usage, "finish_reason": finish_reason, "model_id": model_id}
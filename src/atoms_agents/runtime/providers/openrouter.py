@@ -1,7 +1,9 @@
-from typing import List, Dict, Any, Optional
-import requests
-from atoms_agents.runtime.gateway import LLMGateway, CapabilityToggleRequest, ReadinessResult, ReadinessStatus
+from typing import List, Dict, Any, Optional, Iterator
+import httpx
+from atoms_agents.runtime.gateway import LLMGateway, CapabilityToggleRequest, ReadinessResult, ReadinessStatus, StreamChunk
 from atoms_agents.runtime.auth_loader import require_key
+from atoms_agents.runtime.providers.http_pool import get_async_http_client, get_http_client
+from atoms_agents.runtime.providers.openai_compat import normalize_usage, stream_chat_completions
 
 class OpenRouterGateway(LLMGateway):
     """
@@ -9,6 +11,16 @@ class OpenRouterGateway(LLMGateway):
     """
     BASE_URL = "https://openrouter.ai/api/v1"
 
+    @property
+    def _http(self) -> httpx.Client:
+        # Shared keep-alive pool for every OpenRouterGateway instance
+        return get_http_client("openrouter")
+
+    @property
+    def _ahttp(self) -> httpx.AsyncClient:
+        # Pooled per event loop, for agenerate
+        return get_async_http_client("openrouter")
+
     def _get_headers(self) -> Dict[str, str]:
         api_key = require_key("OPENROUTER_API_KEY")
         return {
@@ -31,7 +43,77 @@ class OpenRouterGateway(LLMGateway):
 
         url = f"{self.BASE_URL}/chat/completions"
         headers = self._get_headers()
+        payload = self._build_payload(messages, model_card, limits)
+
+        try:
+            resp = self._http.post(url, headers=headers, json=payload, timeout=60)
+            resp.raise_for_status()
+            return self._to_result(resp.json(), model_card)
+        except Exception as e:
+             return {"status": "FAIL", "reason": f"OpenRouter Error: {str(e)}", "error": str(e)}
+
+    async def agenerate(
+        self,
+        messages: List[Dict[str, str]],
+        model_card: Any,
+        provider_config: Any,
+        stream: bool = False,
+        capability_toggles: Optional[List[CapabilityToggleRequest]] = None,
+        limits: Optional[Any] = None,
+        request_context: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+
+        url = f"{self.BASE_URL}/chat/completions"
+        headers = self._get_headers()
+        payload = self._build_payload(messages, model_card, limits)
+
+        try:
+            resp = await self._ahttp.post(url, headers=headers, json=payload, timeout=60)
+            resp.raise_for_status()
+            return self._to_result(resp.json(), model_card)
+        except Exception as e:
+             return {"status": "FAIL", "reason": f"OpenRouter Error: {str(e)}", "error": str(e)}
+
+    def _to_result(self, data: Dict[str, Any], model_card: Any) -> Dict[str, Any]:
+        choice = data["choices"][0]
+        message = choice["message"]
+        usage = normalize_usage(data.get("usage", {}))
+
+        return {
+            "role": message["role"],
+            "content": message["content"],
+            "usage": usage,
+            "finish_reason": choice.get("finish_reason"),
+            "model_id": data.get("model", model_card.official_id_or_deployment)
+        }
 
+    def stream_generate(
+        self,
+        messages: List[Dict[str, str]],
+        model_card: Any,
+        provider_config: Any,
+        capability_toggles: Optional[List[CapabilityToggleRequest]] = None,
+        limits: Optional[Any] = None,
+        request_context: Optional[Any] = None,
+    ) -> Iterator[StreamChunk]:
+        try:
+            headers = self._get_headers()
+        except ValueError as e:
+            yield {"done": True, "status": "FAIL", "reason": f"OpenRouter Error: {str(e)}"}
+            return
+
+        payload = self._build_payload(messages, model_card, limits)
+        payload["usage"] = {"include": True}  # Usage accounting arrives in the final frame
+        yield from stream_chat_completions(
+            self._http,
+            f"{self.BASE_URL}/chat/completions",
+            headers,
+            payload,
+            model_card.official_id_or_deployment,
+            "OpenRouter",
+        )
+
+    def _build_payload(self, messages: List[Dict[str, str]], model_card: Any, limits: Optional[Any]) -> Dict[str, Any]:
         payload = {
             "model": model_card.official_id_or_deployment,
             "messages": messages,
@@ -39,37 +121,12 @@ class OpenRouterGateway(LLMGateway):
 
         if limits and limits.max_output_tokens:
              payload["max_tokens"] = limits.max_output_tokens
-
-        try:
-            resp = requests.post(url, headers=headers, json=payload, timeout=60)
-            resp.raise_for_status()
-            data = resp.json()
-
-            choice = data["choices"][0]
-            message = choice["message"]
-            raw_usage = data.get("usage", {})
-
-            usage = {
-                "input_tokens": raw_usage.get("prompt_tokens", 0),
-                "output_tokens": raw_usage.get("completion_tokens", 0),
-                "total_tokens": raw_usage.get("total_tokens", 0)
-            }
-
-            return {
-                "role": message["role"],
-                "content": message["content"],
-                "usage": usage,
-                "finish_reason": choice.get("finish_reason"),
-                "model_id": data.get("model", model_card.official_id_or_deployment)
-            }
-
-        except Exception as e:
-             return {"status": "FAIL", "reason": f"OpenRouter Error: {str(e)}", "error": str(e)}
+        return payload
 
     def list_models(self) -> List[str]:
         try:
             headers = self._get_headers()
-            resp = requests.get(f"{self.BASE_URL}/models", headers=headers, timeout=10)
+            resp = self._http.get(f"{self.BASE_URL}/models", headers=headers, timeout=10)
             if resp.status_code == 200:
                 data = resp.json()
                 return [m["id"] for m in data.get("data", [])]
@@ -81,7 +138,7 @@ class OpenRouterGateway(LLMGateway):
         try:
             headers = self._get_headers()
             # Simple models check
-            resp = requests.get(f"{self.BASE_URL}/models", headers=headers, timeout=10)
+            resp = self._http.get(f"{self.BASE_URL}/models", headers=headers, timeout=10)
             if resp.status_code == 200:
                 return ReadinessResult(ReadinessStatus.READY, "OpenRouter Connected", True)
             return ReadinessResult(ReadinessStatus.RateLimited, f"Status: {resp.status_code}", False)
@@ -12,15 +12,19 @@ def render_canvas(
     nodes_data = []
 
     # Sort by topological order if available, else flow definition order
-    from atoms_agents.runtime.dag_validator import DAGValidator
+    from atoms_agents.runtime.flow_plan import compile_flow_plan
     try:
-        # We need edges to sort.
-        # Assuming flow.edges behaves like DAGValidator expects
-        ordered_ids = DAGValidator.validate_dag(flow.nodes, flow.edges, flow.entry_node, flow.exit_nodes)
+        # Shares the compiled plan (and its cache) with FlowExecutor
+        ordered_ids = compile_flow_plan(flow).order
     except Exception:
         # Fallback to definition order if validation fails here (should verify beforehand)
         ordered_ids = flow.nodes
 
+    status_by_node: Dict[str, str] = {}
+    if result:
+        for nr in result.get("node_results", []):
+            status_by_node.setdefault(nr["node_id"], nr.get("status", "unknown"))
+
     for node_id in ordered_ids:
         if node_id not in nodes:
             continue
@@ -31,12 +35,7 @@ def render_canvas(
             p = personas[node.persona_ref]
             icon_url = p.icon_dark if theme == "dark" and p.icon_dark else (p.icon_light or "")
 
-        status = "pending"
-        if result:
-            for nr in result.get("node_results", []):
-                if nr["node_id"] == node_id:
-                    status = nr.get("status", "unknown")
-                    break
+        status = status_by_node.get(node_id, "pending")
 
         nodes_data.append({
             "id": node_id,
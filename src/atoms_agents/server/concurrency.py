@@ -0,0 +1,74 @@
+"""Admission control for blocking model calls made from the API server."""
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class QueueFullError(Exception):
+    """Raised when the waiting queue is at capacity; callers should shed load (HTTP 503)."""
+
+
+class ConcurrencyLimiter:
+    """
+    Runs blocking callables on a dedicated thread pool with at most `max_in_flight`
+    running and at most `max_queue` waiting. Anything beyond that is rejected
+    immediately instead of piling up behind slow providers.
+
+    Config (env):
+    - NORTHSTAR_GATEWAY_WORKERS: pool size / max in-flight calls (default 16)
+    - NORTHSTAR_GATEWAY_MAX_QUEUE: max waiting calls before rejecting (default 64)
+    """
+
+    def __init__(self, max_in_flight: Optional[int] = None, max_queue: Optional[int] = None):
+        self.max_in_flight = max_in_flight or int(os.getenv("NORTHSTAR_GATEWAY_WORKERS", "16"))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("NORTHSTAR_GATEWAY_MAX_QUEUE", "64"))
+        self._pool = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="gateway")
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self.in_flight = 0
+        self.waiting = 0
+        self.peak_waiting = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        if self.waiting >= self.max_queue and self._semaphore.locked():
+            self.rejected += 1
+            raise QueueFullError(f"Gateway queue full ({self.waiting} waiting)")
+
+        self.waiting += 1
+        self.peak_waiting = max(self.peak_waiting, self.waiting)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._pool, functools.partial(fn, *args, **kwargs))
+            self.completed += 1
+            return result
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "peak_queue_depth": self.peak_waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -1,56 +1,90 @@
 import os
 from datetime import datetime, timezone
-from typing import Dict, Any, List
+from typing import Dict, Any, List, AsyncIterator, Optional
 
 import uvicorn
-from fastapi import Body, FastAPI, HTTPException, WebSocket, WebSocketDisconnect
-from atoms_agents.registry.loader import RegistryLoader
+from fastapi import Body, FastAPI, Header, HTTPException, Response, WebSocket, WebSocketDisconnect
+from atoms_agents.registry.loader import RegistryContext, RegistryLoader
 from atoms_agents.registry.schemas import ModelCard
+from atoms_agents.registry.watcher import RegistryWatcher, watching_enabled
 from atoms_agents.runtime.gateway_resolution import resolve_gateway
+from atoms_agents.server.concurrency import ConcurrencyLimiter, QueueFullError
+from atoms_agents.server.registry_index import RegistryIndexCache, etag_matches
 
 app = FastAPI()
 
-# Global Registry
+# Global Registry. Replaced wholesale on hot-reload, so handlers should read it once.
 registry = None
+registry_version = 0
+registry_watcher = None
+# Serialized /registry/index payloads, rebuilt once per registry version
+registry_index = RegistryIndexCache()
+
+# Blocking gateway calls run here, never on the event loop
+gateway_limiter = ConcurrencyLimiter()
+
+def _swap_registry(ctx: RegistryContext) -> None:
+    global registry, registry_version
+    registry_index.update(ctx, registry_version + 1)
+    registry = ctx
+    registry_version += 1
 
 @app.on_event("startup")
 async def startup_event():
-    global registry
+    global registry_watcher
     current_dir = os.path.dirname(os.path.abspath(__file__))
     repo_root = os.path.abspath(os.path.join(current_dir, "../../.."))
     root_dir = os.path.join(repo_root, "registry/cards")
 
     print(f"Loading registry from: {root_dir}")
     loader = RegistryLoader(root_dir)
-    registry = loader.load_context()
+    _swap_registry(loader.load_context())
     print(f"Registry loaded. {len(registry.models)} models found.")
+    print(loader.timing_report())
+
+    if watching_enabled():
+        registry_watcher = RegistryWatcher(loader, on_reload=_swap_registry)
+        registry_watcher.start()
+        print(f"Watching registry for changes ({registry_watcher.backend}).")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if registry_watcher is not None:
+        registry_watcher.stop()
+    gateway_limiter.shutdown()
 
 @app.get("/registry/index")
-async def get_registry_index():
-    if not registry:
+async def get_registry_index(
+    since: Optional[str] = None,
+    if_none_match: Optional[str] = Header(default=None),
+):
+    """
+    Full index, or with `?since=<version>` only the entries added/changed/removed since then
+    (`{"version", "since", "delta": {section: {"added", "changed", "removed"}}}`). Versions
+    older than the retained history, or issued by an earlier server process, get the full
+    index. Full and delta bodies carry distinct ETags; honors If-None-Match with 304.
+    """
+    if registry_index.current is None:
         return {"error": "Registry not loaded"}
 
-    return {
-        "providers": [{ "id": k, "name": v.name } for k, v in registry.providers.items()],
-        "models": [{ "id": k, "name": v.official_id, "provider_id": v.provider_id } for k, v in registry.models.items()],
-        "personas": [{ "id": k, "name": v.name } for k, v in registry.personas.items()],
-        "manifests": [{ "id": k, "name": v.name } for k, v in registry.manifests.items()],
-        "reasoning_profiles": [{ "id": k, "name": v.name } for k, v in registry.reasoning_profiles.items()],
-        "firearms_licenses": [{ "id": k, "name": v.name } for k, v in registry.firearms_licenses.items()],
-        "agents": [{ "id": k, "name": v.name } for k, v in registry.agents.items()],
-    }
+    body, etag = registry_index.payload(since)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 def _iso_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
 def _resolve_model_card(provider_id: str, model_ref: str) -> ModelCard:
-    if model_ref in registry.models:
-        return registry.models[model_ref]
+    ctx = registry
+    if model_ref in ctx.models:
+        return ctx.models[model_ref]
 
-    for model_card in registry.models.values():
-        if model_card.provider_id == provider_id and model_card.official_id == model_ref:
-            return model_card
+    model_card = ctx.models_by_official_id.get((provider_id, model_ref))
+    if model_card is not None:
+        return model_card
 
     sanitized = (
         model_ref.strip().replace("/", "_").replace(":", "_").replace(" ", "_")
@@ -77,6 +111,17 @@ def _normalize_messages(messages: Any) -> List[Dict[str, str]]:
     return normalized
 
 
+# Gemini AI Studio fallback lanes used when the requested model is throttled (429) or missing (404).
+_GEMINI_FALLBACK_MODELS = ["gemini-flash-latest", "gemini-2.0-flash-001", "gemini-2.5-flash"]
+
+
+def _should_fallback(provider_id: str, result: Dict[str, Any]) -> bool:
+    if result.get("status") != "FAIL" or provider_id != "gemini":
+        return False
+    reason = str(result.get("reason") or "")
+    return "429" in reason or "404" in reason
+
+
 def _invoke(provider_id: str, model_ref: str, messages: List[Dict[str, str]]) -> Dict[str, Any]:
     provider_card = registry.providers.get(provider_id)
     if not provider_card:
@@ -94,33 +139,75 @@ def _invoke(provider_id: str, model_ref: str, messages: List[Dict[str, str]]) ->
     used_model_ref = model_card.official_id
 
     # Gemini AI Studio fallback path: avoid hard-fail when one model lane is throttled.
-    if result.get("status") == "FAIL" and provider_id == "gemini":
-        reason = str(result.get("reason") or "")
-        if "429" in reason or "404" in reason:
-            fallback_models = ["gemini-flash-latest", "gemini-2.0-flash-001", "gemini-2.5-flash"]
-            for fallback in fallback_models:
-                if fallback == used_model_ref:
-                    continue
-                fallback_card = _resolve_model_card(provider_id=provider_id, model_ref=fallback)
-                fallback_result = gateway.generate(
-                    messages=messages,
-                    model_card=fallback_card,
-                    provider_config=provider_card,
-                    stream=False,
-                )
-                if fallback_result.get("status") != "FAIL":
-                    result = fallback_result
-                    used_model_ref = fallback_card.official_id
-                    break
+    if _should_fallback(provider_id, result):
+        for fallback in _GEMINI_FALLBACK_MODELS:
+            if fallback == used_model_ref:
+                continue
+            fallback_card = _resolve_model_card(provider_id=provider_id, model_ref=fallback)
+            fallback_result = gateway.generate(
+                messages=messages,
+                model_card=fallback_card,
+                provider_config=provider_card,
+                stream=False,
+            )
+            if fallback_result.get("status") != "FAIL":
+                result = fallback_result
+                used_model_ref = fallback_card.official_id
+                break
 
     return {"result": result, "provider_id": provider_id, "model_ref": used_model_ref}
 
 
+async def _stream_invoke(
+    provider_id: str, model_ref: str, messages: List[Dict[str, str]]
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming counterpart of _invoke: yields StreamChunk dicts (tagged with the model_ref
+    actually used) as the provider produces them. Gemini fallback lanes are only tried
+    while nothing has been sent yet.
+    """
+    provider_card = registry.providers.get(provider_id)
+    if not provider_card:
+        raise ValueError(f"Unknown provider_id: {provider_id}")
+
+    gateway = resolve_gateway(provider_id)
+    model_card = _resolve_model_card(provider_id=provider_id, model_ref=model_ref)
+    lanes = [model_card]
+    if provider_id == "gemini":
+        lanes += [
+            _resolve_model_card(provider_id=provider_id, model_ref=fallback)
+            for fallback in _GEMINI_FALLBACK_MODELS
+            if fallback != model_card.official_id
+        ]
+
+    for lane_idx, lane_card in enumerate(lanes):
+        has_more_lanes = lane_idx < len(lanes) - 1
+        started = False
+        retry = False
+        async for chunk in gateway.astream_generate(
+            messages=messages,
+            model_card=lane_card,
+            provider_config=provider_card,
+        ):
+            if not started and has_more_lanes and _should_fallback(provider_id, chunk):
+                retry = True
+                break
+            started = started or bool(chunk.get("delta"))
+            yield {**chunk, "model_ref": lane_card.official_id}
+        if not retry:
+            return
+
+
 @app.get("/health")
 async def health() -> Dict[str, Any]:
     return {"ok": True, "ts": _iso_now()}
 
 
+@app.get("/metrics/chat")
+async def chat_metrics() -> Dict[str, Any]:
+    return {"gateway": gateway_limiter.metrics(), "ts": _iso_now()}
+
+
 @app.post("/api/chat/complete")
 async def chat_complete(payload: Dict[str, Any] = Body(default_factory=dict)) -> Dict[str, Any]:
     provider_id = str(payload.get("provider_id") or "gemini")
@@ -130,7 +217,9 @@ async def chat_complete(payload: Dict[str, Any] = Body(default_factory=dict)) ->
         raise HTTPException(status_code=400, detail="messages required")
 
     try:
-        invoke_payload = _invoke(provider_id=provider_id, model_ref=model_ref, messages=messages)
+        invoke_payload = await gateway_limiter.run(
+            _invoke, provider_id=provider_id, model_ref=model_ref, messages=messages
+        )
         result = invoke_payload["result"]
         if result.get("status") == "FAIL":
             raise HTTPException(status_code=502, detail=result.get("reason") or "Model request failed")
@@ -143,6 +232,8 @@ async def chat_complete(payload: Dict[str, Any] = Body(default_factory=dict)) ->
         }
     except HTTPException:
         raise
+    except QueueFullError as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "1"}) from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
@@ -172,20 +263,30 @@ async def websocket_endpoint(websocket: WebSocket):
                 messages.insert(0, {"role": "system", "content": "\n".join(system_instructions)})
 
             try:
-                invoke_payload = _invoke(provider_id=provider_id, model_ref=model_ref, messages=messages)
-                result = invoke_payload["result"]
-                if result.get("status") == "FAIL":
-                    await websocket.send_json({"error": result.get("reason", "Unknown error")})
-                    continue
-
-                await websocket.send_json(
-                    {
-                        "token": result.get("content", ""),
-                        "provider_id": invoke_payload["provider_id"],
-                        "model_ref": invoke_payload["model_ref"],
-                    }
-                )
-                await websocket.send_json({"done": True})
+                # Forward deltas as they arrive: time-to-first-token is the visible latency
+                async for chunk in _stream_invoke(provider_id=provider_id, model_ref=model_ref, messages=messages):
+                    if chunk.get("status") == "FAIL":
+                        await websocket.send_json({"error": chunk.get("reason", "Unknown error")})
+                        break
+                    if chunk.get("delta"):
+                        await websocket.send_json(
+                            {
+                                "token": chunk["delta"],
+                                "provider_id": provider_id,
+                                "model_ref": chunk["model_ref"],
+                            }
+                        )
+                    if chunk.get("done"):
+                        await websocket.send_json(
+                            {
+                                "done": True,
+                                "usage": chunk.get("usage", {}),
+                                "finish_reason": chunk.get("finish_reason"),
+                                "model_ref": chunk["model_ref"],
+                            }
+                        )
+            except WebSocketDisconnect:
+                raise
             except Exception as exc:
                 await websocket.send_json({"error": f"Execution Error: {str(exc)}"})
     except WebSocketDisconnect:
@@ -0,0 +1,128 @@
+"""Precomputed /registry/index payloads: serialized once per registry version, with deltas between versions.
+
+Version tokens are "<epoch>.<n>": the epoch is random per process, so a `since`
+saved against an earlier process never matches and gets the full index instead
+of a delta computed from an unrelated version.
+"""
+import hashlib
+import json
+import secrets
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from atoms_agents.registry.loader import RegistryContext
+
+# Versions kept around so `?since=` can answer with a delta instead of the full index
+DEFAULT_HISTORY = 32
+
+Entries = Dict[str, Dict[str, Dict[str, Any]]]  # section -> card id -> entry
+
+# section -> (RegistryContext attribute, entry builder)
+_SECTIONS: List[Tuple[str, str, Callable[[str, Any], Dict[str, Any]]]] = [
+    ("providers", "providers", lambda k, v: {"id": k, "name": v.name}),
+    ("models", "models", lambda k, v: {"id": k, "name": v.official_id, "provider_id": v.provider_id}),
+    ("personas", "personas", lambda k, v: {"id": k, "name": v.name}),
+    ("manifests", "manifests", lambda k, v: {"id": k, "name": v.name}),
+    ("reasoning_profiles", "reasoning_profiles", lambda k, v: {"id": k, "name": v.name}),
+    ("firearms_licenses", "firearms_licenses", lambda k, v: {"id": k, "name": v.name}),
+    ("agents", "agents", lambda k, v: {"id": k, "name": v.name}),
+]
+
+
+def _dumps(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def build_entries(ctx: RegistryContext) -> Entries:
+    return {
+        section: {k: build(k, v) for k, v in getattr(ctx, attr).items()}
+        for section, attr, build in _SECTIONS
+    }
+
+
+def diff_entries(old: Entries, new: Entries) -> Dict[str, Dict[str, Any]]:
+    """Per section: entries added or changed since `old`, and ids removed."""
+    delta: Dict[str, Dict[str, Any]] = {}
+    for section, current in new.items():
+        previous = old.get(section, {})
+        delta[section] = {
+            "added": [e for k, e in current.items() if k not in previous],
+            "changed": [e for k, e in current.items() if k in previous and previous[k] != e],
+            "removed": [k for k in previous if k not in current],
+        }
+    return delta
+
+
+class RegistryIndex:
+    """One registry version: entries, serialized body and a content-hashed ETag."""
+
+    def __init__(self, version: str, entries: Entries):
+        self.version = version
+        self.entries = entries
+        sections = {section: list(items.values()) for section, items in entries.items()}
+        # Content hash ignores the version so reloads that change nothing keep client caches valid
+        self.content_hash = hashlib.sha256(_dumps(sections)).hexdigest()[:32]
+        self.etag = f'W/"{self.content_hash}"'
+        self.body = _dumps({"version": version, **sections})
+        self._deltas: Dict[str, bytes] = {}
+
+    def delta_etag(self, since: str) -> str:
+        # Deltas are a different representation than the full body and than each other
+        return f'W/"{self.content_hash}.since.{since}"'
+
+    def delta_body(self, since: str, old_entries: Entries) -> bytes:
+        body = self._deltas.get(since)
+        if body is None:
+            body = _dumps({
+                "version": self.version,
+                "since": since,
+                "delta": diff_entries(old_entries, self.entries),
+            })
+            self._deltas[since] = body
+        return body
+
+
+class RegistryIndexCache:
+    """Holds the current RegistryIndex plus recent versions' entries for delta requests."""
+
+    def __init__(self, history: int = DEFAULT_HISTORY, epoch: Optional[str] = None):
+        self.history = history
+        self.epoch = epoch or secrets.token_hex(4)
+        self.current: Optional[RegistryIndex] = None
+        self._entries: "OrderedDict[str, Entries]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(self, ctx: RegistryContext, version: int) -> RegistryIndex:
+        index = RegistryIndex(f"{self.epoch}.{version}", build_entries(ctx))
+        with self._lock:
+            self._entries[index.version] = index.entries
+            while len(self._entries) > self.history:
+                self._entries.popitem(last=False)
+            self.current = index
+        return index
+
+    def payload(self, since: Optional[str] = None) -> Tuple[bytes, str]:
+        """
+        (body, ETag): the full index, or a delta against `since` when that version
+        token is from this process and still in history.
+        """
+        index = self.current
+        if index is None:
+            raise LookupError("Registry index not built")
+        if since is None:
+            return index.body, index.etag
+        old_entries = self._entries.get(since)
+        if old_entries is None:
+            return index.body, index.etag
+        return index.delta_body(since, old_entries), index.delta_etag(since)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison per RFC 9110 (W/ prefixes ignored)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    ours = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == ours for tag in if_none_match.split(","))
@@ -15,13 +15,38 @@ DO NOT modify any UI components or surfaces - only handle transport wiring.
 import asyncio
 import json
 import logging
-from typing import Any, Callable, Dict, List, Optional
+import os
+from contextlib import aclosing
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from urllib.parse import urljoin
 
 import aiohttp
 
+from atoms_agents.logging import event_codec
+from atoms_agents.transport.command_subscription import CommandSubscription
+from atoms_agents.transport.media_upload import MediaSource, MediaUploader
+from atoms_agents.transport.sse import ResumableSSE, SSEStatusError
+from atoms_agents.transport.ws_pool import WebSocketPool
+
 logger = logging.getLogger("CanvasTransportBridge")
 
+# Statuses meaning the realtime server has no batch endpoint
+_NO_BATCH_ENDPOINT = {404, 405, 501}
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _default_sse_batch_window() -> float:
+    try:
+        return max(0.0, float(os.getenv("NORTHSTAR_SSE_BATCH_MS", "20")) / 1000)
+    except ValueError:
+        return 0.02
+
 
 # ============================================
 # AGENT-SIDE TRANSPORT CLIENT
@@ -43,6 +68,8 @@ class AgentCanvasTransport:
         canvas_endpoint: str = "http://localhost:3000",
         realtime_endpoint: str = "http://localhost:8000",
         api_key: Optional[str] = None,
+        sse_batch_window: Optional[float] = None,
+        sse_batch_max: int = 100,
     ):
         """Initialize transport bridge.
         
@@ -50,13 +77,35 @@ class AgentCanvasTransport:
             canvas_endpoint: Canvas UI endpoint (atoms-ui)
             realtime_endpoint: Realtime server endpoint (atoms-core)
             api_key: Optional API key for authentication
+            sse_batch_window: Seconds SSE events for a canvas are coalesced into one
+                POST (default: NORTHSTAR_SSE_BATCH_MS or 20ms; 0 sends each event alone)
+            sse_batch_max: Events that trigger an immediate flush of a canvas batch
         """
         self.canvas_endpoint = canvas_endpoint
         self.realtime_endpoint = realtime_endpoint
         self.api_key = api_key
         self.session: Optional[aiohttp.ClientSession] = None
         self.sse_clients: Dict[str, asyncio.Queue] = {}  # canvas_id -> event queue
-        self.ws_connections: Dict[str, Any] = {}  # thread_id -> ws connection
+        # thread_id -> pooled chat-rail socket (NORTHSTAR_WS_MAX_SOCKETS, NORTHSTAR_WS_HEARTBEAT)
+        self.ws_heartbeat = _env_float("NORTHSTAR_WS_HEARTBEAT", 20.0)
+        self.ws_pool = WebSocketPool(
+            self._open_ws,
+            max_sockets=int(_env_float("NORTHSTAR_WS_MAX_SOCKETS", 64)),
+            idle_timeout=_env_float("NORTHSTAR_WS_IDLE_SECONDS", 120.0),
+        )
+        self.sse_batch_window = _default_sse_batch_window() if sse_batch_window is None else sse_batch_window
+        self.sse_batch_max = max(1, sse_batch_max)
+        self._sse_batch_supported = True
+        self._sse_pending: Dict[str, List[Tuple[Optional[str], bytes]]] = {}  # canvas_id -> [(thread_id, event)]
+        # Strong references to pending window timers; entries leave when a timer finishes
+        self._sse_flush_tasks: Dict[str, asyncio.Task] = {}
+        # Per-canvas send locks and how many flushes hold or wait on each; dropped at zero
+        self._sse_locks: Dict[str, asyncio.Lock] = {}
+        self._sse_lock_users: Dict[str, int] = {}
+        self.sse_posts = 0
+        self.sse_events = 0
+        self.commands: Optional[CommandSubscription] = None  # shared by every poll_commands caller
+        self.media = MediaUploader(self)
     
     async def connect(self) -> None:
         """Initialize HTTP session."""
@@ -64,14 +113,26 @@ class AgentCanvasTransport:
     
     async def disconnect(self) -> None:
         """Close HTTP session and WS connections."""
+        # Deliver coalesced SSE events still waiting for their window
+        await self.flush_sse()
+        for task in list(self._sse_flush_tasks.values()):
+            task.cancel()
+        
+        if self.commands is not None:
+            self.commands.stop()
+        
         # Close all WS connections
-        for ws in self.ws_connections.values():
-            await ws.close()
+        await self.ws_pool.close()
         
         # Close HTTP session
         if self.session:
             await self.session.close()
     
+    @property
+    def ws_connections(self) -> Dict[str, Any]:
+        """Open chat-rail sockets by thread_id."""
+        return self.ws_pool.connections()
+    
     # ========================================
     # SSE METHODS (Canvas State Truth)
     # ========================================
@@ -81,55 +142,157 @@ class AgentCanvasTransport:
         canvas_id: str,
         event_data: Dict[str, Any],
         thread_id: Optional[str] = None,
+        encoded_event: Optional[bytes] = None,
+        flush: bool = False,
     ) -> None:
         """Emit SSE event for canvas state change (truth).
         
         This sends a real-time state update to the canvas. All agents watching
         this canvas will see the update via SSE.
         
+        Events for the same canvas are coalesced for `sse_batch_window` and
+        sent in order as a single POST to `/sse/canvas/{canvas_id}/batch`; if
+        the realtime server has no batch endpoint, they are sent one by one.
+        Coalesced events are delivered by `flush_sse()`/`disconnect()`, and
+        also when the event loop shuts down and cancels the window timer.
+        
         Args:
             canvas_id: Canvas ID
             event_data: EventV2 envelope data
             thread_id: Optional thread ID for chat context
+            encoded_event: `event_data` already encoded as JSON; spliced into
+                the request body instead of encoding the event again
+            flush: Send this canvas' batch (including this event) before
+                returning, for callers that need delivery to have happened
         """
         if not self.session:
             raise RuntimeError("Transport not connected. Call connect() first.")
         
+        if encoded_event is None:
+            encoded_event = event_codec.dumps(event_data)
+        
+        if self.sse_batch_window <= 0:
+            await self._post_sse(canvas_id, [(thread_id, encoded_event)])
+            return
+        
+        pending = self._sse_pending.setdefault(canvas_id, [])
+        pending.append((thread_id, encoded_event))
+        if flush or len(pending) >= self.sse_batch_max:
+            await self._flush_sse_canvas(canvas_id)
+        elif canvas_id not in self._sse_flush_tasks:
+            task = asyncio.create_task(self._flush_sse_later(canvas_id))
+            self._sse_flush_tasks[canvas_id] = task
+            task.add_done_callback(lambda t, c=canvas_id: self._forget_flush_task(c, t))
+    
+    async def flush_sse(self) -> None:
+        """Send every coalesced SSE event now."""
+        for canvas_id in list(self._sse_pending):
+            await self._flush_sse_canvas(canvas_id)
+    
+    def _forget_flush_task(self, canvas_id: str, task: asyncio.Task) -> None:
+        if self._sse_flush_tasks.get(canvas_id) is task:
+            del self._sse_flush_tasks[canvas_id]
+    
+    async def _flush_sse_later(self, canvas_id: str) -> None:
+        try:
+            await asyncio.sleep(self.sse_batch_window)
+        finally:
+            # Runs on cancellation too (loop shutdown), so the window's events are still sent
+            await self._flush_sse_canvas(canvas_id)
+    
+    async def _flush_sse_canvas(self, canvas_id: str) -> None:
+        lock = self._sse_locks.get(canvas_id)
+        if lock is None:
+            lock = self._sse_locks[canvas_id] = asyncio.Lock()
+        self._sse_lock_users[canvas_id] = self._sse_lock_users.get(canvas_id, 0) + 1
+        try:
+            # Batches are taken and sent under the lock, so a canvas' events never reorder
+            async with lock:
+                batch = self._sse_pending.pop(canvas_id, None)
+                if batch and self.session and not self.session.closed:
+                    await self._post_sse(canvas_id, batch)
+                elif batch:
+                    logger.error(f"Dropping {len(batch)} SSE event(s) for {canvas_id}: transport closed")
+        finally:
+            users = self._sse_lock_users[canvas_id] - 1
+            if users:
+                self._sse_lock_users[canvas_id] = users
+            else:
+                # Nobody holds or waits on the lock, so the next flush can safely start a new one
+                del self._sse_lock_users[canvas_id]
+                del self._sse_locks[canvas_id]
+    
+    async def _post_sse(self, canvas_id: str, batch: List[Tuple[Optional[str], bytes]]) -> None:
+        headers = self._get_headers()
+        
+        if len(batch) > 1 and self._sse_batch_supported:
+            url = urljoin(self.realtime_endpoint, f"/sse/canvas/{canvas_id}/batch")
+            items = b",".join(
+                b'{"thread_id":' + event_codec.dumps(thread_id) + b',"event":' + encoded + b"}"
+                for thread_id, encoded in batch
+            )
+            body = b'{"canvas_id":' + event_codec.dumps(canvas_id) + b',"events":[' + items + b"]}"
+            try:
+                async with self.session.post(url, data=body, headers=headers) as resp:
+                    if resp.status == 200:
+                        self.sse_posts += 1
+                        self.sse_events += len(batch)
+                        return
+                    if resp.status in _NO_BATCH_ENDPOINT:
+                        logger.info("Realtime server has no SSE batch endpoint; sending events individually")
+                        self._sse_batch_supported = False
+                    else:
+                        error_text = await resp.text()
+                        logger.error(
+                            f"Failed to emit SSE batch of {len(batch)} events: {resp.status} - {error_text}"
+                        )
+                        return
+            except Exception as e:
+                logger.error(f"Error emitting SSE batch: {e}")
+                return
+        
         url = urljoin(
             self.realtime_endpoint,
             f"/sse/canvas/{canvas_id}"
         )
         
-        headers = self._get_headers()
-        
-        payload = {
-            "canvas_id": canvas_id,
-            "thread_id": thread_id,
-            "event": event_data,
-        }
-        
-        try:
-            async with self.session.post(url, json=payload, headers=headers) as resp:
-                if resp.status != 200:
-                    error_text = await resp.text()
-                    logger.error(
-                        f"Failed to emit SSE event: {resp.status} - {error_text}"
-                    )
-        except Exception as e:
-            logger.error(f"Error emitting SSE event: {e}")
+        for thread_id, encoded in batch:
+            body = b"".join((
+                b'{"canvas_id":', event_codec.dumps(canvas_id),
+                b',"thread_id":', event_codec.dumps(thread_id),
+                b',"event":', encoded, b"}",
+            ))
+            try:
+                async with self.session.post(url, data=body, headers=headers) as resp:
+                    if resp.status != 200:
+                        error_text = await resp.text()
+                        logger.error(
+                            f"Failed to emit SSE event: {resp.status} - {error_text}"
+                        )
+                    else:
+                        self.sse_posts += 1
+                        self.sse_events += 1
+            except Exception as e:
+                logger.error(f"Error emitting SSE event: {e}")
     
     async def subscribe_sse(
         self,
         canvas_id: str,
         callback: Callable[[Dict[str, Any]], None],
+        last_event_id: Optional[str] = None,
+        max_reconnects: Optional[int] = None,
     ) -> None:
         """Subscribe to SSE events for a canvas (listen for state changes).
         
         This keeps a persistent connection open to receive canvas state updates.
+        Dropped connections are resumed from the last event id with bounded
+        backoff (see ResumableSSE), so a server restart does not replay the stream.
         
         Args:
             canvas_id: Canvas ID to watch
             callback: Async callback function for events
+            last_event_id: Resume after this event instead of from the start
+            max_reconnects: Give up after this many reconnects (default: never)
         """
         if not self.session:
             raise RuntimeError("Transport not connected. Call connect() first.")
@@ -139,24 +302,24 @@ class AgentCanvasTransport:
             f"/sse/subscribe/{canvas_id}"
         )
         
-        headers = self._get_headers()
-        
-        try:
-            async with self.session.get(url, headers=headers) as resp:
+        async def open_stream(sse_headers: Dict[str, str]):
+            headers = {**self._get_headers(), **sse_headers}
+            timeout = aiohttp.ClientTimeout(total=None, sock_connect=30)
+            async with self.session.get(url, headers=headers, timeout=timeout) as resp:
                 if resp.status != 200:
-                    logger.error(f"Failed to subscribe to SSE: {resp.status}")
-                    return
-                
-                async for line in resp.content:
-                    if line.startswith(b"data: "):
-                        event_json = line[6:].decode("utf-8")
-                        try:
-                            event_data = json.loads(event_json)
-                            await callback(event_data)
-                        except json.JSONDecodeError:
-                            logger.warning(f"Invalid SSE data: {event_json}")
-        except Exception as e:
-            logger.error(f"Error subscribing to SSE: {e}")
+                    raise SSEStatusError(resp.status)
+                async for chunk in resp.content.iter_any():
+                    yield chunk
+        
+        stream = ResumableSSE(open_stream, last_event_id=last_event_id, max_reconnects=max_reconnects)
+        async with aclosing(stream.events()) as events:
+            async for event in events:
+                try:
+                    event_data = json.loads(event.data)
+                except json.JSONDecodeError:
+                    logger.warning(f"Invalid SSE data: {event.data}")
+                    continue
+                await callback(event_data)
     
     # ========================================
     # WS METHODS (Chat Rail - Fast Like WhatsApp)
@@ -166,15 +329,20 @@ class AgentCanvasTransport:
         self,
         thread_id: str,
         message_data: Dict[str, Any],
+        encoded: Optional[bytes] = None,
     ) -> None:
         """Emit WebSocket message for chat rail (fast ephemeral).
         
         This sends a message to the chat rail via WebSocket for agent-user
         communication. WS is used because chat needs low latency (like WhatsApp).
         
+        Sockets are pooled per thread (see WebSocketPool): a failed send is
+        buffered and replayed after a background reconnect instead of lost.
+        
         Args:
             thread_id: Thread/conversation ID
             message_data: Message payload (usually EventV2 with type='chat_message')
+            encoded: `message_data` already encoded as JSON (sent as-is)
         """
         url = urljoin(
             self.realtime_endpoint,
@@ -189,21 +357,18 @@ class AgentCanvasTransport:
             if not self.session:
                 raise RuntimeError("Transport not connected. Call connect() first.")
             
-            # Get or create WS connection
-            if thread_id not in self.ws_connections:
-                ws = await self.session.ws_connect(ws_url)
-                self.ws_connections[thread_id] = ws
-            else:
-                ws = self.ws_connections[thread_id]
-            
-            # Send message
-            await ws.send_json(message_data)
+            # Send message (on the pooled connection for this thread)
+            if encoded is None:
+                encoded = event_codec.dumps(message_data)
+            await self.ws_pool.send(thread_id, ws_url, encoded.decode("utf-8"))
         
         except Exception as e:
             logger.error(f"Error emitting WS message: {e}")
-            # Remove broken connection
-            if thread_id in self.ws_connections:
-                del self.ws_connections[thread_id]
+    
+    async def _open_ws(self, ws_url: str) -> Any:
+        if not self.session:
+            raise RuntimeError("Transport not connected. Call connect() first.")
+        return await self.session.ws_connect(ws_url, heartbeat=self.ws_heartbeat)
     
     async def subscribe_ws_messages(
         self,
@@ -224,13 +389,15 @@ class AgentCanvasTransport:
         )
         
         ws_url = url.replace("http://", "ws://").replace("https://", "wss://")
+        ws = None
         
         try:
             if not self.session:
                 raise RuntimeError("Transport not connected. Call connect() first.")
             
-            async with self.session.ws_connect(ws_url) as ws:
-                self.ws_connections[thread_id] = ws
+            async with self.session.ws_connect(ws_url, heartbeat=self.ws_heartbeat) as ws:
+                # Emits for this thread reuse the subscription's socket
+                await self.ws_pool.adopt(thread_id, ws_url, ws)
                 async for msg in ws:
                     if msg.type == aiohttp.WSMsgType.TEXT:
                         try:
@@ -246,8 +413,8 @@ class AgentCanvasTransport:
             logger.error(f"Error subscribing to WS messages: {e}")
         
         finally:
-            if thread_id in self.ws_connections:
-                del self.ws_connections[thread_id]
+            if ws is not None:
+                self.ws_pool.release(thread_id, ws)
     
     # ========================================
     # MEDIA STREAMING (Wide Bandwidth)
@@ -269,27 +436,32 @@ class AgentCanvasTransport:
         Returns:
             URI reference to media (s3://..., artifact://..., etc)
         """
-        if not self.session:
-            raise RuntimeError("Transport not connected. Call connect() first.")
+        return await self.upload_media_stream(media_bytes, mime_type, filename)
+    
+    async def upload_media_stream(
+        self,
+        source: MediaSource,
+        mime_type: str,
+        filename: Optional[str] = None,
+    ) -> str:
+        """Stream media to the realtime server in chunks and get its URI.
         
-        url = urljoin(self.realtime_endpoint, "/media/upload")
+        Prefer this for large media (video sidecars): the content is never
+        loaded whole, and identical content already uploaded returns the
+        cached URI without resending (see MediaUploader).
         
-        headers = self._get_headers()
+        Args:
+            source: File path, bytes, or async iterator of byte chunks
+            mime_type: MIME type (video/mp4, audio/wav, image/png, etc)
+            filename: Filename for storage (defaults to the path's basename)
         
-        data = aiohttp.FormData()
-        data.add_field("file", media_bytes, filename=filename, content_type=mime_type)
+        Returns:
+            URI reference to media, or "" if the upload failed
+        """
+        if not self.session:
+            raise RuntimeError("Transport not connected. Call connect() first.")
         
-        try:
-            async with self.session.post(url, data=data, headers=headers) as resp:
-                if resp.status == 200:
-                    result = await resp.json()
-                    return result.get("uri", "")
-                else:
-                    logger.error(f"Failed to upload media: {resp.status}")
-                    return ""
-        except Exception as e:
-            logger.error(f"Error uploading media: {e}")
-            return ""
+        return await self.media.upload(source, mime_type, filename)
     
     # ========================================
     # COMMAND POLLING (POST from Canvas)
@@ -300,7 +472,11 @@ class AgentCanvasTransport:
         agent_id: str,
         callback: Callable[[Dict[str, Any]], None],
     ) -> None:
-        """Poll for commands sent from canvas to this agent.
+        """Receive commands sent from canvas to this agent until cancelled.
+        
+        Every agent in the process shares one long-poll subscription
+        (`self.commands`), which backs off while idle instead of polling
+        every 100ms per agent.
         
         Args:
             agent_id: Agent ID
@@ -309,27 +485,16 @@ class AgentCanvasTransport:
         if not self.session:
             raise RuntimeError("Transport not connected. Call connect() first.")
         
-        url = urljoin(self.realtime_endpoint, f"/commands/poll/{agent_id}")
-        
-        headers = self._get_headers()
+        if self.commands is None:
+            self.commands = CommandSubscription(self)
+        self.commands.subscribe(agent_id, callback)
         
         try:
-            while True:
-                async with self.session.get(url, headers=headers) as resp:
-                    if resp.status == 200:
-                        commands = await resp.json()
-                        for cmd in commands:
-                            await callback(cmd)
-                    else:
-                        logger.warning(f"Command poll failed: {resp.status}")
-                
-                # Poll every 100ms
-                await asyncio.sleep(0.1)
-        
+            await asyncio.Event().wait()
         except asyncio.CancelledError:
             pass
-        except Exception as e:
-            logger.error(f"Error polling commands: {e}")
+        finally:
+            self.commands.unsubscribe(agent_id, callback)
     
     # ========================================
     # UTILITIES
@@ -0,0 +1,214 @@
+"""Shared canvas→agent command subscription.
+
+One long-poll loop per transport delivers commands for every agent in the
+process, instead of one 100ms polling loop per agent:
+
+- Multiplexed: GET /commands/poll?agent_ids=a,b,c&wait=<s> returns
+  {agent_id: [command, ...]} (or a list of commands carrying `agent_id`).
+  The server holds the request until a command arrives or `wait` expires.
+- Fallback when the server has no multiplexed endpoint: GET
+  /commands/poll/{agent_id} for each agent (long-polling only when a single
+  agent is subscribed).
+- Whenever a poll comes back empty without the server having held it, the
+  loop backs off exponentially (min_interval → max_interval) and snaps back to
+  min_interval as soon as a command arrives or an agent subscribes.
+
+A request in flight is never cancelled when agents come and go, because the
+server may already have handed it commands. The next request uses the new
+agent set. Meanwhile, an agent that subscribes during a held poll long-polls
+on its own until the shared request covers it. Several callbacks may subscribe
+to the same agent id; each unsubscribes only itself.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+from urllib.parse import urljoin
+
+import aiohttp
+
+logger = logging.getLogger("CanvasTransportBridge")
+
+_NO_MULTIPLEX_ENDPOINT = {404, 405, 501}
+
+
+class IdleBackoff:
+    """Exponential delay between idle polls."""
+
+    def __init__(self, min_interval: float = 0.1, max_interval: float = 5.0, factor: float = 2.0):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.factor = factor
+        self.current = min_interval
+
+    def next(self) -> float:
+        delay = self.current
+        self.current = min(self.max_interval, self.current * self.factor)
+        return delay
+
+    def reset(self) -> None:
+        self.current = self.min_interval
+
+
+class CommandSubscription:
+    """Delivers commands for many agent ids over one polling loop."""
+
+    def __init__(
+        self,
+        transport: Any,
+        wait: float = 25.0,
+        min_interval: float = 0.1,
+        max_interval: float = 5.0,
+    ):
+        self.transport = transport
+        self.wait = wait
+        self.backoff = IdleBackoff(min_interval, max_interval)
+        self.callbacks: Dict[str, List[Callable[[Dict[str, Any]], Any]]] = {}
+        self.multiplexed = True
+        self.requests = 0
+        self.delivered = 0
+        self._task: Optional[asyncio.Task] = None
+        self._polling: Optional[Set[str]] = None  # agent ids of the request in flight
+        self._catch_ups: Set[asyncio.Task] = set()
+        self._wake: Optional[asyncio.Event] = None
+
+    # ---------------- subscribers ----------------
+
+    def subscribe(self, agent_id: str, callback: Callable[[Dict[str, Any]], Any]) -> None:
+        callbacks = self.callbacks.setdefault(agent_id, [])
+        callbacks.append(callback)
+        self.backoff.reset()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        elif self._polling is not None and agent_id not in self._polling and len(callbacks) == 1:
+            task = asyncio.create_task(self._catch_up(agent_id))
+            self._catch_ups.add(task)
+            task.add_done_callback(self._catch_ups.discard)
+        if self._wake is not None:
+            self._wake.set()
+
+    def unsubscribe(self, agent_id: str, callback: Callable[[Dict[str, Any]], Any]) -> None:
+        """Removes `callback` only; other subscribers of the same agent keep receiving."""
+        callbacks = self.callbacks.get(agent_id, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if not callbacks:
+            self.callbacks.pop(agent_id, None)
+        if not self.callbacks:
+            self.stop()
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for task in list(self._catch_ups):
+            task.cancel()
+
+    # ---------------- loop ----------------
+
+    async def _run(self) -> None:
+        self._wake = asyncio.Event()
+        while self.callbacks:
+            self._wake.clear()
+            started = time.monotonic()
+            agent_ids = list(self.callbacks)
+            self._polling = set(agent_ids)
+            try:
+                commands = await self._fetch(agent_ids, self._wait_for_request())
+            except Exception as e:
+                logger.error(f"Error polling commands: {e}")
+                commands = {}
+            finally:
+                self._polling = None
+
+            if await self._deliver(commands):
+                self.backoff.reset()
+                continue
+            if self._held(started):
+                continue  # the server long-polled; ask again straight away
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.backoff.next())
+            except asyncio.TimeoutError:
+                pass
+
+    async def _catch_up(self, agent_id: str) -> None:
+        # Polls for an agent the held request does not cover until the next one does
+        while agent_id in self.callbacks and self._polling is not None and agent_id not in self._polling:
+            wait = self._wait_for_request()
+            try:
+                await self._deliver(await self._fetch([agent_id], wait))
+            except Exception as e:
+                logger.error(f"Error polling commands for {agent_id}: {e}")
+                return
+            if not wait:
+                return
+
+    def _held(self, started: float) -> bool:
+        wait = self._wait_for_request()
+        return wait > 0 and time.monotonic() - started >= wait / 2
+
+    def _wait_for_request(self) -> float:
+        if self.multiplexed or len(self.callbacks) == 1:
+            return self.wait
+        return 0.0
+
+    async def _fetch(self, agent_ids: List[str], wait: float) -> Dict[str, List[Dict[str, Any]]]:
+        if self.multiplexed:
+            commands = await self._poll_multiplexed(agent_ids, wait)
+            if commands is not None:
+                return commands
+            wait = self._wait_for_request() and wait
+        fetched: Dict[str, List[Dict[str, Any]]] = {}
+        for agent_id in agent_ids:
+            commands = await self._get(f"/commands/poll/{agent_id}", {"wait": wait} if wait else {})
+            if commands:
+                fetched[agent_id] = commands
+        return fetched
+
+    async def _poll_multiplexed(self, agent_ids: List[str], wait: float) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        params = {"agent_ids": ",".join(agent_ids), "wait": wait}
+        result = await self._get("/commands/poll", params, probe=True)
+        if result is None:
+            return None
+        if isinstance(result, dict):
+            return result
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for cmd in result:
+            grouped.setdefault(cmd.get("agent_id"), []).append(cmd)
+        return grouped
+
+    async def _get(self, path: str, params: Dict[str, Any], probe: bool = False) -> Any:
+        session = self.transport.session
+        if not session:
+            raise RuntimeError("Transport not connected. Call connect() first.")
+        url = urljoin(self.transport.realtime_endpoint, path)
+        timeout = aiohttp.ClientTimeout(total=params.get("wait", 0) + 10)
+        self.requests += 1
+        async with session.get(url, params=params, headers=self.transport._get_headers(), timeout=timeout) as resp:
+            if resp.status == 200:
+                return await resp.json()
+            if probe and resp.status in _NO_MULTIPLEX_ENDPOINT:
+                logger.info("Realtime server has no multiplexed command endpoint; polling per agent")
+                self.multiplexed = False
+                return None
+            logger.warning(f"Command poll failed: {resp.status}")
+            return [] if not probe else {}
+
+    async def _deliver(self, commands: Dict[str, List[Dict[str, Any]]]) -> int:
+        delivered = 0
+        for agent_id, cmds in commands.items():
+            callbacks = list(self.callbacks.get(agent_id, []))
+            if not callbacks:
+                if cmds:
+                    logger.warning(f"Dropping {len(cmds)} command(s) for {agent_id}: no subscriber")
+                continue
+            for cmd in cmds or []:
+                for callback in callbacks:
+                    try:
+                        await callback(cmd)
+                    except Exception as e:
+                        logger.error(f"Command callback for {agent_id} failed: {e}")
+                delivered += 1
+        self.delivered += delivered
+        return delivered
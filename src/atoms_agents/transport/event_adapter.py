@@ -0,0 +1,24 @@
+"""Adapter exposing the canvas transport through EventV2Logger's transport interface."""
+from typing import Any, Dict, Optional
+
+
+class TransportAdapter:
+    """Adapter to match EventV2Logger transport interface."""
+
+    # EventV2Logger passes the pre-encoded envelope along with the dict
+    accepts_encoded = True
+
+    def __init__(self, transport: Any) -> None:
+        self._transport = transport
+
+    async def emit_sse(
+        self, canvas_id: Optional[str], event_data: Dict[str, Any], encoded: Optional[bytes] = None
+    ) -> None:
+        if canvas_id:
+            await self._transport.emit_sse_event(canvas_id=canvas_id, event_data=event_data, encoded_event=encoded)
+
+    async def emit_ws(
+        self, thread_id: Optional[str], event_data: Dict[str, Any], encoded: Optional[bytes] = None
+    ) -> None:
+        if thread_id:
+            await self._transport.emit_ws_message(thread_id=thread_id, message_data=event_data, encoded=encoded)
@@ -0,0 +1,326 @@
+"""Streaming media uploads for MediaSidecars.
+
+Media is read and sent in `chunk_size` pieces, never held in memory whole,
+and hashed (sha256) as it goes:
+
+- Chunked: POST /media/uploads opens an upload, each chunk is PUT to
+  /media/uploads/{upload_id} with a Content-Range, and POST
+  /media/uploads/{upload_id}/complete (with the sha256) returns the URI. A
+  failed chunk is retried after asking the server (GET /media/uploads/{id})
+  how much it already has, so only the missing bytes are resent.
+- Fallback when the server has no chunked endpoint: one streamed multipart
+  POST to /media/upload, as before.
+
+Paths and bytes are hashed before sending, and the open request carries the
+sha256: a server that already has the content answers with its URI and
+nothing else is sent. Uploaded hashes are also remembered in a local index
+(NORTHSTAR_MEDIA_INDEX, default .northstar/state/media_uploads.json), per
+realtime server and API key. The index is only a hint sent with the open
+request; the server's answer is what gets returned, so a URI the server no
+longer knows is uploaded again. Servers without the chunked endpoint have
+nothing to confirm against, so there a cached URI is returned as is. Async
+iterators can only be hashed while they are sent; they populate the index for
+next time once the whole stream has been hashed.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Optional, Tuple, Union
+from urllib.parse import urljoin
+
+import aiohttp
+
+logger = logging.getLogger("CanvasTransportBridge")
+
+MediaSource = Union[str, "os.PathLike[str]", bytes, AsyncIterable[bytes]]
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+_NO_CHUNKED_ENDPOINT = {404, 405, 501}
+
+
+def default_index_path() -> Path:
+    env = os.getenv("NORTHSTAR_MEDIA_INDEX")
+    if env:
+        return Path(env)
+    from atoms_agents.core.paths import get_state_dir
+    return get_state_dir() / "media_uploads.json"
+
+
+def _hash_file(path: str, chunk_size: int) -> Tuple[str, int]:
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def credential_fingerprint(api_key: Optional[str]) -> str:
+    """Short, non-reversible id of the credential uploads were made with."""
+    if not api_key:
+        return "anonymous"
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+class _StreamDigest:
+    """sha256 of a stream being sent, and whether it has reached the stream's end."""
+
+    def __init__(self):
+        self._hash = hashlib.sha256()
+        self.complete = False
+
+    def update(self, data: bytes) -> None:
+        self._hash.update(data)
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+class MediaUploadIndex:
+    """sha256 -> uploaded URI, per realtime endpoint and credential, persisted as JSON."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self._path = Path(path) if path else None
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self._path or default_index_path()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            try:
+                with open(self.path, "r") as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                self._entries = {}
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable media upload index {self.path}: {e}")
+                self._entries = {}
+        return self._entries
+
+    def get(self, endpoint: str, credential: str, sha256: str) -> Optional[str]:
+        with self._lock:
+            entry = self._load().get(f"{endpoint}|{credential}|{sha256}")
+        return entry["uri"] if entry else None
+
+    def put(self, endpoint: str, credential: str, sha256: str, uri: str, size: int, mime_type: str) -> None:
+        with self._lock:
+            entries = self._load()
+            entries[f"{endpoint}|{credential}|{sha256}"] = {"uri": uri, "size": size, "mime_type": mime_type}
+            self._save(entries)
+
+    def _save(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        # Atomic replace so a crash never leaves a truncated index
+        try:
+            target = self.path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".media_uploads_", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(entries, f)
+                os.replace(tmp, target)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except Exception as e:
+            logger.warning(f"Could not persist media upload index: {e}")
+
+
+class MediaUploader:
+    def __init__(
+        self,
+        transport: Any,
+        index: Optional[MediaUploadIndex] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_retries: int = 3,
+    ):
+        self.transport = transport
+        self.index = index or MediaUploadIndex()
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.chunked = True
+        self.dedup_hits = 0
+        self.bytes_sent = 0
+
+    async def upload(self, source: MediaSource, mime_type: str, filename: Optional[str] = None) -> str:
+        """Uploads `source` and returns its URI ("" on failure)."""
+        endpoint = self.transport.realtime_endpoint
+        credential = credential_fingerprint(getattr(self.transport, "api_key", None))
+        sha256: Optional[str] = None
+        size: Optional[int] = None
+        if isinstance(source, bytes):
+            sha256, size = hashlib.sha256(source).hexdigest(), len(source)
+        elif isinstance(source, (str, os.PathLike)):
+            filename = filename or os.path.basename(os.fspath(source))
+            sha256, size = await asyncio.to_thread(_hash_file, os.fspath(source), self.chunk_size)
+
+        # The index is file-backed; keep its reads and writes off the event loop
+        hint = None
+        if sha256 is not None:
+            hint = await asyncio.to_thread(self.index.get, endpoint, credential, sha256)
+            if hint and not self.chunked:
+                # No open request to confirm it with; the index is all there is
+                self.dedup_hits += 1
+                return hint
+
+        # Content hashed up front isn't hashed again while sending
+        digest = _StreamDigest() if sha256 is None else None
+        filename = filename or "upload"
+        try:
+            uri = None
+            if self.chunked:
+                uri = await self._upload_chunked(source, digest, mime_type, filename, size, sha256, hint)
+            if uri is None:
+                uri = await self._upload_multipart(source, digest, mime_type, filename)
+        except Exception as e:
+            logger.error(f"Error uploading media: {e}")
+            return ""
+
+        if sha256 is None and digest.complete:
+            sha256 = digest.hexdigest()
+        # A stream the server accepted before it was fully read has no usable hash
+        if uri and sha256 is not None:
+            await asyncio.to_thread(self.index.put, endpoint, credential, sha256, uri, size or 0, mime_type)
+        return uri
+
+    # ---------------- sources ----------------
+
+    async def _chunks(self, source: MediaSource, digest: Optional[_StreamDigest]) -> AsyncIterator[bytes]:
+        if isinstance(source, bytes):
+            view = memoryview(source)
+            for start in range(0, len(source), self.chunk_size):
+                chunk = bytes(view[start:start + self.chunk_size])
+                if digest is not None:
+                    digest.update(chunk)
+                yield chunk
+        elif isinstance(source, (str, os.PathLike)):
+            with open(os.fspath(source), "rb") as f:
+                while chunk := await asyncio.to_thread(f.read, self.chunk_size):
+                    if digest is not None:
+                        digest.update(chunk)
+                    yield chunk
+        else:
+            # Re-chunk to chunk_size so PUTs are neither tiny nor unbounded
+            buffer = bytearray()
+            async for piece in source:
+                if digest is not None:
+                    digest.update(piece)
+                buffer += piece
+                while len(buffer) >= self.chunk_size:
+                    yield bytes(buffer[:self.chunk_size])
+                    del buffer[:self.chunk_size]
+            if buffer:
+                yield bytes(buffer)
+        if digest is not None:
+            digest.complete = True
+
+    # ---------------- chunked protocol ----------------
+
+    def _url(self, path: str) -> str:
+        return urljoin(self.transport.realtime_endpoint, path)
+
+    def _headers(self, **extra: str) -> Dict[str, str]:
+        headers = self.transport._get_headers()
+        headers.pop("Content-Type", None)
+        headers.update(extra)
+        return headers
+
+    async def _upload_chunked(
+        self,
+        source: MediaSource,
+        digest: Optional[_StreamDigest],
+        mime_type: str,
+        filename: str,
+        size: Optional[int],
+        sha256: Optional[str],
+        hint: Optional[str] = None,
+    ) -> Optional[str]:
+        session = self.transport.session
+        meta = {"filename": filename, "mime_type": mime_type, "size": size, "sha256": sha256, "uri": hint}
+        async with session.post(self._url("/media/uploads"), json=meta, headers=self.transport._get_headers()) as resp:
+            if resp.status in _NO_CHUNKED_ENDPOINT:
+                logger.info("Realtime server has no chunked upload endpoint; using multipart upload")
+                self.chunked = False
+                return None
+            if resp.status not in (200, 201):
+                raise RuntimeError(f"opening upload failed: {resp.status}")
+            opened = await resp.json()
+        if opened.get("uri"):
+            self.dedup_hits += 1
+            return opened["uri"]  # the server already has this content
+        upload_id = opened["upload_id"]
+
+        total = "*" if size is None else str(size)
+        offset = 0
+        async for chunk in self._chunks(source, digest):
+            await self._put_chunk(upload_id, chunk, offset, total)
+            offset += len(chunk)
+
+        done = {"sha256": sha256 or digest.hexdigest(), "size": offset}
+        url = self._url(f"/media/uploads/{upload_id}/complete")
+        async with session.post(url, json=done, headers=self.transport._get_headers()) as resp:
+            if resp.status not in (200, 201):
+                raise RuntimeError(f"completing upload failed: {resp.status}")
+            return (await resp.json()).get("uri", "")
+
+    async def _put_chunk(self, upload_id: str, chunk: bytes, offset: int, total: str) -> None:
+        session = self.transport.session
+        url = self._url(f"/media/uploads/{upload_id}")
+        start = offset
+        for attempt in range(self.max_retries + 1):
+            part = chunk[start - offset:]
+            end = start + len(part) - 1
+            headers = self._headers(**{
+                "Content-Type": "application/octet-stream",
+                "Content-Range": f"bytes {start}-{end}/{total}",
+            })
+            try:
+                async with session.put(url, data=part, headers=headers) as resp:
+                    if resp.status in (200, 201, 204, 308):
+                        self.bytes_sent += len(part)
+                        return
+                    error = f"status {resp.status}"
+            except aiohttp.ClientError as e:
+                error = str(e)
+            if attempt == self.max_retries:
+                raise RuntimeError(f"chunk at {offset} failed after {self.max_retries} retries: {error}")
+            await asyncio.sleep(min(5.0, 0.2 * 2 ** attempt))
+            # Resume from what the server actually received
+            received = await self._server_offset(upload_id)
+            if received is not None:
+                start = min(max(received, offset), offset + len(chunk))
+                if start == offset + len(chunk):
+                    return
+
+    async def _server_offset(self, upload_id: str) -> Optional[int]:
+        url = self._url(f"/media/uploads/{upload_id}")
+        try:
+            async with self.transport.session.get(url, headers=self.transport._get_headers()) as resp:
+                if resp.status == 200:
+                    return int((await resp.json()).get("offset", 0))
+        except Exception as e:
+            logger.debug("Upload offset query failed: %s", e)
+        return None
+
+    # ---------------- multipart fallback ----------------
+
+    async def _upload_multipart(
+        self, source: MediaSource, digest: Optional[_StreamDigest], mime_type: str, filename: str
+    ) -> str:
+        with aiohttp.MultipartWriter("form-data") as form:
+            part = form.append(self._chunks(source, digest), {"Content-Type": mime_type})
+            part.set_content_disposition("form-data", name="file", filename=filename)
+        async with self.transport.session.post(self._url("/media/upload"), data=form, headers=self._headers()) as resp:
+            if resp.status == 200:
+                return (await resp.json()).get("uri", "")
+            logger.error(f"Failed to upload media: {resp.status}")
+            return ""
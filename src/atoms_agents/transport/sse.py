@@ -0,0 +1,166 @@
+"""Incremental text/event-stream parsing and resumable SSE subscriptions.
+
+`SSEParser` follows the WHATWG event-stream format: CRLF/CR/LF line endings,
+multi-line `data:`, `event:`, `id:` and `retry:` fields, and `:` comments.
+Chunks can be cut anywhere, including mid-line or mid-character.
+
+`ResumableSSE` reconnects whenever the stream ends or fails. It sends
+`Last-Event-ID` so the server resumes after the last event instead of
+replaying everything, and waits between attempts with a bounded, jittered
+exponential backoff. The server's `retry:` value replaces the base delay.
+It is client-agnostic: callers supply `open_stream(headers)`, an async
+iterator of raw chunks (aiohttp for the transport, httpx for CanvasMirror).
+"""
+
+import asyncio
+import codecs
+import json
+import logging
+import random
+import re
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger("CanvasTransportBridge")
+
+_EOL = re.compile(r"\r\n|\r|\n")
+
+
+@dataclass
+class SSEEvent:
+    data: str
+    event: str = "message"
+    id: Optional[str] = None  # last event id in effect when dispatched
+
+    def json(self) -> Any:
+        return json.loads(self.data)
+
+
+class SSEParser:
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._buf = ""
+        self._data: List[str] = []
+        self._event = ""
+        self._id_buffer: Optional[str] = None
+        self.last_event_id: Optional[str] = None
+        self.retry: Optional[int] = None  # reconnection time (ms) requested by the server
+        self.comments = 0
+
+    def feed(self, chunk: Union[bytes, str]) -> List[SSEEvent]:
+        """Consumes a chunk and returns the events it completed."""
+        text = self._decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        buf = self._buf + text
+        events: List[SSEEvent] = []
+        start = 0
+        for match in _EOL.finditer(buf):
+            if match.group() == "\r" and match.end() == len(buf):
+                break  # could be the first half of a CRLF split across chunks
+            self._line(buf[start:match.start()], events)
+            start = match.end()
+        self._buf = buf[start:]
+        return events
+
+    def _line(self, line: str, events: List[SSEEvent]) -> None:
+        if not line:
+            self._dispatch(events)
+            return
+        if line.startswith(":"):
+            self.comments += 1
+            return
+        name, sep, value = line.partition(":")
+        if sep and value.startswith(" "):
+            value = value[1:]
+        if name == "data":
+            self._data.append(value)
+        elif name == "event":
+            self._event = value
+        elif name == "id":
+            if "\0" not in value:
+                self._id_buffer = value or None
+        elif name == "retry":
+            if value.isdigit():
+                self.retry = int(value)
+
+    def _dispatch(self, events: List[SSEEvent]) -> None:
+        self.last_event_id = self._id_buffer
+        if self._data:
+            events.append(SSEEvent("\n".join(self._data), self._event or "message", self.last_event_id))
+        self._data = []
+        self._event = ""
+
+
+class SSEStatusError(Exception):
+    def __init__(self, status: int):
+        super().__init__(f"SSE endpoint returned {status}")
+        self.status = status
+
+    @property
+    def retryable(self) -> bool:
+        return self.status >= 500 or self.status == 429
+
+
+class ResumableSSE:
+    def __init__(
+        self,
+        open_stream: Callable[[Dict[str, str]], AsyncIterator[Union[bytes, str]]],
+        *,
+        last_event_id: Optional[str] = None,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        max_reconnects: Optional[int] = None,
+        rng: Optional[random.Random] = None,
+    ):
+        self.open_stream = open_stream
+        # Callers may also set this from payload ids when the server sends no `id:` lines
+        self.last_event_id = last_event_id
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_reconnects = max_reconnects
+        self.retry: Optional[int] = None
+        self.reconnects = 0
+        self.errors: List[str] = []
+        self._rng = rng or random.Random()
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {"Accept": "text/event-stream", "Cache-Control": "no-cache"}
+        if self.last_event_id:
+            headers["Last-Event-ID"] = self.last_event_id
+        return headers
+
+    async def events(self) -> AsyncIterator[SSEEvent]:
+        """Yields events across reconnects; ends on a non-retryable status or after max_reconnects."""
+        failures = 0
+        while True:
+            parser = SSEParser()
+            try:
+                async for chunk in self.open_stream(self._headers()):
+                    for event in parser.feed(chunk):
+                        failures = 0
+                        if event.id:
+                            self.last_event_id = event.id
+                        yield event
+                    if parser.retry is not None:
+                        self.retry = parser.retry
+            except asyncio.CancelledError:
+                raise
+            except SSEStatusError as e:
+                self.errors.append(str(e))
+                if not e.retryable:
+                    logger.error(f"SSE subscription stopped: {e}")
+                    return
+                logger.warning(f"SSE stream error: {e}")
+            except Exception as e:
+                self.errors.append(str(e))
+                logger.warning(f"SSE stream error: {e}")
+
+            if self.max_reconnects is not None and self.reconnects >= self.max_reconnects:
+                return
+            failures += 1
+            self.reconnects += 1
+            await asyncio.sleep(self._delay(failures))
+
+    def _delay(self, failures: int) -> float:
+        base = self.retry / 1000 if self.retry is not None else self.backoff_base
+        delay = min(self.backoff_max, base * 2 ** (failures - 1))
+        return self._rng.uniform(delay / 2, delay)
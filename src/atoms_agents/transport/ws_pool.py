@@ -0,0 +1,222 @@
+"""Pooled chat-rail WebSocket connections.
+
+One socket per thread_id, shared by every emit for that thread:
+
+- Keepalive: sockets are opened with aiohttp's heartbeat, so dead peers are
+  detected by missed pongs instead of on the next send.
+- Every message goes through a small per-thread buffer and leaves it only once
+  sent. If a send fails, the socket is dropped and a background task reconnects
+  with jittered exponential backoff and replays the buffer in order. When the
+  buffer is full the oldest message is dropped (and counted).
+- Sockets idle for `idle_timeout` are closed, and opening a socket beyond
+  `max_sockets` closes the least recently used one first.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+logger = logging.getLogger("CanvasTransportBridge")
+
+
+@dataclass
+class _Conn:
+    url: str
+    buffer_size: int
+    ws: Any = None
+    last_used: float = field(default_factory=time.monotonic)
+    pending: Deque[str] = field(init=False)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    attempts: int = 0
+    reconnect_task: Optional[asyncio.Task] = None
+    external: bool = False  # opened by a subscriber, which owns its lifetime
+
+    def __post_init__(self):
+        self.pending = deque(maxlen=self.buffer_size)
+
+    @property
+    def is_open(self) -> bool:
+        return self.ws is not None and not self.ws.closed
+
+
+class WebSocketPool:
+    def __init__(
+        self,
+        connect: Callable[[str], Awaitable[Any]],
+        max_sockets: int = 64,
+        buffer_size: int = 64,
+        idle_timeout: float = 120.0,
+        backoff_base: float = 0.2,
+        backoff_max: float = 10.0,
+        max_attempts: int = 6,
+        rng: Optional[random.Random] = None,
+    ):
+        self._connect = connect
+        self.max_sockets = max(1, max_sockets)
+        self.buffer_size = max(1, buffer_size)
+        self.idle_timeout = idle_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_attempts = max_attempts
+        self._rng = rng or random.Random()
+        self.conns: "OrderedDict[str, _Conn]" = OrderedDict()  # least recently used first
+        self._janitor: Optional[asyncio.Task] = None
+        self.opened = 0
+        self.reconnects = 0
+        self.evicted = 0
+        self.dropped = 0
+        self.sent = 0
+
+    def connections(self) -> Dict[str, Any]:
+        """Open sockets by key."""
+        return {key: conn.ws for key, conn in self.conns.items() if conn.is_open}
+
+    # ---------------- sending ----------------
+
+    async def send(self, key: str, url: str, text: str) -> bool:
+        """Sends `text` on the socket for `key`. Returns False if it was buffered for replay instead."""
+        conn = self._conn(key, url)
+        if len(conn.pending) == self.buffer_size:
+            self.dropped += 1
+            logger.warning(f"WS send buffer full for {key}; dropping oldest message")
+        conn.pending.append(text)
+        self._start_janitor()
+
+        if conn.reconnect_task is not None and not conn.reconnect_task.done():
+            return False  # the reconnect loop will replay it in order
+        if await self._drain(key, conn):
+            return True
+        conn.reconnect_task = asyncio.create_task(self._reconnect(key, conn))
+        return False
+
+    def _conn(self, key: str, url: str) -> _Conn:
+        conn = self.conns.get(key)
+        if conn is None:
+            conn = self.conns[key] = _Conn(url, self.buffer_size)
+        conn.url = url
+        self.conns.move_to_end(key)
+        return conn
+
+    async def _drain(self, key: str, conn: _Conn) -> bool:
+        async with conn.lock:
+            try:
+                if not conn.is_open:
+                    await self._make_room(key)
+                    conn.ws = await self._connect(conn.url)
+                    conn.external = False
+                    self.opened += 1
+                while conn.pending:
+                    await conn.ws.send_str(conn.pending[0])
+                    conn.pending.popleft()
+                    self.sent += 1
+                conn.last_used = time.monotonic()
+                conn.attempts = 0
+                return True
+            except Exception as e:
+                logger.warning(f"WS send for {key} failed ({e}); {len(conn.pending)} message(s) buffered")
+                await self._close(conn)
+                return False
+
+    async def _reconnect(self, key: str, conn: _Conn) -> None:
+        while conn.pending and self.conns.get(key) is conn:
+            conn.attempts += 1
+            if conn.attempts > self.max_attempts:
+                # Give up for now; the buffer is replayed by the next send
+                logger.error(f"WS reconnect for {key} failed {self.max_attempts} times; keeping buffered messages")
+                conn.attempts = 0
+                return
+            delay = min(self.backoff_max, self.backoff_base * 2 ** (conn.attempts - 1))
+            await asyncio.sleep(self._rng.uniform(delay / 2, delay))
+            self.reconnects += 1
+            if await self._drain(key, conn):
+                return
+
+    # ---------------- eviction ----------------
+
+    async def _make_room(self, key: str) -> None:
+        await self.evict_idle()
+        open_keys = [k for k, c in self.conns.items() if k != key and c.is_open]
+        # Owned sockets go first; least recently used first within each group
+        open_keys.sort(key=lambda k: self.conns[k].external)
+        while len(open_keys) >= self.max_sockets:
+            victim = self.conns[open_keys.pop(0)]
+            await self._close(victim)
+            self.evicted += 1
+
+    async def evict_idle(self) -> None:
+        """Closes owned sockets unused for `idle_timeout` that have nothing left to send."""
+        cutoff = time.monotonic() - self.idle_timeout
+        for key, conn in list(self.conns.items()):
+            if conn.external or conn.pending or conn.lock.locked() or conn.last_used > cutoff:
+                continue
+            if conn.is_open:
+                self.evicted += 1
+            await self._close(conn)
+            del self.conns[key]
+
+    def _start_janitor(self) -> None:
+        if self._janitor is None or self._janitor.done():
+            self._janitor = asyncio.create_task(self._janitor_loop())
+
+    async def _janitor_loop(self) -> None:
+        while self.conns:
+            await asyncio.sleep(max(0.05, self.idle_timeout / 2))
+            await self.evict_idle()
+
+    async def _close(self, conn: _Conn) -> None:
+        ws, conn.ws = conn.ws, None
+        if ws is None or conn.external:
+            conn.external = False
+            return
+        try:
+            await ws.close()
+        except Exception:
+            pass
+
+    # ---------------- subscriber sockets ----------------
+
+    async def adopt(self, key: str, url: str, ws: Any) -> None:
+        """Lets sends for `key` reuse a socket a subscriber opened (and will close).
+
+        A socket the pool opened for `key` is closed first rather than leaked, and
+        adopted sockets count toward `max_sockets` like any other.
+        """
+        conn = self._conn(key, url)
+        async with conn.lock:
+            if conn.ws is not ws:
+                await self._close(conn)
+                await self._make_room(key)
+            conn.ws = ws
+            conn.external = True
+            conn.last_used = time.monotonic()
+
+    def release(self, key: str, ws: Any) -> None:
+        conn = self.conns.get(key)
+        if conn is not None and conn.ws is ws:
+            conn.ws = None
+            conn.external = False
+
+    async def close(self) -> None:
+        if self._janitor is not None:
+            self._janitor.cancel()
+            self._janitor = None
+        for conn in self.conns.values():
+            if conn.reconnect_task is not None:
+                conn.reconnect_task.cancel()
+            await self._close(conn)
+        self.conns.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "open": sum(1 for c in self.conns.values() if c.is_open),
+            "buffered": sum(len(c.pending) for c in self.conns.values()),
+            "opened": self.opened,
+            "reconnects": self.reconnects,
+            "evicted": self.evicted,
+            "dropped": self.dropped,
+            "sent": self.sent,
+        }
@@ -19,7 +19,8 @@ def get_registry() -> RegistryContext:
     repo_root = os.path.abspath(os.path.join(current_dir, "../../../.."))
     registry_path = os.path.join(repo_root, "registry/cards")
     loader = RegistryLoader(root_path=registry_path)
-    return loader.load_context()
+    # Chat and the index only touch a handful of card families
+    return loader.load_context(lazy=True)
 
 @app.get("/registry/index")
 def get_registry_index():
@@ -0,0 +1,55 @@
+from atoms_agents.runtime.canvas_mirror import CanvasMirror, IndexedRingBuffer
+from atoms_agents.runtime.canvas_stream_hub import CanvasStreamHub
+from atoms_agents.runtime.context import AgentsRequestContext, ContextMode
+
+
+def _mirror(capacity):
+    ctx = AgentsRequestContext(tenant_id="t", mode=ContextMode.SAAS, project_id="p", request_id="r")
+    return CanvasMirror("http://rt", ctx, "c1", capacity=capacity, hub=CanvasStreamHub())
+
+
+def _ready(n, tools):
+    return {"event_id": f"r{n}", "event": "CANVAS_READY", "data": {"tool_manifest": tools}}
+
+
+def test_ring_buffer_evicts_oldest_and_keeps_type_indexes_in_step():
+    buf = IndexedRingBuffer(3)
+    for i in range(5):
+        buf.append({"event": "patch" if i % 2 else "node", "n": i})
+    assert [e["n"] for e in buf.view()] == [2, 3, 4]
+    assert [e["n"] for e in buf.of_type("node")] == [2, 4]
+    assert [e["n"] for e in buf.of_type("patch")] == [3]
+    assert buf.latest("node")["n"] == 4 and buf.latest("missing") is None
+
+
+def test_untyped_events_and_data_type_fallback():
+    buf = IndexedRingBuffer(2)
+    assert buf.append({"data": {"type": "CANVAS_READY"}}) == "CANVAS_READY"
+    assert buf.append({"data": "raw"}) is None
+    buf.append({"event": "x"})
+    assert buf.of_type("CANVAS_READY") == () and len(buf) == 2
+
+
+def test_get_tools_tracks_latest_manifest_incrementally():
+    mirror = _mirror(capacity=2)
+    assert mirror.get_tools() == []
+    mirror._append(_ready(1, [{"name": "old"}]))
+    mirror._append(_ready(2, [{"name": "draw"}, {"name": "erase"}]))
+    assert [t["name"] for t in mirror.get_tools()] == ["draw", "erase"]
+
+    # Evicting the CANVAS_READY event keeps its manifest
+    mirror._append({"event": "patch", "event_id": "p1"})
+    mirror._append({"event": "patch", "event_id": "p2"})
+    assert mirror.events_of_type("CANVAS_READY") == ()
+    assert [t["name"] for t in mirror.get_tools()] == ["draw", "erase"]
+    assert mirror.get_tools() is mirror.get_tools()
+
+
+def test_snapshot_is_reused_until_next_event():
+    mirror = _mirror(capacity=10)
+    mirror._append({"event": "patch", "event_id": "p1"})
+    first = mirror.snapshot()
+    assert mirror.snapshot() is first and isinstance(first, tuple)
+    mirror._append({"event": "patch", "event_id": "p2"})
+    assert len(mirror.snapshot()) == 2 and len(first) == 1
+    assert mirror.last_event_id == "p2"
@@ -0,0 +1,129 @@
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+from atoms_agents.transport.canvas_transport_bridge import AgentCanvasTransport
+
+
+class _Resp:
+    def __init__(self, status):
+        self.status = status
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def text(self):
+        return ""
+
+
+def _transport(batch_status=200, **kwargs):
+    transport = AgentCanvasTransport(realtime_endpoint="http://rt", **kwargs)
+    posts = []
+
+    def post(url, data, headers):
+        posts.append((url, json.loads(data)))
+        return _Resp(batch_status if url.endswith("/batch") else 200)
+
+    transport.session = MagicMock(closed=False)
+    transport.session.post = MagicMock(side_effect=post)
+    return transport, posts
+
+
+def test_events_within_window_coalesce_into_one_post():
+    transport, posts = _transport(sse_batch_window=0.01)
+
+    async def main():
+        for i in range(5):
+            await transport.emit_sse_event("c1", {"seq": i})
+        await transport.emit_sse_event("c2", {"seq": 0}, thread_id="t1")
+        assert posts == []
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+    by_url = dict(posts)
+    assert len(posts) == 2
+    assert [e["event"]["seq"] for e in by_url["http://rt/sse/canvas/c1/batch"]["events"]] == [0, 1, 2, 3, 4]
+    # A lone event goes to the single-event endpoint
+    assert by_url["http://rt/sse/canvas/c2"] == {"canvas_id": "c2", "thread_id": "t1", "event": {"seq": 0}}
+    assert transport.sse_posts == 2 and transport.sse_events == 6
+
+
+def test_batch_max_flushes_immediately_in_order():
+    transport, posts = _transport(sse_batch_window=10, sse_batch_max=3)
+
+    async def main():
+        for i in range(7):
+            await transport.emit_sse_event("c1", {"seq": i})
+        assert len(posts) == 2
+        await transport.flush_sse()
+
+    asyncio.run(main())
+    seqs = [e["event"]["seq"] for _, body in posts for e in body.get("events", [body])]
+    assert seqs == list(range(7))
+
+
+def test_falls_back_to_single_sends_without_batch_endpoint():
+    transport, posts = _transport(batch_status=404, sse_batch_window=10)
+
+    async def main():
+        for i in range(3):
+            await transport.emit_sse_event("c1", {"seq": i})
+        await transport.flush_sse()
+        for i in range(3, 5):
+            await transport.emit_sse_event("c1", {"seq": i})
+        await transport.flush_sse()
+
+    asyncio.run(main())
+    urls = [url for url, _ in posts]
+    assert urls.count("http://rt/sse/canvas/c1/batch") == 1  # probed once, then remembered
+    singles = [body["event"]["seq"] for url, body in posts if url == "http://rt/sse/canvas/c1"]
+    assert singles == [0, 1, 2, 3, 4]
+
+
+def test_zero_window_sends_each_event():
+    transport, posts = _transport(sse_batch_window=0)
+    asyncio.run(transport.emit_sse_event("c1", {"seq": 0}))
+    assert [url for url, _ in posts] == ["http://rt/sse/canvas/c1"]
+
+
+def test_flush_on_emit_delivers_before_returning():
+    transport, posts = _transport(sse_batch_window=10)
+
+    async def main():
+        await transport.emit_sse_event("c1", {"seq": 0})
+        await transport.emit_sse_event("c1", {"seq": 1}, flush=True)
+        assert [e["event"]["seq"] for e in posts[0][1]["events"]] == [0, 1]
+        await transport.disconnect()
+
+    transport.session.close = MagicMock(side_effect=lambda: asyncio.sleep(0))
+    asyncio.run(main())
+    assert len(posts) == 1
+
+
+def test_pending_events_sent_when_loop_shuts_down():
+    transport, posts = _transport(sse_batch_window=10)
+
+    async def main():
+        await transport.emit_sse_event("c1", {"seq": 0})
+        await transport.emit_sse_event("c1", {"seq": 1})
+        # returns without flush_sse()/disconnect(); asyncio.run cancels the window timer
+
+    asyncio.run(main())
+    assert [e["event"]["seq"] for e in posts[0][1]["events"]] == [0, 1]
+
+
+def test_per_canvas_state_is_dropped_once_flushed():
+    transport, posts = _transport(sse_batch_window=0.01)
+
+    async def main():
+        for i in range(20):
+            await transport.emit_sse_event(f"c{i}", {"seq": i})
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+    assert len(posts) == 20
+    assert transport._sse_locks == {} and transport._sse_lock_users == {}
+    assert transport._sse_flush_tasks == {} and transport._sse_pending == {}
@@ -0,0 +1,156 @@
+import asyncio
+
+import httpx
+
+from atoms_agents.runtime import canvas_stream_hub
+from atoms_agents.runtime.canvas_mirror import CanvasMirror
+from atoms_agents.runtime.canvas_stream_hub import CanvasStreamHub
+from atoms_agents.runtime.context import AgentsRequestContext, ContextMode
+
+CTX = AgentsRequestContext(tenant_id="t", mode=ContextMode.SAAS, project_id="p", request_id="r")
+
+
+def _sse(*events):
+    return "".join(f'id: e{n}\ndata: {{"event_id": "e{n}", "n": {n}}}\n\n' for n in events)
+
+
+def test_mirrors_of_one_canvas_share_a_stream_and_sanitize_once(monkeypatch):
+    requests = []
+    sanitized = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        return httpx.Response(200, text=_sse(1, 2, 3))
+
+    def fake_sanitize(payload):
+        sanitized.append(payload["n"])
+        return payload
+
+    monkeypatch.setattr(canvas_stream_hub, "sanitize_canvas_event", fake_sanitize)
+    hub = CanvasStreamHub()
+    transport = httpx.MockTransport(handler)
+    mirrors = [
+        CanvasMirror("http://rt", CTX, "c1", transport=transport, max_reconnects=0, hub=hub) for _ in range(3)
+    ]
+
+    async def main():
+        for mirror in mirrors:
+            await mirror.start()
+        for mirror in mirrors:
+            await mirror.wait()
+
+    asyncio.run(main())
+    assert requests == ["/sse/canvas/c1"]
+    assert sanitized == [1, 2, 3]
+    for mirror in mirrors:
+        assert [e["n"] for e in mirror.snapshot()] == [1, 2, 3]
+        assert mirror.last_event_id == "e3"
+    assert hub.stats() == []  # upstream closed with its stream
+
+
+def test_slow_subscriber_drops_oldest_and_late_joiner_gets_history():
+    hub = CanvasStreamHub(history=2)
+
+    async def main():
+        gate = asyncio.Event()  # keeps the upstream open after the first five events
+
+        async def stream(request):
+            yield _sse(1, 2, 3, 4, 5).encode()
+            await gate.wait()
+
+        def handler(request):
+            return httpx.Response(200, stream=_AsyncStream(stream(request)))
+
+        slow = hub.subscribe("http://rt", CTX, "c1", capacity=2, transport=httpx.MockTransport(handler))
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if slow.dropped == 3:
+                break
+        late = hub.subscribe("http://rt", CTX, "c1", capacity=10, transport=slow._upstream.transport)
+        assert len(hub.stats()) == 1 and hub.stats()[0]["subscribers"] == 2
+
+        slow_items = [await slow.get(), await slow.get()]
+        late_items = [late.buffer[0], late.buffer[1]]
+        slow.close()
+        late.close()
+        await asyncio.sleep(0)
+        return slow_items, late_items, slow.dropped
+
+    slow_items, late_items, dropped = asyncio.run(main())
+    assert [p["n"] for _, p in slow_items] == [4, 5] and dropped == 3
+    assert [p["n"] for _, p in late_items] == [4, 5]
+    assert hub.stats() == []
+
+
+def test_resuming_subscriber_only_gets_history_after_its_last_event():
+    hub = CanvasStreamHub(history=5)
+
+    async def main():
+        gate = asyncio.Event()
+
+        async def stream(request):
+            yield _sse(1, 2, 3, 4).encode()
+            await gate.wait()
+
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, stream=_AsyncStream(stream(request))))
+        first = hub.subscribe("http://rt", CTX, "c1", transport=transport)
+        while len(first.buffer) < 4:
+            await asyncio.sleep(0.01)
+        resumed = hub.subscribe("http://rt", CTX, "c1", transport=transport, last_event_id="e2")
+        unknown = hub.subscribe("http://rt", CTX, "c1", transport=transport, last_event_id="e0")
+        seen = [[p["n"] for _, p in sub.buffer] for sub in (resumed, unknown)]
+        for sub in (first, resumed, unknown):
+            sub.close()
+        await asyncio.sleep(0)
+        return seen
+
+    resumed, unknown = asyncio.run(main())
+    assert resumed == [3, 4]
+    assert unknown == [1, 2, 3, 4]  # older than the history: replay all of it
+
+
+def test_upstreams_are_shared_only_between_identical_headers():
+    hub = CanvasStreamHub()
+    headers = []
+
+    async def main():
+        gate = asyncio.Event()
+
+        async def stream(request):
+            headers.append(dict(request.headers))
+            yield b""
+            await gate.wait()
+
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, stream=_AsyncStream(stream(request))))
+        def ctx(user_id, run_id, request_id):
+            return AgentsRequestContext(
+                tenant_id="t", mode=ContextMode.SAAS, project_id="p",
+                user_id=user_id, run_id=run_id, request_id=request_id,
+            )
+
+        contexts = [
+            ctx("alice", "r1", "q1"), ctx("alice", "r1", "q1"), ctx("alice", "r2", "q2"), ctx("bob", "r1", "q1"),
+        ]
+        subs = [hub.subscribe("http://rt", c, "c1", transport=transport) for c in contexts]
+        await asyncio.sleep(0.05)
+        stats = hub.stats()
+        for sub in subs:
+            sub.close()
+        await asyncio.sleep(0)
+        return stats
+
+    stats = asyncio.run(main())
+    assert sorted(s["subscribers"] for s in stats) == [1, 1, 2]
+    # Each upstream is opened with exactly its subscribers' headers
+    assert sorted((h["x-user-id"], h["x-run-id"], h["x-request-id"]) for h in headers) == [
+        ("alice", "r1", "q1"), ("alice", "r2", "q2"), ("bob", "r1", "q1"),
+    ]
+
+
+class _AsyncStream(httpx.AsyncByteStream):
+    def __init__(self, gen):
+        self._gen = gen
+
+    async def __aiter__(self):
+        async for chunk in self._gen:
+            yield chunk
@@ -0,0 +1,191 @@
+import asyncio
+from unittest.mock import MagicMock
+
+from atoms_agents.transport.canvas_transport_bridge import AgentCanvasTransport
+from atoms_agents.transport.command_subscription import CommandSubscription, IdleBackoff
+
+
+class _Resp:
+    def __init__(self, status, body, hold=0.0):
+        self.status, self.body, self.hold = status, body, hold
+
+    async def __aenter__(self):
+        await asyncio.sleep(self.hold)
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self):
+        return self.body
+
+
+def _transport(handler):
+    transport = AgentCanvasTransport(realtime_endpoint="http://rt")
+    calls = []
+
+    def get(url, params, headers, timeout):
+        calls.append((url, dict(params)))
+        return handler(url, params)
+
+    transport.session = MagicMock()
+    transport.session.get = MagicMock(side_effect=get)
+    return transport, calls
+
+
+def test_idle_backoff_doubles_and_resets():
+    backoff = IdleBackoff(0.1, 0.5)
+    assert [backoff.next() for _ in range(5)] == [0.1, 0.2, 0.4, 0.5, 0.5]
+    backoff.reset()
+    assert backoff.next() == 0.1
+
+
+def test_one_multiplexed_long_poll_serves_every_agent():
+    queued = {"a": [{"cmd": 1}], "b": [{"cmd": 2}]}
+
+    def handler(url, params):
+        assert url == "http://rt/commands/poll"
+        ids = params["agent_ids"].split(",")
+        ready = {i: queued.pop(i) for i in ids if i in queued}
+        return _Resp(200, ready, hold=0 if ready else params["wait"])
+
+    transport, calls = _transport(handler)
+    transport.commands = CommandSubscription(transport, wait=0.05)
+    got = []
+
+    async def record(cmd):
+        got.append(cmd["cmd"])
+
+    async def main():
+        tasks = [asyncio.create_task(transport.poll_commands(i, record)) for i in ("a", "b")]
+        await asyncio.sleep(0.2)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    assert sorted(got) == [1, 2]
+    assert {url for url, _ in calls} == {"http://rt/commands/poll"}
+    # Held polls, not 100ms ticks per agent
+    assert len(calls) <= 8
+    assert transport.commands.callbacks == {}
+
+
+def test_falls_back_to_per_agent_polling_with_idle_backoff():
+    def handler(url, params):
+        if url == "http://rt/commands/poll":
+            return _Resp(404, None)
+        return _Resp(200, [])
+
+    transport, calls = _transport(handler)
+    transport.commands = CommandSubscription(transport, wait=0.05, min_interval=0.01, max_interval=0.08)
+
+    async def noop(cmd):
+        pass
+
+    async def main():
+        tasks = [asyncio.create_task(transport.poll_commands(i, noop)) for i in ("a", "b")]
+        await asyncio.sleep(0.4)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    sub = transport.commands
+    assert sub.multiplexed is False
+    per_agent = [url for url, _ in calls if url != "http://rt/commands/poll"]
+    assert set(per_agent) == {"http://rt/commands/poll/a", "http://rt/commands/poll/b"}
+    # 0.4s at a fixed 10ms interval would be ~80 requests
+    assert len(per_agent) < 30
+    assert sub.backoff.current == 0.08
+
+
+def test_subscribers_of_one_agent_each_keep_their_callback():
+    queued = {"a": [{"cmd": 1}]}
+
+    def handler(url, params):
+        ready = {i: queued.pop(i) for i in params["agent_ids"].split(",") if i in queued}
+        return _Resp(200, ready, hold=0 if ready else params["wait"])
+
+    transport, _ = _transport(handler)
+    sub = CommandSubscription(transport, wait=0.02)
+    first, second = [], []
+
+    async def record_first(cmd):
+        first.append(cmd["cmd"])
+
+    async def record_second(cmd):
+        second.append(cmd["cmd"])
+
+    async def main():
+        sub.subscribe("a", record_first)
+        sub.subscribe("a", record_second)
+        await asyncio.sleep(0.05)
+        sub.unsubscribe("a", record_first)
+        assert sub.callbacks == {"a": [record_second]}
+        queued["a"] = [{"cmd": 2}]
+        await asyncio.sleep(0.05)
+        sub.unsubscribe("a", record_second)
+
+    asyncio.run(main())
+    assert first == [1]
+    assert second == [1, 2]
+    assert sub.callbacks == {}
+
+
+class _HeldResp(_Resp):
+    """A long poll that answers as soon as commands are queued for its agents."""
+
+    def __init__(self, queued, ids, wait):
+        super().__init__(200, {})
+        self.queued, self.ids, self.wait = queued, ids, wait
+
+    async def __aenter__(self):
+        deadline = asyncio.get_running_loop().time() + self.wait
+        while asyncio.get_running_loop().time() < deadline:
+            self.body = {i: self.queued.pop(i) for i in self.ids if i in self.queued}
+            if self.body:
+                break
+            await asyncio.sleep(0.005)
+        return self
+
+
+def test_subscribing_during_a_held_poll_loses_no_commands():
+    queued = {}
+    held = []
+
+    def handler(url, params):
+        ids = params["agent_ids"].split(",")
+        if params["wait"] and ids == ["a"] and not held:
+            # The server dequeues a command for this held poll before answering
+            held.append(ids)
+            return _Resp(200, {"a": [{"cmd": "a1"}]}, hold=0.3)
+        return _HeldResp(queued, ids, params["wait"])
+
+    transport, _ = _transport(handler)
+    sub = CommandSubscription(transport, wait=0.5)
+    got = []
+
+    async def record(cmd):
+        got.append((cmd["cmd"], asyncio.get_running_loop().time()))
+
+    async def main():
+        start = asyncio.get_running_loop().time()
+        sub.subscribe("a", record)
+        await asyncio.sleep(0.02)
+        queued["b"] = [{"cmd": "b1"}]  # already queued when b subscribes
+        sub.subscribe("b", record)
+        await asyncio.sleep(0.05)
+        queued["b"] = [{"cmd": "b2"}]  # arrives after subscribe() returned
+        await asyncio.sleep(0.3)
+        sub.stop()
+        return start
+
+    start = asyncio.run(main())
+    assert held == [["a"]]
+    delivered = dict(got)
+    assert set(delivered) == {"a1", "b1", "b2"}
+    # b's commands arrive without waiting out a's held poll
+    assert delivered["b1"] - start < 0.1
+    assert delivered["b2"] - start < 0.15
+    assert delivered["a1"] - start >= 0.3
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+import uuid
+from unittest.mock import MagicMock
+
+from atoms_agents.logging.event_batch_writer import EventBatchWriter
+from atoms_agents.logging.event_v2_logger import EventPriority, EventV2Logger
+
+
+def test_batches_by_size_and_flushes_remainder():
+    batches = []
+    writer = EventBatchWriter(batches.append, max_queue=100, batch_size=3, flush_interval=10)
+    for i in range(7):
+        assert writer.offer(i, "truth")
+    assert writer.flush(timeout=2)
+
+    assert [len(b) for b in batches] == [3, 3, 1]
+    assert [i for b in batches for i in b] == list(range(7))
+    assert writer.metrics()["written"] == 7
+    writer.close()
+
+
+def test_interval_flush_without_explicit_flush():
+    done = threading.Event()
+    writer = EventBatchWriter(lambda batch: done.set(), batch_size=100, flush_interval=0.02)
+    writer.offer("e", "info")
+    assert done.wait(2)
+    writer.close()
+
+
+def test_low_priority_shed_before_truth():
+    release = threading.Event()
+    written = []
+
+    def slow_sink(batch):
+        release.wait(2)
+        written.extend(batch)
+
+    writer = EventBatchWriter(slow_sink, max_queue=10, batch_size=1, flush_interval=0, shed_ratio=0.5)
+    writer.offer("first", "truth")  # picked up by the writer, which then blocks in the sink
+    while writer.metrics()["queue_depth"]:
+        pass
+    for i in range(5):
+        writer.offer(f"t{i}", "truth")
+    assert writer.offer("chatter", "info") is False
+    assert writer.offer("gesture", "gesture") is False
+    assert writer.offer("t5", "critical") is True
+
+    release.set()
+    writer.close()
+    assert writer.metrics()["dropped"] == {"info": 1, "gesture": 1}
+    assert "chatter" not in written and "t5" in written
+
+
+def test_truth_waits_for_room_instead_of_dropping():
+    gate = threading.Event()
+    writer = EventBatchWriter(lambda batch: gate.wait(2), max_queue=1, batch_size=1, flush_interval=0)
+    writer.offer("a", "truth")
+    while writer.metrics()["queue_depth"]:
+        pass
+    writer.offer("b", "truth")  # fills the queue
+
+    async def main():
+        task = asyncio.create_task(writer.submit("c", "truth"))
+        await asyncio.sleep(0.05)
+        assert not task.done()
+        gate.set()
+        return await task
+
+    assert asyncio.run(main()) is True
+    writer.close()
+    assert writer.metrics()["written"] == 3
+
+
+def test_close_drains_and_rejects_new_events():
+    batches = []
+    writer = EventBatchWriter(batches.append, batch_size=100, flush_interval=10)
+    writer.offer(1, "truth")
+    writer.offer(2, "truth")
+    writer.close()
+    assert batches == [[1, 2]]
+    assert writer.offer(3, "truth") is False
+
+
+def test_close_does_not_hang_on_a_full_queue():
+    stuck = threading.Event()
+    writer = EventBatchWriter(lambda batch: stuck.wait(5), max_queue=1, batch_size=1, flush_interval=0)
+    writer.offer("a", "truth")
+    while writer.metrics()["queue_depth"]:
+        pass
+    writer.offer("b", "truth")  # fills the queue behind the stuck sink
+
+    started = time.monotonic()
+    writer.close(timeout=0.1)
+    assert time.monotonic() - started < 1.0
+    stuck.set()
+
+
+def test_logger_persists_through_batch_writer():
+    svc = MagicMock(spec=["append_events"])
+    logger = EventV2Logger(tenant_id=str(uuid.uuid4()), project_id="p1")
+    logger._event_spine_service = svc
+
+    routing = logger.create_routing_keys(actor_id="agent-1")
+    events = [
+        logger.create_event("model_inference", routing, {"i": i}, priority=EventPriority.TRUTH)
+        for i in range(3)
+    ]
+
+    async def main():
+        for event in events:
+            await logger.emit_event(event, emit_to_sse=False)
+
+    asyncio.run(main())
+    assert logger.flush(timeout=2)
+    written = [e for call in svc.append_events.call_args_list for e in call.args[0]]
+    assert [e.payload["i"] for e in written] == [0, 1, 2]
+    logger.close()
+
+
+def test_logger_unbatched_writes_inline():
+    svc = MagicMock()
+    logger = EventV2Logger(tenant_id=str(uuid.uuid4()), project_id="p1", batched=False)
+    logger._event_spine_service = svc
+    event = logger.create_event("x", logger.create_routing_keys(actor_id="a"), {})
+    asyncio.run(logger.emit_event(event, emit_to_sse=False))
+    svc.append_event.assert_called_once()
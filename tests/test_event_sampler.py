@@ -0,0 +1,123 @@
+import asyncio
+import json
+import random
+import uuid
+from unittest.mock import AsyncMock
+
+from atoms_agents.logging.event_sampler import EventSampler
+from atoms_agents.logging.event_v2_logger import EventPriority, EventSeverity, EventV2Logger
+
+
+def test_rate_resolution_most_specific_first():
+    sampler = EventSampler(
+        default_rate=0.1,
+        type_rates={"chat_message": 0.5},
+        tenant_rates={"t1": 0.7},
+        tenant_type_rates={("t1", "chat_message"): 0.0},
+    )
+    assert sampler.rate_for("chat_message", "t1") == 0.0
+    assert sampler.rate_for("chat_message", "t2") == 0.5
+    assert sampler.rate_for("other", "t1") == 0.7
+    assert sampler.rate_for("other", None) == 0.1
+
+
+def test_errors_always_kept_and_counters():
+    sampler = EventSampler(default_rate=0.0, reservoir=0)
+    assert sampler.should_keep("x", is_error=True)
+    assert not sampler.should_keep("x")
+    metrics = sampler.metrics()
+    assert metrics["kept"] == {"x": 1} and metrics["dropped"] == {"x": 1}
+    assert metrics["kept_by_reason"] == {"error": 1}
+
+
+def test_reservoir_keeps_first_events_per_type():
+    sampler = EventSampler(default_rate=0.0, reservoir=2)
+    decisions = [sampler.should_keep("rare") for _ in range(5)]
+    assert decisions[:2] == [True, True]
+    assert sampler.metrics()["kept_total"] <= 2 + 1  # may roll over a second boundary once
+    assert sampler.should_keep("other")
+
+
+def test_rate_is_roughly_honoured():
+    sampler = EventSampler(default_rate=0.25, reservoir=0, rng=random.Random(7))
+    kept = sum(sampler.should_keep("info") for _ in range(4000))
+    assert 850 < kept < 1150
+
+
+def test_trace_consistent_decisions():
+    a = EventSampler(default_rate=0.5, reservoir=0)
+    b = EventSampler(default_rate=0.5, reservoir=0)
+    traces = [str(uuid.uuid4()) for _ in range(200)]
+    first = [a.should_keep("step", correlation_id=t) for t in traces]
+    # Same trace, later events and a different process agree
+    assert [a.should_keep("other_step", correlation_id=t) for t in traces] == first
+    assert [b.should_keep("step", correlation_id=t) for t in traces] == first
+    assert 0 < sum(first) < len(traces)
+
+
+def test_trace_events_use_their_own_type_rate():
+    sampler = EventSampler(default_rate=0.0, type_rates={"model_inference": 1.0}, reservoir=0)
+    assert not sampler.should_keep("chat_message", correlation_id="trace-1")
+    assert sampler.should_keep("model_inference", correlation_id="trace-1")
+    assert not sampler.should_keep("chat_message", correlation_id="trace-1")
+
+    # A trace kept at a low rate is kept for every higher-rate type as well
+    mixed = EventSampler(default_rate=0.2, type_rates={"model_inference": 0.6}, reservoir=0)
+    traces = [str(uuid.uuid4()) for _ in range(300)]
+    low = [mixed.should_keep("chat_message", correlation_id=t) for t in traces]
+    high = [mixed.should_keep("model_inference", correlation_id=t) for t in traces]
+    assert all(h for l, h in zip(low, high) if l)
+    assert sum(low) < sum(high) < len(traces)
+
+
+def test_reservoir_admitted_trace_keeps_later_events():
+    sampler = EventSampler(default_rate=0.0, reservoir=1)
+    assert sampler.should_keep("step", correlation_id="t")  # reservoir slot
+    assert sampler.should_keep("step", correlation_id="t")
+    assert sampler.should_keep("other_step", correlation_id="t")
+    assert sampler.metrics()["kept_by_reason"] == {"reservoir": 1, "trace": 2}
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("NORTHSTAR_EVENT_SAMPLE_RATE", "0.3")
+    monkeypatch.setenv("NORTHSTAR_EVENT_SAMPLE_RESERVOIR", "0")
+    monkeypatch.setenv(
+        "NORTHSTAR_EVENT_SAMPLE_RULES",
+        json.dumps({"types": {"model_inference": 1.0}, "tenant_types": {"t1:chat_message": 0.0}}),
+    )
+    sampler = EventSampler.from_env()
+    assert sampler.default_rate == 0.3 and sampler.reservoir == 0
+    assert sampler.rate_for("model_inference", None) == 1.0
+    assert sampler.rate_for("chat_message", "t1") == 0.0
+    assert sampler.samples()
+
+
+def test_sampling_is_off_without_config(monkeypatch):
+    for name in ("NORTHSTAR_EVENT_SAMPLE_RATE", "NORTHSTAR_EVENT_SAMPLE_RESERVOIR", "NORTHSTAR_EVENT_SAMPLE_RULES"):
+        monkeypatch.delenv(name, raising=False)
+    sampler = EventSampler.from_env()
+    assert not sampler.samples()
+    assert all(sampler.should_keep("chat_message", "t1") for _ in range(100))
+
+
+def test_logger_samples_only_sampled_policy():
+    logger = EventV2Logger(
+        tenant_id=str(uuid.uuid4()),
+        project_id="p1",
+        batched=False,
+        sampler=EventSampler(default_rate=0.0, reservoir=0),
+    )
+    logger._persist_event = AsyncMock()
+    routing = logger.create_routing_keys(actor_id="a")
+
+    async def main():
+        await logger.emit_event(logger.create_event("truth", routing, {}, priority=EventPriority.TRUTH), emit_to_sse=False)
+        await logger.emit_event(logger.create_event("info", routing, {}), emit_to_sse=False)
+        await logger.emit_event(
+            logger.create_event("err", routing, {}, severity=EventSeverity.ERROR), emit_to_sse=False
+        )
+
+    asyncio.run(main())
+    persisted = [call.args[0].type for call in logger._persist_event.call_args_list]
+    assert persisted == ["truth", "err"]
+    assert logger.sampler.metrics()["dropped"] == {"info": 1}
@@ -0,0 +1,97 @@
+import asyncio
+import json
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+from atoms_agents.logging import event_codec
+from atoms_agents.logging.event_v2_logger import EventPriority, EventV2Logger
+from atoms_agents.transport.canvas_transport_bridge import AgentCanvasTransport
+
+
+def _logger(**kwargs):
+    return EventV2Logger(tenant_id=str(uuid.uuid4()), project_id="p1", batched=False, **kwargs)
+
+
+def _event(logger, **routing):
+    routing = logger.create_routing_keys(actor_id="agent_1", canvas_id="c1", **routing)
+    return logger.create_event("model_inference", routing, {"n": 1}, priority=EventPriority.TRUTH)
+
+
+def test_serialize_matches_json_round_trip():
+    logger = _logger()
+    event = _event(logger)
+    serialized = logger.serialize(event)
+    assert serialized.data == json.loads(event.model_dump_json())
+    assert json.loads(serialized.encoded) == serialized.data
+    assert serialized.encoded is serialized.encoded
+
+
+def test_routing_dict_cached_per_combination():
+    logger = _logger()
+    first = logger.serialize(_event(logger)).data["routing"]
+    assert logger.serialize(_event(logger)).data["routing"] is first
+    assert logger.serialize(_event(logger, thread_id="t1")).data["routing"] is not first
+
+
+def test_emit_reuses_encoded_bytes_and_copies_routing_for_persist():
+    transport = MagicMock(accepts_encoded=True, emit_sse=AsyncMock(), emit_ws=AsyncMock())
+    logger = _logger(transport_client=transport)
+    logger._persist_event = AsyncMock()
+    event = _event(logger)
+
+    asyncio.run(logger.emit_event(event, emit_to_ws=True))
+
+    sse = transport.emit_sse.call_args.kwargs
+    ws = transport.emit_ws.call_args.kwargs
+    assert sse["encoded"] is ws["encoded"]
+    assert json.loads(sse["encoded"]) == sse["event_data"]
+
+    serialized = logger._persist_event.call_args.args[1]
+    spine = logger._to_spine_event(event, serialized)
+    routing = spine.payload["_event_v2"]["routing"]
+    assert routing == serialized.data["routing"] and routing is not serialized.data["routing"]
+
+
+def test_plain_transport_gets_dict_only():
+    transport = MagicMock(spec=["emit_sse", "emit_ws"], emit_sse=AsyncMock(), emit_ws=AsyncMock())
+    logger = _logger(transport_client=transport)
+    asyncio.run(logger.emit_event(_event(logger), persist_to_db=False))
+    assert set(transport.emit_sse.call_args.kwargs) == {"canvas_id", "event_data"}
+
+
+def test_transport_splices_encoded_event_into_body():
+    class _Resp:
+        status = 200
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    transport = AgentCanvasTransport(sse_batch_window=0)
+    transport.session = MagicMock()
+    transport.session.post = MagicMock(return_value=_Resp())
+    encoded = event_codec.dumps({"type": "x", "n": 1})
+
+    asyncio.run(transport.emit_sse_event("c1", {"ignored": True}, encoded_event=encoded))
+
+    body = transport.session.post.call_args.kwargs["data"]
+    assert json.loads(body) == {"canvas_id": "c1", "thread_id": None, "event": {"type": "x", "n": 1}}
+
+
+def test_transport_adapter_forwards_encoded_bytes():
+    from atoms_agents.transport.event_adapter import TransportAdapter
+
+    bridge = MagicMock(emit_sse_event=AsyncMock(), emit_ws_message=AsyncMock())
+    adapter = TransportAdapter(bridge)
+
+    async def run():
+        await adapter.emit_sse("c1", {"n": 1}, encoded=b"{}")
+        await adapter.emit_ws("t1", {"n": 1}, encoded=b"{}")
+        await adapter.emit_sse(None, {"n": 1})
+
+    asyncio.run(run())
+    assert adapter.accepts_encoded
+    bridge.emit_sse_event.assert_awaited_once_with(canvas_id="c1", event_data={"n": 1}, encoded_event=b"{}")
+    bridge.emit_ws_message.assert_awaited_once_with(thread_id="t1", message_data={"n": 1}, encoded=b"{}")
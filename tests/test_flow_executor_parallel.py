@@ -0,0 +1,243 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from atoms_agents.registry.schemas import FlowCard, FlowEdge
+from atoms_agents.runtime.executor import FlowExecutor
+from atoms_agents.runtime.node_result import NodeRunResult
+
+
+def _fan_out_flow(defaults=None):
+    # a -> (b, c, d) -> e
+    return FlowCard(
+        flow_id="fan_out",
+        name="Fan Out",
+        objective="test",
+        nodes=["a", "b", "c", "d", "e"],
+        edges=[
+            FlowEdge("e_ab", "a", "b"),
+            FlowEdge("e_ac", "a", "c"),
+            FlowEdge("e_ad", "a", "d"),
+            FlowEdge("e_be", "b", "e"),
+            FlowEdge("e_ce", "c", "e"),
+            FlowEdge("e_de", "d", "e"),
+        ],
+        entry_node="a",
+        exit_nodes=["e"],
+        defaults=defaults or {},
+    )
+
+
+def _executor(flow, node_fn, max_concurrency=1):
+    registry = MagicMock()
+    registry.nodes = {n: MagicMock(node_id=n) for n in flow.nodes}
+    executor = FlowExecutor(registry, max_concurrency=max_concurrency)
+    executor.node_executor = MagicMock()
+    executor.node_executor.execute_node.side_effect = node_fn
+    executor._write_report = MagicMock()
+    return executor
+
+
+def _tracking_node_fn(delay=0.05, fail=()):
+    state = {"running": 0, "peak": 0, "order": []}
+    lock = threading.Lock()
+
+    def run(node, profile, **kwargs):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(delay)
+        with lock:
+            state["running"] -= 1
+            state["order"].append(node.node_id)
+        status = "FAIL" if node.node_id in fail else "PASS"
+        return NodeRunResult(node.node_id, status, status, 0.0, 0.0)
+
+    return run, state
+
+
+def test_flow_plan_rejects_cycles():
+    from atoms_agents.runtime.flow_plan import compile_flow_plan
+
+    flow = FlowCard(
+        flow_id="cycle", name="Cycle", objective="test", nodes=["a", "b"],
+        edges=[FlowEdge("e1", "a", "b"), FlowEdge("e2", "b", "a")],
+        entry_node="a", exit_nodes=["b"],
+    )
+    with pytest.raises(ValueError, match="Cycle"):
+        compile_flow_plan(flow)
+
+
+def test_sequential_by_default():
+    flow = _fan_out_flow()
+    node_fn, state = _tracking_node_fn(delay=0.01)
+    executor = _executor(flow, node_fn)
+
+    res = executor.execute_flow(flow)
+
+    assert res.status == "success"
+    assert state["peak"] == 1
+    assert [r["node_id"] for r in res.node_results][0] == "a"
+    assert [r["node_id"] for r in res.node_results][-1] == "e"
+
+
+def test_parallel_waves_run_siblings_concurrently():
+    flow = _fan_out_flow()
+    node_fn, state = _tracking_node_fn()
+    executor = _executor(flow, node_fn)
+
+    res = executor.execute_flow(flow, max_concurrency=4)
+
+    assert res.status == "success"
+    assert state["peak"] == 3
+    assert state["order"][0] == "a"
+    assert state["order"][-1] == "e"
+    assert len(res.node_results) == 5
+
+    call = executor.node_executor.execute_node.call_args_list[-1]
+    assert sorted(call.kwargs["inbound_edge_ids"]) == ["e_be", "e_ce", "e_de"]
+
+
+def test_flow_defaults_cap_concurrency():
+    flow = _fan_out_flow(defaults={"max_concurrency": 2})
+    node_fn, state = _tracking_node_fn()
+    executor = _executor(flow, node_fn, max_concurrency=8)
+
+    res = executor.execute_flow(flow)
+
+    assert res.status == "success"
+    assert state["peak"] == 2
+
+
+def test_parallel_fail_fast_cancels_siblings():
+    flow = _fan_out_flow()
+    fast_fail, _ = _tracking_node_fn(delay=0.01, fail=("b",))
+    finished = []
+
+    def run(node, profile, **kwargs):
+        if node.node_id in ("c", "d"):
+            # Cooperative node: stops at its next checkpoint once the token is set
+            token = kwargs["cancel_token"]
+            deadline = time.time() + 2.0
+            while not token.is_cancelled() and time.time() < deadline:
+                time.sleep(0.01)
+            finished.append(node.node_id)
+            status = "SKIP" if token.is_cancelled() else "PASS"
+            return NodeRunResult(node.node_id, status, "Cancelled", 0.0, 0.0)
+        return fast_fail(node, profile, **kwargs)
+
+    executor = _executor(flow, run)
+
+    started = time.time()
+    res = executor.execute_flow(flow, max_concurrency=4)
+
+    assert time.time() - started < 1.0
+    assert res.status == "failed"
+    statuses = {r["node_id"]: r["status"] for r in res.node_results}
+    assert statuses["b"] == "FAIL"
+    assert statuses["c"] == "SKIP"
+    assert statuses["d"] == "SKIP"
+    assert "e" not in statuses
+    # Siblings were waited for, not abandoned
+    assert sorted(finished) == ["c", "d"]
+
+
+def test_parallel_fail_fast_reports_real_sibling_outcome():
+    flow = _fan_out_flow()
+
+    def run(node, profile, **kwargs):
+        if node.node_id == "b":
+            time.sleep(0.05)  # let every sibling start first
+            return NodeRunResult("b", "FAIL", "boom", 0.0, 0.0)
+        if node.node_id in ("c", "d"):
+            time.sleep(0.2)  # ignores the token and completes
+        return NodeRunResult(node.node_id, "PASS", "PASS", 0.0, 0.0)
+
+    executor = _executor(flow, run)
+
+    res = executor.execute_flow(flow, max_concurrency=4)
+
+    statuses = {r["node_id"]: r["status"] for r in res.node_results}
+    assert res.status == "failed"
+    assert statuses == {"a": "PASS", "b": "FAIL", "c": "PASS", "d": "PASS"}
+
+
+def test_parallel_node_exception_becomes_fail_and_cancels():
+    flow = _fan_out_flow()
+    tokens = []
+
+    def run(node, profile, **kwargs):
+        if node.node_id == "b":
+            raise RuntimeError("exploded")
+        if node.node_id in ("c", "d"):
+            tokens.append(kwargs["cancel_token"])
+            time.sleep(0.1)
+        return NodeRunResult(node.node_id, "PASS", "PASS", 0.0, 0.0)
+
+    executor = _executor(flow, run)
+
+    res = executor.execute_flow(flow, max_concurrency=4)
+
+    assert res.status == "failed"
+    assert res.error is None
+    failed = [r for r in res.node_results if r["node_id"] == "b"][0]
+    assert failed["status"] == "FAIL"
+    assert "exploded" in failed["reason"]
+    assert tokens and all(t.is_cancelled() for t in tokens)
+
+
+def test_queued_nodes_are_skipped_after_failure():
+    flow = _fan_out_flow()
+    started = []
+
+    def run(node, profile, **kwargs):
+        started.append(node.node_id)
+        if node.node_id == "b":
+            time.sleep(0.05)
+            return NodeRunResult("b", "FAIL", "boom", 0.0, 0.0)
+        if node.node_id != "a":
+            time.sleep(0.2)
+        return NodeRunResult(node.node_id, "PASS", "PASS", 0.0, 0.0)
+
+    executor = _executor(flow, run)
+
+    # Two workers: b and c run, d waits in the queue and must never start
+    res = executor.execute_flow(flow, max_concurrency=2)
+
+    statuses = {r["node_id"]: r["status"] for r in res.node_results}
+    assert statuses["b"] == "FAIL"
+    assert statuses["d"] == "SKIP"
+    assert "d" not in started
+
+
+def test_flow_plan_cached_by_content_hash():
+    from atoms_agents.runtime.flow_plan import clear_flow_plan_cache, compile_flow_plan
+
+    clear_flow_plan_cache()
+    plan = compile_flow_plan(_fan_out_flow())
+
+    assert compile_flow_plan(_fan_out_flow()) is plan
+    assert plan.order[0] == "a" and plan.order[-1] == "e"
+    assert plan.edges_for("a").outbound_edges == ("e_ab", "e_ac", "e_ad")
+    assert plan.edges_for("e").inbound_edges == ("e_be", "e_ce", "e_de")
+    assert plan.successors["a"] == {"b", "c", "d"}
+
+    # Cached plans are shared between runs and cannot be mutated
+    assert isinstance(plan.order, tuple)
+    with pytest.raises(TypeError):
+        plan.edge_maps["a"] = None
+    with pytest.raises(AttributeError):
+        plan.successors["a"].add("e")
+
+    changed = _fan_out_flow()
+    changed.edges.pop()
+    assert compile_flow_plan(changed) is not plan
+
+
+def test_edge_map_still_importable_from_executor():
+    from atoms_agents.runtime.executor import EdgeMap
+    from atoms_agents.runtime.flow_plan import EdgeMap as PlanEdgeMap
+
+    assert EdgeMap is PlanEdgeMap
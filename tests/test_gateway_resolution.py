@@ -0,0 +1,41 @@
+import pytest
+
+from atoms_agents.runtime import gateway_resolution
+from atoms_agents.runtime.gateway_resolution import invalidate_gateway, resolve_gateway
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    invalidate_gateway()
+    yield
+    invalidate_gateway()
+
+
+def test_resolve_returns_cached_instance():
+    assert resolve_gateway("groq") is resolve_gateway("groq")
+    assert resolve_gateway("groq") is not resolve_gateway("openrouter")
+
+
+def test_unknown_provider_raises():
+    with pytest.raises(ValueError, match="Unknown provider"):
+        resolve_gateway("nope")
+
+
+def test_credential_rotation_builds_new_instance(monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEY", "key-a")
+    first = resolve_gateway("groq")
+    monkeypatch.setenv("GROQ_API_KEY", "key-b")
+    second = resolve_gateway("groq")
+
+    assert second is not first
+    assert len([k for k in gateway_resolution._INSTANCES if k[0] == "groq"]) == 1
+
+
+def test_invalidate_single_provider():
+    groq = resolve_gateway("groq")
+    gemini = resolve_gateway("gemini")
+
+    invalidate_gateway("groq")
+
+    assert resolve_gateway("groq") is not groq
+    assert resolve_gateway("gemini") is gemini
@@ -0,0 +1,88 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+from fastapi.testclient import TestClient
+
+from atoms_agents.registry.schemas import ModelCard
+from atoms_agents.runtime.gateway import LLMGateway, ReadinessResult, ReadinessStatus
+from atoms_agents.runtime.providers.openai_compat import stream_chat_completions
+from atoms_agents.server import main as server_main
+
+
+class ChunkedGateway(LLMGateway):
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def generate(self, messages, model_card, provider_config, **kwargs):
+        return {"role": "assistant", "content": "".join(self.chunks), "usage": {}}
+
+    def stream_generate(self, messages, model_card, provider_config, **kwargs):
+        for chunk in self.chunks:
+            yield {"delta": chunk}
+        yield {"done": True, "usage": {"input_tokens": 1, "output_tokens": 2, "total_tokens": 3}, "finish_reason": "stop"}
+
+    def check_readiness(self):
+        return ReadinessResult(ReadinessStatus.READY, "ok", True)
+
+
+class BlockingOnlyGateway(ChunkedGateway):
+    stream_generate = LLMGateway.stream_generate
+
+
+def _model():
+    return ModelCard("m1", "groq", "llama", "meta_llama")
+
+
+def test_default_stream_generate_wraps_generate():
+    chunks = list(BlockingOnlyGateway(["a", "b"]).stream_generate([], _model(), None))
+    assert chunks[0] == {"delta": "ab"}
+    assert chunks[-1]["done"] is True
+
+
+def test_openai_compatible_sse_parsing():
+    frames = [
+        {"choices": [{"delta": {"content": "Hel"}}]},
+        {"choices": [{"delta": {"content": "lo"}, "finish_reason": "stop"}]},
+        {"choices": [], "x_groq": {"usage": {"prompt_tokens": 4, "completion_tokens": 2, "total_tokens": 6}}},
+    ]
+    body = "".join(f"data: {json.dumps(f)}\n\n" for f in frames) + "data: [DONE]\n\n"
+
+    def handler(request):
+        assert json.loads(request.content)["stream"] is True
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    chunks = list(stream_chat_completions(client, "https://x/chat/completions", {}, {"model": "m"}, "m", "Groq"))
+
+    assert [c["delta"] for c in chunks if "delta" in c] == ["Hel", "lo"]
+    assert chunks[-1]["usage"] == {"input_tokens": 4, "output_tokens": 2, "total_tokens": 6}
+    assert chunks[-1]["finish_reason"] == "stop"
+
+
+def test_openai_compatible_sse_reports_http_errors():
+    client = httpx.Client(transport=httpx.MockTransport(lambda r: httpx.Response(429)))
+    chunks = list(stream_chat_completions(client, "https://x/c", {}, {}, "m", "Groq"))
+    assert chunks == [{"done": True, "status": "FAIL", "reason": chunks[0]["reason"]}]
+    assert "429" in chunks[0]["reason"]
+
+
+def test_workbench_ws_forwards_deltas(monkeypatch):
+    registry = SimpleNamespace(
+        providers={"groq": SimpleNamespace(name="Groq")},
+        models={"llama": _model()},
+        manifests={},
+        personas={},
+    )
+    monkeypatch.setattr(server_main, "registry", registry)
+
+    with patch.object(server_main, "resolve_gateway", return_value=ChunkedGateway(["one ", "two"])):
+        client = TestClient(server_main.app)
+        with client.websocket_connect("/workbench/ws") as ws:
+            ws.send_json({"provider_id": "groq", "model_ref": "llama", "messages": [{"role": "user", "content": "hi"}]})
+            frames = [ws.receive_json() for _ in range(3)]
+
+    assert [f.get("token") for f in frames[:2]] == ["one ", "two"]
+    assert frames[2]["done"] is True
+    assert frames[2]["usage"]["total_tokens"] == 3
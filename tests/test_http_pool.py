@@ -0,0 +1,94 @@
+import httpx
+
+from atoms_agents.runtime.providers import http_pool
+from atoms_agents.runtime.providers.groq import GroqGateway
+from atoms_agents.registry.schemas import ModelCard
+
+
+def test_client_shared_per_provider():
+    http_pool.close_all_http_clients()
+    a = http_pool.get_http_client("groq")
+    assert http_pool.get_http_client("groq") is a
+    assert http_pool.get_http_client("openrouter") is not a
+
+    http_pool.close_http_client("groq")
+    assert a.is_closed
+    assert http_pool.get_http_client("groq") is not a
+    http_pool.close_all_http_clients()
+
+
+def test_pool_size_from_env(monkeypatch):
+    monkeypatch.setenv("NORTHSTAR_HTTP_POOL_SIZE", "3")
+    assert http_pool._pool_size() == 3
+    monkeypatch.setenv("NORTHSTAR_HTTP_POOL_SIZE", "bogus")
+    assert http_pool._pool_size() == http_pool.DEFAULT_POOL_SIZE
+
+
+def test_gateways_reuse_pooled_client(monkeypatch):
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        return httpx.Response(200, json={
+            "choices": [{"message": {"role": "assistant", "content": "hi"}}],
+            "usage": {"total_tokens": 3},
+        })
+
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setitem(http_pool._CLIENTS, "groq", httpx.Client(transport=httpx.MockTransport(handler)))
+
+    model = ModelCard("m1", "groq", "llama", "meta_llama")
+    for _ in range(3):
+        resp = GroqGateway().generate([{"role": "user", "content": "x"}], model, None)
+        assert resp["content"] == "hi"
+    assert seen == ["/openai/v1/chat/completions"] * 3
+
+
+def test_agenerate_uses_pooled_async_client(monkeypatch):
+    import asyncio
+
+    from atoms_agents.runtime.providers.gemini import GeminiGateway
+    from atoms_agents.runtime.providers.openrouter import OpenRouterGateway
+
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        if "generateContent" in request.url.path:
+            return httpx.Response(200, json={
+                "candidates": [{"content": {"parts": [{"text": "gem"}]}}],
+                "usageMetadata": {"totalTokenCount": 2},
+            })
+        return httpx.Response(200, json={
+            "choices": [{"message": {"role": "assistant", "content": "hi"}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 2, "total_tokens": 3},
+        })
+
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        http_pool._ASYNC_CLIENTS[loop] = {
+            name: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            for name in ("groq", "openrouter", "gemini")
+        }
+        client = http_pool.get_async_http_client("groq")
+        assert http_pool.get_async_http_client("groq") is client
+        model = ModelCard("m1", "groq", "llama", "meta_llama")
+        results = await asyncio.gather(
+            *[GroqGateway().agenerate([{"role": "user", "content": "x"}], model, None) for _ in range(3)],
+            OpenRouterGateway().agenerate([{"role": "user", "content": "x"}], model, None),
+            GeminiGateway().agenerate([{"role": "user", "content": "x"}], model, None),
+        )
+        await http_pool.aclose_async_http_clients()
+        assert client.is_closed
+        return results
+
+    results = asyncio.run(run())
+
+    assert [r["content"] for r in results] == ["hi", "hi", "hi", "hi", "gem"]
+    assert results[3]["usage"] == {"input_tokens": 1, "output_tokens": 2, "total_tokens": 3}
+    assert seen.count("/openai/v1/chat/completions") == 3
+    assert "/v1beta/models/llama:generateContent" in seen
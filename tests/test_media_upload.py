@@ -0,0 +1,218 @@
+import asyncio
+import hashlib
+import json
+import os
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from atoms_agents.transport.canvas_transport_bridge import AgentCanvasTransport
+from atoms_agents.transport.media_upload import MediaUploader, MediaUploadIndex
+
+
+class _MediaServer:
+    def __init__(self, chunked=True, fail_once_at=None, open_uri=None):
+        self.open_uri = open_uri
+        self.uploads = {}
+        self.stored = {}  # sha256 -> uri of completed uploads
+        self.opens = []
+        self.ranges = []
+        self.requests = 0
+        self.fail_once_at = fail_once_at
+        self.multipart = None
+        self.app = web.Application(middlewares=[self._count])
+        self.app.router.add_post("/media/upload", self.multipart_upload)
+        if chunked:
+            self.app.router.add_post("/media/uploads", self.open)
+            self.app.router.add_put("/media/uploads/{id}", self.put)
+            self.app.router.add_get("/media/uploads/{id}", self.status)
+            self.app.router.add_post("/media/uploads/{id}/complete", self.complete)
+
+    @web.middleware
+    async def _count(self, request, handler):
+        self.requests += 1
+        return await handler(request)
+
+    async def open(self, request):
+        meta = await request.json()
+        self.opens.append(meta)
+        if self.open_uri:
+            return web.json_response({"uri": self.open_uri})
+        if meta.get("sha256") in self.stored:
+            return web.json_response({"uri": self.stored[meta["sha256"]]})
+        upload_id = f"u{len(self.uploads)}"
+        self.uploads[upload_id] = bytearray()
+        return web.json_response({"upload_id": upload_id}, status=201)
+
+    async def put(self, request):
+        data = self.uploads[request.match_info["id"]]
+        content_range = request.headers["Content-Range"]
+        self.ranges.append(content_range)
+        start = int(content_range.split()[1].split("-")[0])
+        body = await request.read()
+        assert start == len(data)
+        if start == self.fail_once_at:
+            self.fail_once_at = None
+            data.extend(body[:100])  # partial write, then the connection "drops"
+            return web.Response(status=500)
+        data.extend(body)
+        return web.Response(status=204)
+
+    async def status(self, request):
+        return web.json_response({"offset": len(self.uploads[request.match_info["id"]])})
+
+    async def complete(self, request):
+        data = bytes(self.uploads[request.match_info["id"]])
+        meta = await request.json()
+        assert meta["sha256"] == hashlib.sha256(data).hexdigest() and meta["size"] == len(data)
+        self.stored[meta["sha256"]] = f"artifact://{meta['sha256'][:12]}"
+        return web.json_response({"uri": self.stored[meta["sha256"]]})
+
+    async def multipart_upload(self, request):
+        reader = await request.multipart()
+        part = await reader.next()
+        self.multipart = (part.filename, part.headers["Content-Type"], await part.read())
+        return web.json_response({"uri": "s3://bucket/fallback"})
+
+
+async def _run(server, body, api_key=None):
+    test_server = TestServer(server.app)
+    await test_server.start_server()
+    transport = AgentCanvasTransport(realtime_endpoint=str(test_server.make_url("/")), api_key=api_key)
+    await transport.connect()
+    try:
+        return await body(transport)
+    finally:
+        await transport.disconnect()
+        await test_server.close()
+
+
+def _uploader(transport, tmp_path):
+    return MediaUploader(transport, MediaUploadIndex(tmp_path / "index.json"), chunk_size=1024, max_retries=2)
+
+
+def test_path_upload_is_chunked_and_deduplicated(tmp_path):
+    media = tmp_path / "clip.mp4"
+    payload = os.urandom(5000)
+    media.write_bytes(payload)
+    server = _MediaServer()
+
+    async def body(transport):
+        transport.media = _uploader(transport, tmp_path)
+        first = await transport.upload_media_stream(media, "video/mp4")
+        requests = server.requests
+        second = await transport.upload_media(payload, "video/mp4", "copy.mp4")
+        return first, second, requests
+
+    first, second, requests = asyncio.run(_run(server, body))
+    assert first == second == f"artifact://{hashlib.sha256(payload).hexdigest()[:12]}"
+    assert bytes(server.uploads["u0"]) == payload
+    assert len(server.ranges) == 5 and server.ranges[0] == "bytes 0-1023/5000"
+    # The second upload only opened, and the server confirmed the hinted URI
+    assert server.requests == requests + 1 and len(server.uploads) == 1
+    assert server.opens[-1]["uri"] == first
+    # The index is persisted for other processes
+    entries = json.loads((tmp_path / "index.json").read_text())
+    assert [entry["uri"] for entry in entries.values()] == [first]
+
+
+def test_index_hints_are_scoped_to_the_credential(tmp_path):
+    payload = os.urandom(1500)
+    server = _MediaServer()
+
+    async def body(transport):
+        transport.media = _uploader(transport, tmp_path)
+        first = await transport.upload_media(payload, "image/png", "a.png")
+        transport.api_key = "key-b"  # same server, another tenant's key
+        await transport.upload_media(payload, "image/png", "a.png")
+        return first
+
+    uri = asyncio.run(_run(server, body, api_key="key-a"))
+    assert server.opens[1]["uri"] is None  # no hint from key-a's uploads
+    entries = json.loads((tmp_path / "index.json").read_text())
+    assert len(entries) == 2 and all("key-" not in key for key in entries)
+    assert {entry["uri"] for entry in entries.values()} == {uri}
+
+
+def test_stale_index_hint_is_uploaded_again(tmp_path):
+    payload = os.urandom(1500)
+    server = _MediaServer()
+
+    async def body(transport):
+        transport.media = _uploader(transport, tmp_path)
+        first = await transport.upload_media(payload, "image/png", "a.png")
+        server.stored.clear()  # the server lost the artifact
+        second = await transport.upload_media(payload, "image/png", "a.png")
+        return first, second, transport.media
+
+    first, second, uploader = asyncio.run(_run(server, body))
+    assert first == second and uploader.dedup_hits == 0
+    assert len(server.uploads) == 2 and server.opens[1]["uri"] == first
+
+
+def test_failed_chunk_resumes_from_server_offset(tmp_path):
+    payload = os.urandom(3000)
+    server = _MediaServer(fail_once_at=1024)
+
+    async def gen():
+        for i in range(0, len(payload), 700):
+            yield payload[i:i + 700]
+
+    async def body(transport):
+        transport.media = _uploader(transport, tmp_path)
+        return await transport.upload_media_stream(gen(), "video/mp4", "live.mp4")
+
+    uri = asyncio.run(_run(server, body))
+    assert uri.startswith("artifact://")
+    assert bytes(server.uploads["u0"]) == payload
+    assert server.ranges[1:3] == ["bytes 1024-2047/*", "bytes 1124-2047/*"]  # only the missing tail of the chunk was resent
+
+
+def test_falls_back_to_streamed_multipart(tmp_path):
+    payload = os.urandom(2500)
+    server = _MediaServer(chunked=False)
+
+    async def gen():
+        yield payload[:1000]
+        yield payload[1000:]
+
+    async def body(transport):
+        transport.media = _uploader(transport, tmp_path)
+        uri = await transport.upload_media_stream(gen(), "audio/wav", "take.wav")
+        return uri, transport.media
+
+    uri, uploader = asyncio.run(_run(server, body))
+    assert uri == "s3://bucket/fallback" and uploader.chunked is False
+    assert server.multipart == ("take.wav", "audio/wav", payload)
+    endpoint = uploader.transport.realtime_endpoint
+    assert uploader.index.get(endpoint, "anonymous", hashlib.sha256(payload).hexdigest()) == uri
+
+
+def test_multipart_server_reuses_indexed_uri_without_sending(tmp_path):
+    payload = os.urandom(2500)
+    server = _MediaServer(chunked=False)
+
+    async def body(transport):
+        transport.media = _uploader(transport, tmp_path)
+        first = await transport.upload_media(payload, "audio/wav", "take.wav")
+        requests = server.requests
+        second = await transport.upload_media(payload, "audio/wav", "take.wav")
+        return first, second, requests, transport.media
+
+    first, second, requests, uploader = asyncio.run(_run(server, body))
+    assert first == second == "s3://bucket/fallback"
+    assert server.requests == requests and uploader.dedup_hits == 1
+
+
+def test_stream_accepted_at_open_is_not_indexed(tmp_path):
+    server = _MediaServer(open_uri="artifact://known")
+
+    async def gen():
+        yield b"never read"
+
+    async def body(transport):
+        transport.media = _uploader(transport, tmp_path)
+        return await transport.upload_media_stream(gen(), "video/mp4", "live.mp4")
+
+    assert asyncio.run(_run(server, body)) == "artifact://known"
+    assert not (tmp_path / "index.json").exists()
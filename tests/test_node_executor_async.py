@@ -0,0 +1,153 @@
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from atoms_agents.registry.schemas import NodeCard, RunProfileCard, PersonaCard, TaskCard
+from atoms_agents.runtime.context import AgentsRequestContext, ContextMode
+from atoms_agents.runtime.gateway import LLMGateway, ReadinessResult, ReadinessStatus
+from atoms_agents.runtime.node_executor import NodeExecutor
+
+
+class SlowAsyncGateway(LLMGateway):
+    def __init__(self, delay: float = 0.2):
+        self.delay = delay
+        self.sync_calls = 0
+
+    def generate(self, messages, model_card, provider_config, **kwargs):
+        self.sync_calls += 1
+        return {"role": "assistant", "content": "sync", "usage": {}}
+
+    async def agenerate(self, messages, model_card, provider_config, **kwargs):
+        await asyncio.sleep(self.delay)
+        return {"role": "assistant", "content": "async", "usage": {}}
+
+    def check_readiness(self):
+        return ReadinessResult(ReadinessStatus.READY, "ok", True)
+
+
+@pytest.fixture
+def registry():
+    registry = MagicMock()
+    registry.personas.get.return_value = PersonaCard(persona_id="p1", name="P", description="P")
+    registry.tasks.get.return_value = TaskCard(task_id="t1", name="T", goal="G")
+    registry.artifact_specs.get.return_value = None
+    return registry
+
+
+@pytest.fixture
+def request_context():
+    return AgentsRequestContext(
+        tenant_id="t", mode=ContextMode.LAB, project_id="p", request_id="r", run_id="run"
+    )
+
+
+def _node(node_id: str) -> NodeCard:
+    return NodeCard(
+        node_id=node_id, name=node_id, kind="agent", persona_ref="p1", task_ref="t1",
+        provider_ref="prov", model_ref="mod",
+    )
+
+
+def _profile() -> RunProfileCard:
+    return RunProfileCard(
+        profile_id="prof", name="P", persistence_backend="local", blackboard_backend="local",
+        pii_strategy="passthrough", nexus_strategy="disabled", allow_local_fallback=True,
+    )
+
+
+@patch("atoms_agents.runtime.prompting.composer.compose_messages")
+@patch("atoms_agents.runtime.node_executor.resolve_gateway")
+def test_async_nodes_share_one_loop(mock_resolve, mock_compose, registry, request_context):
+    gateway = SlowAsyncGateway(delay=0.2)
+    mock_resolve.return_value = gateway
+    mock_compose.return_value = [{"role": "user", "content": "hi"}]
+    executor = NodeExecutor(registry, audit_emitter=MagicMock())
+
+    async def run_all():
+        return await asyncio.gather(*[
+            executor.execute_node_async(_node(f"n{i}"), _profile(), request_context=request_context)
+            for i in range(10)
+        ])
+
+    started = time.perf_counter()
+    results = asyncio.run(run_all())
+    elapsed = time.perf_counter() - started
+
+    assert [r.status for r in results] == ["PASS"] * 10
+    assert gateway.sync_calls == 0
+    assert elapsed < 1.0  # 10 x 0.2s sequentially would be 2s
+
+
+@patch("atoms_agents.runtime.prompting.composer.compose_messages")
+@patch("atoms_agents.runtime.node_executor.resolve_gateway")
+def test_sync_wrapper_works_inside_running_loop(mock_resolve, mock_compose, registry, request_context):
+    mock_resolve.return_value = SlowAsyncGateway(delay=0.0)
+    mock_compose.return_value = [{"role": "user", "content": "hi"}]
+    executor = NodeExecutor(registry, audit_emitter=MagicMock())
+
+    async def call_from_loop():
+        return executor.execute_node(_node("n1"), _profile(), request_context=request_context)
+
+    result = asyncio.run(call_from_loop())
+    assert result.status == "PASS"
+
+
+@patch("atoms_agents.runtime.prompting.composer.compose_messages")
+@patch("atoms_agents.runtime.node_executor.resolve_gateway")
+def test_sync_calls_share_one_loop_and_http_client(mock_resolve, mock_compose, registry, request_context):
+    from atoms_agents.runtime.providers.http_pool import get_async_http_client
+
+    clients = []
+
+    class PooledGateway(SlowAsyncGateway):
+        async def agenerate(self, messages, model_card, provider_config, **kwargs):
+            clients.append(get_async_http_client("test-sync-pool"))
+            return {"role": "assistant", "content": "async", "usage": {}}
+
+    mock_resolve.return_value = PooledGateway()
+    mock_compose.return_value = [{"role": "user", "content": "hi"}]
+    executor = NodeExecutor(registry, audit_emitter=MagicMock())
+
+    for i in range(3):
+        assert executor.execute_node(_node(f"n{i}"), _profile(), request_context=request_context).status == "PASS"
+
+    assert len(clients) == 3 and clients[0] is clients[1] is clients[2]
+    assert not clients[0].is_closed
+
+
+@patch("atoms_agents.runtime.prompting.composer.compose_messages")
+@patch("atoms_agents.runtime.node_executor.resolve_gateway")
+def test_sync_only_gateway_still_supported(mock_resolve, mock_compose, registry, request_context):
+    gateway = MagicMock()
+    gateway.check_readiness.return_value = MagicMock(ready=True)
+    gateway.generate.return_value = {"content": "ok", "status": "success"}
+    mock_resolve.return_value = gateway
+    mock_compose.return_value = [{"role": "user", "content": "hi"}]
+    executor = NodeExecutor(registry, audit_emitter=MagicMock())
+
+    result = executor.execute_node(_node("n1"), _profile(), request_context=request_context)
+
+    assert result.status == "PASS"
+    gateway.generate.assert_called_once()
+
+
+@patch("atoms_agents.runtime.prompting.composer.compose_messages")
+@patch("atoms_agents.runtime.node_executor.resolve_gateway")
+def test_cancelled_node_skips_model_call_and_writes(mock_resolve, mock_compose, registry, request_context):
+    from atoms_agents.core.cancellation import CancellationToken
+
+    gateway = MagicMock()
+    gateway.check_readiness.return_value = MagicMock(ready=True)
+    mock_resolve.return_value = gateway
+    mock_compose.return_value = [{"role": "user", "content": "hi"}]
+    executor = NodeExecutor(registry, audit_emitter=MagicMock())
+    token = CancellationToken()
+    token.cancel()
+
+    result = executor.execute_node(_node("n1"), _profile(), request_context=request_context, cancel_token=token)
+
+    assert result.status == "SKIP"
+    gateway.generate.assert_not_called()
+    assert result.blackboard_writes == {}
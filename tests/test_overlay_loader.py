@@ -0,0 +1,73 @@
+import os
+
+from atoms_agents.core.workspace import overlay_loader
+from atoms_agents.core.workspace.overlay_loader import OverlayRegistryLoader
+from atoms_agents.core.workspace.store import WorkspaceStore
+
+
+def _node_yaml(node_id, name):
+    return f"card_type: node\nnode_id: {node_id}\nname: {name}\nkind: agent\n"
+
+
+def _setup(tmp_path):
+    overlay_loader.clear_overlay_cache()
+    root = tmp_path / "cards"
+    (root / "personas").mkdir(parents=True)
+    (root / "personas" / "writer.yaml").write_text(
+        "card_type: persona\npersona_id: persona.writer\nname: W\ndescription: d\n"
+    )
+    tenant_dir = root / "tenant_overlays" / "acme"
+    tenant_dir.mkdir(parents=True)
+    (tenant_dir / "n1.yaml").write_text(_node_yaml("n1", "tenant"))
+    (tenant_dir / "n2.yaml").write_text(_node_yaml("n2", "tenant"))
+    store = WorkspaceStore(workspace_root=tmp_path / "ws")
+    return root, store
+
+
+def test_layers_apply_in_priority_order(tmp_path):
+    root, store = _setup(tmp_path)
+    (store.root / "nodes" / "n1.yaml").write_text(_node_yaml("n1", "workspace"))
+    loader = OverlayRegistryLoader(str(root), store)
+
+    ctx = loader.load_context(tenant_id="acme")
+    assert ctx.nodes["n1"].name == "workspace"
+    assert ctx.nodes["n2"].name == "tenant"
+    assert "persona.writer" in ctx.personas
+
+    plain = loader.load_context()
+    assert "n2" not in plain.nodes
+
+
+def test_base_and_layers_are_shared_and_copy_on_write(tmp_path, monkeypatch):
+    root, store = _setup(tmp_path)
+    loader = OverlayRegistryLoader(str(root), store, base_recheck_seconds=0)
+
+    first = loader.load_context(tenant_id="acme")
+    calls = []
+    monkeypatch.setattr(loader.base_loader, "load_context", lambda: calls.append(1))
+    second = OverlayRegistryLoader(str(root), store).load_context(tenant_id="acme")
+
+    assert calls == []
+    assert second.personas is first.personas
+    assert second.nodes.maps[1:] == first.nodes.maps[1:]
+
+    second.nodes["scratch"] = "x"
+    assert "scratch" not in first.nodes
+    assert "scratch" not in loader.load_context(tenant_id="acme").nodes
+
+
+def test_changed_overlay_file_rebuilds_only_that_layer(tmp_path):
+    root, store = _setup(tmp_path)
+    loader = OverlayRegistryLoader(str(root), store)
+    loader.load_context(tenant_id="acme")
+
+    tenant_file = root / "tenant_overlays" / "acme" / "n2.yaml"
+    tenant_file.write_text(_node_yaml("n2", "tenant v2"))
+    st = os.stat(tenant_file)
+    os.utime(tenant_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert loader.load_context(tenant_id="acme").nodes["n2"].name == "tenant v2"
+
+    (store.root / "flows").mkdir(exist_ok=True)
+    (store.root / "nodes" / "n3.yaml").write_text(_node_yaml("n3", "workspace"))
+    assert loader.load_context(tenant_id="acme").nodes["n3"].name == "workspace"
@@ -0,0 +1,37 @@
+import dataclasses
+import pickle
+
+import pytest
+
+from atoms_agents.registry import bench_memory
+from atoms_agents.registry.schemas import CapabilityBindingCard, ModelCard, ModelFamilyCard, PersonaCard
+
+
+def test_cards_are_slotted_and_frozen():
+    card = ModelCard("m1", "groq", "llama", "meta_llama")
+    assert not hasattr(card, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        card.provider_id = "gemini"
+    assert dataclasses.replace(card, provider_id="gemini").provider_id == "gemini"
+    assert pickle.loads(pickle.dumps(card)) == card
+
+
+def test_cards_with_list_fields_are_unhashable_but_comparable():
+    persona = PersonaCard("p1", "P", "d", style_tags=["calm"])
+    family = ModelFamilyCard("f1", "F", provider_ids=["groq"])
+    assert PersonaCard.__hash__ is None and ModelFamilyCard.__hash__ is None
+    assert persona == PersonaCard("p1", "P", "d", style_tags=["calm"])
+    with pytest.raises(TypeError, match="unhashable"):
+        hash(family)
+
+
+def test_enum_like_fields_are_interned():
+    a = CapabilityBindingCard("b1", "".join(["gr", "oq"]), "m1", "cap.tools", confidence="".join(["veri", "fied"]))
+    b = CapabilityBindingCard("b2", "".join(["g", "roq"]), "m2", "cap.tools", confidence="".join(["ver", "ified"]))
+    assert a.provider_id is b.provider_id
+    assert a.confidence is b.confidence
+
+
+def test_memory_benchmark_favours_compact_cards():
+    result = bench_memory.run(2_000)
+    assert result["compact_bytes"] < result["legacy_bytes"]
@@ -0,0 +1,123 @@
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from atoms_agents.server import main as server
+from atoms_agents.server.registry_index import RegistryIndexCache, etag_matches
+
+
+def _ctx(personas, models=None):
+    empty = {}
+    return SimpleNamespace(
+        providers=empty,
+        models=models or {},
+        personas={pid: SimpleNamespace(name=name) for pid, name in personas.items()},
+        manifests=empty,
+        reasoning_profiles=empty,
+        firearms_licenses=empty,
+        agents=empty,
+    )
+
+
+def _client(monkeypatch):
+    monkeypatch.setattr(server, "registry", None)
+    monkeypatch.setattr(server, "registry_version", 0)
+    monkeypatch.setattr(server, "registry_index", RegistryIndexCache(history=2, epoch="e1"))
+    return TestClient(server.app)
+
+
+def test_etag_and_304(monkeypatch):
+    client = _client(monkeypatch)
+    server._swap_registry(_ctx({"persona.a": "A"}))
+
+    first = client.get("/registry/index")
+    assert first.status_code == 200
+    assert first.json()["personas"] == [{"id": "persona.a", "name": "A"}]
+    etag = first.headers["ETag"]
+
+    cached = client.get("/registry/index", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+
+    # A reload with identical content keeps the same ETag
+    server._swap_registry(_ctx({"persona.a": "A"}))
+    assert client.get("/registry/index", headers={"If-None-Match": etag}).status_code == 304
+
+    server._swap_registry(_ctx({"persona.a": "A2"}))
+    changed = client.get("/registry/index", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["version"] == "e1.3"
+
+
+def test_since_returns_delta(monkeypatch):
+    client = _client(monkeypatch)
+    server._swap_registry(_ctx({"persona.a": "A", "persona.b": "B"}))
+    server._swap_registry(_ctx({"persona.a": "A2", "persona.c": "C"}))
+
+    body = client.get("/registry/index", params={"since": "e1.1"}).json()
+    assert body["version"] == "e1.2" and body["since"] == "e1.1"
+    assert body["delta"]["personas"] == {
+        "added": [{"id": "persona.c", "name": "C"}],
+        "changed": [{"id": "persona.a", "name": "A2"}],
+        "removed": ["persona.b"],
+    }
+    assert body["delta"]["models"] == {"added": [], "changed": [], "removed": []}
+
+    noop = client.get("/registry/index", params={"since": "e1.2"}).json()
+    assert noop["delta"]["personas"] == {"added": [], "changed": [], "removed": []}
+
+
+def test_since_outside_history_returns_full_index(monkeypatch):
+    client = _client(monkeypatch)
+    for name in ("A", "B", "C"):
+        server._swap_registry(_ctx({"persona.a": name}))
+
+    body = client.get("/registry/index", params={"since": "e1.1"}).json()
+    assert "delta" not in body
+    assert body["version"] == "e1.3"
+    assert body["personas"] == [{"id": "persona.a", "name": "C"}]
+
+
+def test_since_from_earlier_process_returns_full_index(monkeypatch):
+    client = _client(monkeypatch)
+    server._swap_registry(_ctx({"persona.a": "A"}))
+    server._swap_registry(_ctx({"persona.a": "B"}))
+
+    # Same version number, different process epoch
+    body = client.get("/registry/index", params={"since": "e0.1"}).json()
+    assert "delta" not in body
+    assert body["personas"] == [{"id": "persona.a", "name": "B"}]
+
+    legacy = client.get("/registry/index", params={"since": "1"}).json()
+    assert "delta" not in legacy
+
+    assert RegistryIndexCache().epoch != RegistryIndexCache().epoch
+
+
+def test_full_and_delta_bodies_have_distinct_etags(monkeypatch):
+    client = _client(monkeypatch)
+    server._swap_registry(_ctx({"persona.a": "A"}))
+    server._swap_registry(_ctx({"persona.a": "B"}))
+
+    full = client.get("/registry/index")
+    delta = client.get("/registry/index", params={"since": "e1.1"})
+    assert full.headers["ETag"] != delta.headers["ETag"]
+
+    # The full body's ETag must not validate a delta request, and vice versa
+    assert client.get(
+        "/registry/index", params={"since": "e1.1"}, headers={"If-None-Match": full.headers["ETag"]}
+    ).status_code == 200
+    assert client.get("/registry/index", headers={"If-None-Match": delta.headers["ETag"]}).status_code == 200
+    assert client.get(
+        "/registry/index", params={"since": "e1.1"}, headers={"If-None-Match": delta.headers["ETag"]}
+    ).status_code == 304
+
+
+def test_etag_matches_weak_and_lists():
+    assert etag_matches('W/"abc"', 'W/"abc"')
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches('"x", W/"abc"', 'W/"abc"')
+    assert etag_matches("*", 'W/"abc"')
+    assert not etag_matches(None, 'W/"abc"')
+    assert not etag_matches('"abd"', 'W/"abc"')
@@ -0,0 +1,42 @@
+from atoms_agents.registry.loader import RegistryLoader
+from atoms_agents.registry.schemas import CapabilityBindingCard, ModelCard
+from atoms_agents.server import main as server
+
+
+def _ctx(tmp_path):
+    ctx = RegistryLoader(str(tmp_path), use_snapshot=False).load_context()
+    ctx.models = {
+        "m.llama": ModelCard("m.llama", "groq", "llama-3.3-70b", "meta_llama"),
+        "m.llama.dup": ModelCard("m.llama.dup", "groq", "llama-3.3-70b", "meta_llama"),
+        "m.gemma": ModelCard("m.gemma", "groq", "gemma-2", "google_gemma"),
+        "m.flash": ModelCard("m.flash", "gemini", "gemini-2.0-flash", "google_gemini"),
+    }
+    ctx.bindings = {
+        "b1": CapabilityBindingCard("b1", "groq", "m.llama", "cap.tools"),
+        "b2": CapabilityBindingCard("b2", "gemini", "m.flash", "cap.tools"),
+        "b3": CapabilityBindingCard("b3", "gemini", "m.flash", "cap.vision"),
+    }
+    ctx.rebuild_indexes()
+    return ctx
+
+
+def test_secondary_indexes(tmp_path):
+    ctx = _ctx(tmp_path)
+    assert ctx.models_by_official_id[("groq", "llama-3.3-70b")].model_id == "m.llama"
+    assert [m.model_id for m in ctx.models_by_provider["groq"]] == ["m.llama", "m.llama.dup", "m.gemma"]
+    assert [m.model_id for m in ctx.models_by_family["google_gemini"]] == ["m.flash"]
+    assert [b.binding_id for b in ctx.bindings_by_capability["cap.tools"]] == ["b1", "b2"]
+    assert ctx.bindings_by_capability.get("cap.audio") is None
+
+
+def test_loaded_context_is_indexed(tmp_path):
+    ctx = RegistryLoader(str(tmp_path), use_snapshot=False).load_context()
+    assert ctx.models_by_official_id == {} and ctx.bindings_by_capability == {}
+
+
+def test_server_resolves_by_official_id(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "registry", _ctx(tmp_path))
+    assert server._resolve_model_card("groq", "m.gemma").model_id == "m.gemma"
+    assert server._resolve_model_card("gemini", "gemini-2.0-flash").model_id == "m.flash"
+    adhoc = server._resolve_model_card("gemini", "llama-3.3-70b")
+    assert adhoc.model_id == "adhoc.gemini.llama-3.3-70b"
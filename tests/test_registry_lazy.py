@@ -0,0 +1,88 @@
+from atoms_agents.registry import snapshot
+from atoms_agents.registry.loader import LazyRegistryContext, RegistryContext, RegistryLoader
+
+
+def _write(root, directory, name, body):
+    path = root / directory / f"{name}.yaml"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(body)
+
+
+def _cards(tmp_path):
+    cards = tmp_path / "cards"
+    _write(cards, "personas", "writer", "card_type: persona\npersona_id: persona.writer\nname: W\ndescription: d\n")
+    _write(cards, "tasks", "summarize", "card_type: task\ntask_id: task.summarize\nname: S\ngoal: g\n")
+    return cards
+
+
+def test_lazy_context_loads_directories_on_first_access(tmp_path):
+    cards = _cards(tmp_path)
+    loader = RegistryLoader(str(cards), use_snapshot=False)
+    ctx = loader.load_context(lazy=True)
+
+    assert isinstance(ctx, LazyRegistryContext) and isinstance(ctx, RegistryContext)
+    assert "personas" not in ctx.__dict__
+
+    assert list(ctx.personas) == ["persona.writer"]
+    assert loader.last_load_stats["files"] == 1
+    assert "tasks" not in ctx.__dict__
+
+    assert ctx.personas is ctx.personas
+    assert ctx.models_by_provider == {}
+    assert ctx.nodes == {}
+
+
+def test_lazy_matches_eager(tmp_path):
+    cards = _cards(tmp_path)
+    eager = RegistryLoader(str(cards), use_snapshot=False).load_context()
+    lazy = RegistryLoader(str(cards), use_snapshot=False).load_context(lazy=True)
+    assert list(lazy.tasks) == list(eager.tasks)
+    assert list(lazy.personas) == list(eager.personas)
+
+
+def test_partial_loads_keep_other_snapshot_entries(tmp_path):
+    snapshot.clear_memory_snapshots()
+    cards = _cards(tmp_path)
+    snaps = str(tmp_path / "snaps")
+
+    RegistryLoader(str(cards), snapshot_dir=snaps).load_context(lazy=True).personas
+    RegistryLoader(str(cards), snapshot_dir=snaps).load_context(lazy=True).tasks
+
+    loader = RegistryLoader(str(cards), snapshot_dir=snaps)
+    loader.load_context()
+    assert loader.last_load_stats["reparsed"] == 0
+    assert loader.last_load_stats["snapshot_hit"] is True
+
+
+def test_timing_report_after_lazy_loads(tmp_path):
+    cards = _cards(tmp_path)
+    loader = RegistryLoader(str(cards), use_snapshot=False)
+    ctx = loader.load_context(lazy=True)
+
+    ctx.personas
+    assert "personas" in loader.timing_report()
+
+    ctx.tasks
+    report = loader.timing_report()
+    assert report.startswith("Registry load:")
+    assert "personas" in report and "tasks" in report
+    assert loader.last_load_timings["total_ms"] >= 0
+
+
+def test_lens_indexes_built_together_from_one_load(tmp_path):
+    cards = _cards(tmp_path)
+    _write(cards, "lenses", "ctx", "card_type: lens_context\ncontext_id: ctx.brand\nname: Brand\n")
+    _write(cards, "lenses", "tokens", "card_type: lens_token_map\ntoken_map_id: tm.1\ntarget_node_id: n1\n")
+    loader = RegistryLoader(str(cards), use_snapshot=False)
+    ctx = loader.load_context(lazy=True)
+    calls = []
+    load_cards = loader._load_cards
+    loader._load_cards = lambda directories=None: calls.append(directories) or load_cards(directories)
+
+    assert list(ctx.lens_contexts) == ["ctx.brand"]
+    assert {"lens_tokens", "lens_safety", "lens_logs", "lens_interactions"} <= set(ctx.__dict__)
+    assert list(ctx.lens_tokens) == ["tm.1"] and ctx.lens_safety == {}
+    assert calls == [["lenses"]]
+
+    eager = RegistryLoader(str(cards), use_snapshot=False).load_context()
+    assert list(eager.lens_contexts) == ["ctx.brand"] and list(eager.lens_tokens) == ["tm.1"]
@@ -0,0 +1,100 @@
+import os
+
+from atoms_agents.registry import loader as loader_module
+from atoms_agents.registry import snapshot
+from atoms_agents.registry.loader import RegistryLoader
+
+
+def _write_persona(root, name, description="Writes things."):
+    path = root / "personas" / f"{name}.yaml"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        "card_type: persona\n"
+        f"persona_id: persona.{name}\n"
+        f"name: {name}\n"
+        f"description: {description}\n"
+    )
+    return path
+
+
+def _loader(root, snap_dir):
+    return RegistryLoader(str(root), use_snapshot=True, snapshot_dir=str(snap_dir))
+
+
+def test_snapshot_reused_when_nothing_changed(tmp_path):
+    snapshot.clear_memory_snapshots()
+    cards, snaps = tmp_path / "cards", tmp_path / "snaps"
+    _write_persona(cards, "writer")
+    _write_persona(cards, "editor")
+
+    first = _loader(cards, snaps)
+    ctx = first.load_context()
+    assert set(ctx.personas) == {"persona.writer", "persona.editor"}
+    assert first.last_load_stats["reparsed"] == 2
+    assert list(snaps.glob("*.pickle"))
+
+    # Fresh process: only the on-disk snapshot is available
+    snapshot.clear_memory_snapshots()
+    second = _loader(cards, snaps)
+    assert set(second.load_context().personas) == set(ctx.personas)
+    assert second.last_load_stats == {"files": 2, "reparsed": 0, "removed": 0, "snapshot_hit": True}
+
+
+def test_only_changed_files_are_reparsed(tmp_path):
+    snapshot.clear_memory_snapshots()
+    cards, snaps = tmp_path / "cards", tmp_path / "snaps"
+    writer = _write_persona(cards, "writer")
+    editor = _write_persona(cards, "editor")
+    _loader(cards, snaps).load_context()
+
+    _write_persona(cards, "writer", description="Writes much longer things now.")
+    stat = os.stat(writer)
+    os.utime(writer, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    editor.unlink()
+    _write_persona(cards, "critic")
+
+    loader = _loader(cards, snaps)
+    ctx = loader.load_context()
+    assert set(ctx.personas) == {"persona.writer", "persona.critic"}
+    assert ctx.personas["persona.writer"].description == "Writes much longer things now."
+    assert loader.last_load_stats == {"files": 2, "reparsed": 2, "removed": 1, "snapshot_hit": False}
+
+
+def test_broken_file_is_not_cached(tmp_path, capsys):
+    snapshot.clear_memory_snapshots()
+    cards, snaps = tmp_path / "cards", tmp_path / "snaps"
+    _write_persona(cards, "writer")
+    broken = cards / "personas" / "broken.yaml"
+    broken.write_text("card_type: persona\npersona_id: nope\nname: x\ndescription: y\n")
+
+    _loader(cards, snaps).load_context()
+    assert "Error loading" in capsys.readouterr().out
+
+    loader = _loader(cards, snaps)
+    loader.load_context()
+    assert loader.last_load_stats["reparsed"] == 1
+    assert "Error loading" in capsys.readouterr().out
+
+
+def test_snapshot_disabled_parses_every_time(tmp_path):
+    cards = tmp_path / "cards"
+    _write_persona(cards, "writer")
+    loader = RegistryLoader(str(cards), use_snapshot=False)
+    assert "persona.writer" in loader.load_context().personas
+    assert loader.last_load_stats["reparsed"] == 1
+    assert loader.last_load_timings["directories"]["personas"]["parsed"] == 1
+
+
+def test_process_pool_merge_matches_serial(tmp_path, monkeypatch):
+    cards = tmp_path / "cards"
+    for i in range(12):
+        _write_persona(cards, f"p{i:02d}")
+    serial = RegistryLoader(str(cards), use_snapshot=False).load_context()
+
+    monkeypatch.setattr(loader_module, "PARALLEL_MIN_FILES", 1)
+    pooled_loader = RegistryLoader(str(cards), use_snapshot=False, workers=2)
+    pooled = pooled_loader.load_context()
+
+    assert pooled_loader.last_load_timings["workers"] == 2
+    assert list(pooled.personas) == list(serial.personas)
+    assert "personas" in pooled_loader.timing_report()
@@ -0,0 +1,95 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from atoms_agents.registry import snapshot
+from atoms_agents.registry.loader import RegistryLoader
+from atoms_agents.registry.watcher import RegistryWatcher
+from atoms_agents.server import main as server
+
+
+def _write_persona(root, name, description="Writes things."):
+    path = root / "personas" / f"{name}.yaml"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        "card_type: persona\n"
+        f"persona_id: persona.{name}\n"
+        f"name: {name}\n"
+        f"description: {description}\n"
+    )
+    return path
+
+
+def _loader(tmp_path):
+    snapshot.clear_memory_snapshots()
+    return RegistryLoader(str(tmp_path / "cards"), snapshot_dir=str(tmp_path / "snaps"))
+
+
+def test_check_once_reloads_only_on_change(tmp_path):
+    _write_persona(tmp_path / "cards", "writer")
+    loader = _loader(tmp_path)
+    loader.load_context()
+    seen = []
+    watcher = RegistryWatcher(loader, on_reload=seen.append, use_watchfiles=False)
+
+    assert watcher.check_once() is False
+
+    _write_persona(tmp_path / "cards", "editor")
+    assert watcher.check_once() is True
+    assert set(seen[-1].personas) == {"persona.writer", "persona.editor"}
+    assert loader.last_load_stats["reparsed"] == 1
+    assert watcher.check_once() is False
+
+
+def test_failed_reload_keeps_previous_context(tmp_path, monkeypatch):
+    _write_persona(tmp_path / "cards", "writer")
+    loader = _loader(tmp_path)
+    seen = []
+    watcher = RegistryWatcher(loader, on_reload=seen.append, use_watchfiles=False)
+
+    def boom():
+        raise RuntimeError("disk on fire")
+
+    monkeypatch.setattr(loader, "load_context", boom)
+    _write_persona(tmp_path / "cards", "editor")
+    assert watcher.check_once() is False
+    assert watcher.failures == 1 and seen == []
+
+
+def test_polling_thread_swaps_server_registry(tmp_path, monkeypatch):
+    _write_persona(tmp_path / "cards", "writer")
+    loader = _loader(tmp_path)
+    monkeypatch.setattr(server, "registry", None)
+    monkeypatch.setattr(server, "registry_version", 0)
+    monkeypatch.setattr(server, "registry_index", server.RegistryIndexCache())
+    server._swap_registry(loader.load_context())
+
+    watcher = RegistryWatcher(loader, on_reload=server._swap_registry, interval=0.05, use_watchfiles=False)
+    watcher.start()
+    try:
+        _write_persona(tmp_path / "cards", "editor")
+        deadline = time.monotonic() + 5
+        while server.registry_version < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        watcher.stop()
+
+    assert server.registry_version == 2
+    resp = TestClient(server.app).get("/registry/index")
+    assert resp.headers["ETag"]
+    body = resp.json()
+    assert body["version"] == f"{server.registry_index.epoch}.2"
+    assert {p["id"] for p in body["personas"]} == {"persona.writer", "persona.editor"}
+
+
+def test_edits_between_load_and_watcher_start_are_noticed(tmp_path):
+    _write_persona(tmp_path / "cards", "writer")
+    loader = _loader(tmp_path)
+    loader.load_context()
+    _write_persona(tmp_path / "cards", "editor")  # lands before the watcher exists
+    seen = []
+    watcher = RegistryWatcher(loader, on_reload=seen.append, use_watchfiles=False)
+
+    assert watcher.check_once() is True
+    assert set(seen[-1].personas) == {"persona.writer", "persona.editor"}
+    assert watcher.check_once() is False
@@ -0,0 +1,79 @@
+import asyncio
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from atoms_agents.server import main as server_main
+from atoms_agents.server.concurrency import ConcurrencyLimiter, QueueFullError
+
+
+def test_calls_run_off_loop_and_are_bounded():
+    limiter = ConcurrencyLimiter(max_in_flight=2, max_queue=10)
+    loop_thread = threading.get_ident()
+    peak = {"running": 0, "max": 0}
+    lock = threading.Lock()
+
+    def blocking_call():
+        assert threading.get_ident() != loop_thread
+        with lock:
+            peak["running"] += 1
+            peak["max"] = max(peak["max"], peak["running"])
+        time.sleep(0.05)
+        with lock:
+            peak["running"] -= 1
+        return "ok"
+
+    async def main():
+        return await asyncio.gather(*[limiter.run(blocking_call) for _ in range(6)])
+
+    assert asyncio.run(main()) == ["ok"] * 6
+    assert peak["max"] == 2
+    metrics = limiter.metrics()
+    assert metrics["completed"] == 6
+    assert metrics["peak_queue_depth"] >= 1
+    assert metrics["in_flight"] == 0
+    limiter.shutdown()
+
+
+def test_rejects_when_queue_full():
+    limiter = ConcurrencyLimiter(max_in_flight=1, max_queue=1)
+
+    async def main():
+        tasks = [asyncio.create_task(limiter.run(time.sleep, 0.1)) for _ in range(3)]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert sum(isinstance(r, QueueFullError) for r in results) == 1
+    assert limiter.metrics()["rejected"] == 1
+    limiter.shutdown()
+
+
+def test_event_loop_stays_responsive():
+    limiter = ConcurrencyLimiter(max_in_flight=1, max_queue=4)
+
+    async def main():
+        slow = asyncio.create_task(limiter.run(time.sleep, 0.3))
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        tick = time.perf_counter() - started
+        await slow
+        return tick
+
+    assert asyncio.run(main()) < 0.1
+    limiter.shutdown()
+
+
+def test_chat_endpoint_returns_503_with_retry_after_when_queue_full(monkeypatch):
+    limiter = ConcurrencyLimiter(max_in_flight=1, max_queue=0)
+    asyncio.run(limiter._semaphore.acquire())  # the only slot is busy
+    monkeypatch.setattr(server_main, "gateway_limiter", limiter)
+
+    response = TestClient(server_main.app).post(
+        "/api/chat/complete", json={"messages": [{"role": "user", "content": "hi"}]}
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert limiter.metrics()["rejected"] == 1
+    limiter.shutdown()
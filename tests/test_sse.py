@@ -0,0 +1,105 @@
+import asyncio
+import random
+
+import httpx
+
+from atoms_agents.runtime.canvas_mirror import CanvasMirror
+from atoms_agents.runtime.context import AgentsRequestContext, ContextMode
+from atoms_agents.transport.sse import ResumableSSE, SSEParser, SSEStatusError
+
+
+def _feed_all(parser, chunks):
+    return [event for chunk in chunks for event in parser.feed(chunk)]
+
+
+def test_parser_handles_multiline_data_fields_and_comments():
+    parser = SSEParser()
+    events = parser.feed(
+        ": keepalive\n"
+        "event: patch\n"
+        "id: 7\n"
+        "data: {\"a\":\n"
+        "data: 1}\n"
+        "retry: 1500\n"
+        "\n"
+        "data:no-space\n\n"
+        "\n"  # blank line with no data dispatches nothing
+    )
+    assert [(e.event, e.id, e.data) for e in events] == [
+        ("patch", "7", '{"a":\n1}'),
+        ("message", "7", "no-space"),  # id persists until changed
+    ]
+    assert events[0].json() == {"a": 1}
+    assert parser.retry == 1500 and parser.comments == 1
+
+
+def test_parser_survives_arbitrary_chunk_boundaries():
+    raw = "id: 1\r\ndata: héllo\r\n\r\nid: 2\rdata: x\r\r\n".encode("utf-8")
+    expected = [("1", "héllo"), ("2", "x")]
+    for size in range(1, len(raw) + 1):
+        parser = SSEParser()
+        chunks = [raw[i:i + size] for i in range(0, len(raw), size)]
+        assert [(e.id, e.data) for e in _feed_all(parser, chunks)] == expected, size
+
+
+def test_resumes_with_last_event_id_after_disconnect():
+    seen_headers = []
+
+    async def open_stream(headers):
+        seen_headers.append(dict(headers))
+        if len(seen_headers) == 1:
+            yield b"id: 1\ndata: a\n\nid: 2\ndata: b\n\ndata: partial"
+            raise ConnectionResetError("server restarted")
+        if len(seen_headers) == 2:
+            raise SSEStatusError(503)
+        yield b"id: 3\ndata: c\n\n"
+
+    async def main():
+        stream = ResumableSSE(open_stream, backoff_base=0.001, max_reconnects=2, rng=random.Random(0))
+        return [event.data async for event in stream.events()], stream
+
+    data, stream = asyncio.run(main())
+    assert data == ["a", "b", "c"]  # the partial event is discarded, nothing replayed
+    assert "Last-Event-ID" not in seen_headers[0]
+    assert [h["Last-Event-ID"] for h in seen_headers[1:3]] == ["2", "2"]
+    assert stream.reconnects == 2 and len(stream.errors) == 2
+
+
+def test_non_retryable_status_stops():
+    calls = []
+
+    async def open_stream(headers):
+        calls.append(headers)
+        raise SSEStatusError(401)
+        yield b""  # pragma: no cover
+
+    async def main():
+        return [e async for e in ResumableSSE(open_stream, backoff_base=0.001).events()]
+
+    assert asyncio.run(main()) == [] and len(calls) == 1
+
+
+def test_canvas_mirror_resumes_from_last_event_id():
+    requests = []
+
+    def handler(request):
+        requests.append(request.headers.get("Last-Event-ID"))
+        if len(requests) == 1:
+            body = 'retry: 1\nid: e1\ndata: {"event_id": "e1", "n": 1}\n\n'
+        else:
+            body = 'id: e2\ndata: {"event_id": "e2", "n": 2}\n\n'
+        return httpx.Response(200, text=body, headers={"Content-Type": "text/event-stream"})
+
+    ctx = AgentsRequestContext(tenant_id="t", mode=ContextMode.SAAS, project_id="p", request_id="r")
+    mirror = CanvasMirror(
+        "http://rt", ctx, "c1", transport=httpx.MockTransport(handler), max_reconnects=1
+    )
+
+    async def main():
+        await mirror.start()
+        await mirror.wait()
+
+    asyncio.run(main())
+    assert requests == [None, "e1"]
+    assert [e["n"] for e in mirror.snapshot()] == [1, 2]
+    assert mirror.last_event_id == "e2"
@@ -0,0 +1,173 @@
+import asyncio
+import random
+
+from atoms_agents.transport.ws_pool import WebSocketPool
+
+
+class _FakeWS:
+    def __init__(self, fail_after=None):
+        self.sent = []
+        self.closed = False
+        self.fail_after = fail_after
+
+    async def send_str(self, text):
+        if self.closed or (self.fail_after is not None and len(self.sent) >= self.fail_after):
+            raise ConnectionResetError("peer gone")
+        self.sent.append(text)
+
+    async def close(self):
+        self.closed = True
+
+
+class _Server:
+    """Hands out sockets; `plan` decides how many sends each one survives."""
+
+    def __init__(self, plan=None, refuse=0):
+        self.sockets = []
+        self.plan = list(plan or [])
+        self.refuse = refuse
+
+    async def connect(self, url):
+        if self.refuse:
+            self.refuse -= 1
+            raise ConnectionRefusedError(url)
+        ws = _FakeWS(self.plan.pop(0) if self.plan else None)
+        self.sockets.append(ws)
+        return ws
+
+    def received(self):
+        return [m for ws in self.sockets for m in ws.sent]
+
+
+def _pool(server, **kwargs):
+    kwargs.setdefault("backoff_base", 0.01)
+    kwargs.setdefault("backoff_max", 0.02)
+    return WebSocketPool(server.connect, rng=random.Random(1), **kwargs)
+
+
+def test_reuses_one_socket_per_thread():
+    server = _Server()
+    pool = _pool(server)
+
+    async def main():
+        for i in range(3):
+            assert await pool.send("t1", "ws://rt/ws/chat/t1", f"m{i}")
+        await pool.send("t2", "ws://rt/ws/chat/t2", "x")
+        await pool.close()
+
+    asyncio.run(main())
+    assert len(server.sockets) == 2 and server.sockets[0].sent == ["m0", "m1", "m2"]
+
+
+def test_failed_send_is_replayed_in_order_after_reconnect():
+    server = _Server(plan=[1])
+    pool = _pool(server)
+
+    async def main():
+        assert await pool.send("t1", "ws://x", "m0")
+        server.refuse = 1  # first reconnect attempt fails too
+        assert not await pool.send("t1", "ws://x", "m1")  # socket died
+        assert not await pool.send("t1", "ws://x", "m2")  # queued behind the reconnect
+        await asyncio.sleep(0.2)
+        await pool.close()
+
+    asyncio.run(main())
+    assert server.received() == ["m0", "m1", "m2"]
+    assert pool.reconnects >= 2 and pool.dropped == 0
+
+
+def test_buffer_drops_oldest_when_full():
+    server = _Server(refuse=100)
+    pool = _pool(server, buffer_size=2, max_attempts=1)
+
+    async def main():
+        for i in range(4):
+            await pool.send("t1", "ws://x", f"m{i}")
+        await asyncio.sleep(0.05)
+        assert list(pool.conns["t1"].pending) == ["m2", "m3"]
+        server.refuse = 0
+        assert await pool.send("t1", "ws://x", "m4")
+        await asyncio.sleep(0.05)
+        await pool.close()
+
+    asyncio.run(main())
+    assert pool.dropped == 3
+    assert server.received() == ["m3", "m4"]
+
+
+def test_socket_cap_evicts_least_recently_used():
+    server = _Server()
+    pool = _pool(server, max_sockets=2)
+
+    async def main():
+        await pool.send("a", "ws://a", "1")
+        await pool.send("b", "ws://b", "1")
+        await pool.send("a", "ws://a", "2")
+        await pool.send("c", "ws://c", "1")
+        assert set(pool.connections()) == {"a", "c"}
+        await pool.close()
+
+    asyncio.run(main())
+    assert server.sockets[1].closed and pool.evicted == 1
+
+
+def test_idle_sockets_are_evicted():
+    server = _Server()
+    pool = _pool(server, idle_timeout=0.05)
+
+    async def main():
+        await pool.send("a", "ws://a", "1")
+        await asyncio.sleep(0.2)
+        assert pool.connections() == {}
+
+    asyncio.run(main())
+    assert server.sockets[0].closed and pool.evicted == 1
+
+
+def test_adopted_subscriber_socket_is_reused_not_closed():
+    server = _Server()
+    pool = _pool(server)
+    subscriber_ws = _FakeWS()
+
+    async def main():
+        await pool.adopt("t1", "ws://x", subscriber_ws)
+        await pool.send("t1", "ws://x", "hi")
+        pool.release("t1", subscriber_ws)
+        await pool.close()
+
+    asyncio.run(main())
+    assert subscriber_ws.sent == ["hi"] and not subscriber_ws.closed
+    assert server.sockets == []
+
+
+def test_adopting_closes_the_pool_owned_socket():
+    server = _Server()
+    pool = _pool(server)
+    subscriber_ws = _FakeWS()
+
+    async def main():
+        await pool.send("t1", "ws://x", "before")
+        await pool.adopt("t1", "ws://x", subscriber_ws)
+        await pool.send("t1", "ws://x", "after")
+        await pool.close()
+
+    asyncio.run(main())
+    assert server.sockets[0].closed and server.sockets[0].sent == ["before"]
+    assert subscriber_ws.sent == ["after"] and not subscriber_ws.closed
+
+
+def test_adopted_sockets_count_toward_max_sockets():
+    server = _Server()
+    pool = _pool(server, max_sockets=2)
+    subscriber_ws = _FakeWS()
+
+    async def main():
+        await pool.send("t1", "ws://1", "a")
+        await pool.send("t2", "ws://2", "b")
+        await pool.adopt("t3", "ws://3", subscriber_ws)
+        open_now = sorted(pool.connections())
+        await pool.close()
+        return open_now
+
+    assert asyncio.run(main()) == ["t2", "t3"]
+    assert server.sockets[0].closed and pool.evicted == 1